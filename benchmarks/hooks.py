@@ -0,0 +1,43 @@
+"""Overhead of stacked hooks on a view.
+
+Usage: python -m benchmarks.hooks
+"""
+
+from bocadillo import App, hooks
+
+from .utils import make_scope, report
+
+
+async def async_hook(req, res, params):
+    pass
+
+
+def sync_hook(req, res, params):
+    pass
+
+
+@hooks.inline
+def inline_hook(req, res, params):
+    pass
+
+
+def build(hook):
+    def build_app(count: int):
+        app = App(static_dir=None)
+
+        async def index(req, res):
+            res.text = "OK"
+
+        for i in range(count):
+            decorate = hooks.before if i % 2 == 0 else hooks.after
+            index = decorate(hook)(index)
+
+        app.route("/")(index)
+        return app, make_scope("/")
+
+    return build_app
+
+
+if __name__ == "__main__":
+    for hook in (async_hook, inline_hook, sync_hook):
+        report(f"{hook.__name__} hooks", build(hook), sizes=(0, 1, 2, 4, 8))
@@ -0,0 +1,74 @@
+"""Overhead of providers injected into a view.
+
+Usage: python -m benchmarks.injection
+"""
+
+import asyncio
+import time
+
+from aiodine.consumers import Consumer
+
+from bocadillo import App, provider
+from bocadillo.injection import _STORE, consumer, freeze_providers
+
+from .utils import make_scope, report
+
+SIZES = (0, 3, 10)
+
+
+def make_providers(count: int) -> list:
+    names = []
+    for i in range(count):
+        name = f"bench_provider_{i}"
+
+        async def value():
+            return 42
+
+        # Alternate request-scoped and app-scoped providers.
+        provider(name=name, scope="request" if i % 2 == 0 else "app")(value)
+        names.append(name)
+    return names
+
+
+def make_view(names: list):
+    # Build `async def view(req, res, <names>)` so that providers are
+    # injected by name.
+    source = f"async def view({', '.join(['req', 'res', *names])}):\n    pass"
+    namespace: dict = {}
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace["view"]
+
+
+def build_app(count: int):
+    app = App(static_dir=None)
+    app.route("/")(make_view(make_providers(count)))
+    return app, make_scope("/")
+
+
+def compare_consumers(requests: int = 20000):
+    # Per-call cost of resolving providers, without the rest of the stack.
+    freeze_providers()
+    loop = asyncio.new_event_loop()
+    print("consumer call (aiodine vs. compiled)")
+    for count in SIZES:
+        func = make_view(make_providers(count))
+        results = []
+        for build in (lambda f: Consumer(_STORE, f), consumer):
+            call = build(func)
+
+            async def run():
+                start = time.perf_counter()
+                for _ in range(requests):
+                    await call(None, None)
+                return time.perf_counter() - start
+
+            loop.run_until_complete(run())  # Warm up.
+            results.append(1e6 * loop.run_until_complete(run()) / requests)
+        aiodine_usec, compiled_usec = results
+        print(f"  {count:>3}: {aiodine_usec:6.1f} µs → {compiled_usec:6.1f} µs")
+    loop.close()
+
+
+if __name__ == "__main__":
+    report("injected providers", build_app, sizes=SIZES)
+    compare_consumers()
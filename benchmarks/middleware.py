@@ -0,0 +1,48 @@
+"""Per-layer overhead of HTTP middleware.
+
+Usage: python -m benchmarks.middleware
+"""
+from bocadillo import App, Middleware
+
+from .utils import make_scope, report
+
+
+class NoOp(Middleware):
+    pass
+
+
+class AsyncHooks(Middleware):
+    async def before_dispatch(self, req, res):
+        pass
+
+    async def after_dispatch(self, req, res):
+        pass
+
+
+class SyncHooks(Middleware):
+    def before_dispatch(self, req, res):
+        pass
+
+    def after_dispatch(self, req, res):
+        pass
+
+
+def build(middleware_cls):
+    def build_app(count: int):
+        app = App(static_dir=None)
+
+        @app.route("/")
+        async def index(req, res):
+            res.text = "OK"
+
+        for _ in range(count):
+            app.add_middleware(middleware_cls)
+
+        return app, make_scope("/")
+
+    return build_app
+
+
+if __name__ == "__main__":
+    for cls in (NoOp, AsyncHooks, SyncHooks):
+        report(f"{cls.__name__} middleware", build(cls), sizes=(0, 5, 10))
@@ -0,0 +1,72 @@
+"""Helpers for micro-benchmarks.
+
+Benchmarks call the ASGI interface of an application directly (no server,
+no test client) so that they measure the framework's own overhead.
+"""
+import asyncio
+import time
+from typing import Callable, Iterable, Tuple
+
+
+def make_scope(path: str = "/", method: str = "GET") -> dict:
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def _run(app, scope: dict, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope))(receive, send)
+    return time.perf_counter() - start
+
+
+def timeit(app, scope: dict = None, requests: int = 5000) -> float:
+    """Return the average time spent per request, in microseconds."""
+    if scope is None:
+        scope = make_scope()
+    loop = asyncio.new_event_loop()
+    try:
+        # Warm up (e.g. providers freezing).
+        loop.run_until_complete(_run(app, scope, 100))
+        elapsed = loop.run_until_complete(_run(app, scope, requests))
+    finally:
+        loop.close()
+    return 1e6 * elapsed / requests
+
+
+def report(
+    title: str, build: Callable[[int], Tuple[object, dict]], sizes: Iterable
+):
+    """Print the per-request time for each size, and the overhead per unit."""
+    print(title)
+    baseline = None
+    for size in sizes:
+        app, scope = build(size)
+        usec = timeit(app, scope)
+        if baseline is None:
+            baseline = usec
+            print(f"  {size:>3}: {usec:8.1f} µs/request")
+        else:
+            per_unit = (usec - baseline) / size if size else 0.0
+            print(
+                f"  {size:>3}: {usec:8.1f} µs/request "
+                f"({per_unit:+.2f} µs per unit)"
+            )
@@ -8,15 +8,16 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
 )
 
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.wsgi import WSGIResponder
@@ -29,24 +30,45 @@ from .app_types import (
     ASGIAppInstance,
     ErrorHandler,
     EventHandler,
+    HTTPApp,
     Receive,
     Scope,
     Send,
 )
 from .compat import WSGIApp, nullcontext
+from .compression import CompressedBodyCache, GZipConfig, GZipMiddleware
 from .constants import CONTENT_TYPE, DEFAULT_CORS_CONFIG
 from .deprecation import deprecated
 from .error_handlers import error_to_text
-from .errors import HTTPError, HTTPErrorMiddleware, ServerErrorMiddleware
+from .executors import Executor, Executors, ProcessPool, use_executors
+from .fastlane import Body, FastHandler, FastLane, FastRoute
+from .errors import (
+    ErrorStats,
+    HTTPError,
+    HTTPErrorMiddleware,
+    ServerErrorMiddleware,
+)
 from .injection import create_context_provider, freeze_providers
-from .media import UnsupportedMediaType, get_default_handlers
+from .media import (
+    UnsupportedMediaType,
+    get_default_decoders,
+    get_default_handlers,
+)
 from .meta import DocsMeta
-from .middleware import ASGIMiddleware
+from .middleware import ASGIMiddleware, compile_middleware
 from .request import Request
 from .response import Response
-from .routing import RoutingMixin
+from .routing import ROUTE_NAME, HTTPRoute, RoutingMixin
 from .staticfiles import WhiteNoise, static
 from .testing import create_client
+from .throttling import Throttle
+from .timing import (
+    TIMINGS,
+    TimedASGIMiddleware,
+    Timings,
+    TimingStats,
+    timed_http,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from .recipes import Recipe
@@ -113,6 +135,37 @@ class App(RoutingMixin, metaclass=DocsMeta):
         If specified, compress only responses that
         have more bytes than the specified value.
         Defaults to `1024`.
+    gzip_level (int):
+        The GZip compression level, from `1` (fastest) to `9` (smallest).
+        Defaults to `9`.
+    max_body_size (int):
+        The maximum size of request bodies, in bytes. Requests that declare
+        a larger `Content-Length` are rejected before the body is read, and
+        reading stops as soon as more bytes are received.
+        In both cases, an `HTTPError(413)` is raised.
+        Can be overridden on a per-route basis.
+        Defaults to `None` (no limit).
+    enable_timing (bool):
+        If `True`, record the time spent in each stage of request processing
+        (ASGI and HTTP middleware, hooks, view and response rendering).
+        Timings are sent in a `Server-Timing` header and aggregated in
+        `timing_stats`.
+        Defaults to `False`.
+    canned_errors (bool):
+        If `True`, requests that match no route are handed to the
+        `HTTPError` handler directly, instead of raising an `HTTPError(404)`
+        through the HTTP middleware stack. HTTP middleware then sees
+        a regular 404 response (i.e. `.after_dispatch()` is called).
+        Defaults to `False`.
+    not_found_limit (int):
+        If given, the maximum number of requests to unknown URLs accepted
+        from a single client (based on its IP address) during
+        `not_found_period`. Further unmatched requests from that client get
+        a `429 Too Many Requests` response with a `Retry-After` header.
+        Defaults to `None` (no limit).
+    not_found_period (float):
+        The duration, in seconds, of the `not_found_limit` window.
+        Defaults to `60`.
     media_type (str):
         Determines how values given to `res.media` are serialized.
         Can be one of the supported media types.
@@ -123,6 +176,25 @@ class App(RoutingMixin, metaclass=DocsMeta):
     media_handlers (dict):
         The dictionary of media handlers.
         You can access, edit or replace this at will.
+    media_decoders (dict):
+        The dictionary of media decoders used by `req.media()`, mapping
+        a content type to a function that parses a request body.
+        You can access, edit or replace this at will.
+    gzip_cache (CompressedBodyCache):
+        The cache of compressed response bodies, which prevents
+        re-compressing identical responses of routes registered
+        with `gzip_cache=True`.
+    timing_stats (TimingStats):
+        If `enable_timing` is `True`, the aggregated timings of requests.
+        Otherwise, `None`.
+    executors (Executors):
+        The registry of named executors that run synchronous code.
+        See also #::bocadillo.applications#App.add_executor.
+    error_stats (ErrorStats):
+        Counters of responses and errors per route and status code.
+    fast_lane (FastLane):
+        The registry of fast routes.
+        See also #::bocadillo.applications#App.add_fast_route.
     """
 
     import_string: Optional[str]
@@ -152,6 +224,12 @@ class App(RoutingMixin, metaclass=DocsMeta):
         enable_hsts: bool = False,
         enable_gzip: bool = False,
         gzip_min_size: int = 1024,
+        gzip_level: int = 9,
+        max_body_size: Optional[int] = None,
+        enable_timing: bool = False,
+        canned_errors: bool = False,
+        not_found_limit: Optional[int] = None,
+        not_found_period: float = 60.0,
         media_type: str = CONTENT_TYPE.JSON,
         **kwargs,
     ):
@@ -162,9 +240,20 @@ class App(RoutingMixin, metaclass=DocsMeta):
         # Debug mode defaults to `False` but it can be set in `.run()`.
         self._debug = False
 
+        # Timing instrumentation (must be set up before adding middleware).
+        self.timing_stats: Optional[TimingStats] = (
+            TimingStats() if enable_timing else None
+        )
+
         # Base ASGI app
         self.asgi = self.dispatch
 
+        # Executors for synchronous code
+        self.executors = Executors()
+
+        # Routes answered before the ASGI middleware stack
+        self.fast_lane = FastLane()
+
         # Mounted (children) apps
         self._prefix_to_app: Dict[str, Any] = {}
         self._name_to_prefix_and_app: Dict[str, Tuple[str, App]] = {}
@@ -180,6 +269,10 @@ class App(RoutingMixin, metaclass=DocsMeta):
         self.media_handlers = get_default_handlers()
         self._media_type = ""
         self.media_type = media_type
+        self.media_decoders = get_default_decoders()
+
+        # Request body size limit
+        self.max_body_size = max_body_size
 
         # HTTP middleware
         self.exception_middleware = HTTPErrorMiddleware(
@@ -189,9 +282,21 @@ class App(RoutingMixin, metaclass=DocsMeta):
             self.exception_middleware, handler=error_to_text, debug=self._debug
         )
         self.add_error_handler(HTTPError, error_to_text)
+        self.error_stats = ErrorStats()
+        self._namespace_middleware: Dict[str, List[Tuple[Any, dict]]] = {}
+        if canned_errors:
+            self.http_router.not_found = self._not_found
+        if not_found_limit is not None:
+            self.http_router.not_found_throttle = Throttle(
+                not_found_limit, period=not_found_period
+            )
 
         # Lifespan middleware
         self._lifespan = Lifespan()
+        # NOTE: only the lifespan of the root app is run, so executors and
+        # process pools of mounted apps are managed from there.
+        self.on("startup", self._start_executors)
+        self.on("shutdown", self._stop_executors)
 
         # ASGI middleware
         if allowed_hosts is None:
@@ -204,6 +309,15 @@ class App(RoutingMixin, metaclass=DocsMeta):
             self.add_asgi_middleware(CORSMiddleware, **cors_config)
         if enable_hsts:
             self.add_asgi_middleware(HTTPSRedirectMiddleware)
+        # NOTE: compression of responses returned by routes is performed by
+        # `Response` so that routes can override these settings. The GZip
+        # middleware takes care of mounted apps and static files.
+        self.gzip = GZipConfig(
+            enabled=True if enable_gzip else None,
+            min_size=gzip_min_size,
+            level=gzip_level,
+        )
+        self.gzip_cache = CompressedBodyCache()
         if enable_gzip:
             self.add_asgi_middleware(GZipMiddleware, minimum_size=gzip_min_size)
 
@@ -214,11 +328,54 @@ class App(RoutingMixin, metaclass=DocsMeta):
     def _app_providers(self):  # pylint: disable=method-hidden
         if not self._frozen:
             freeze_providers()
+            self._resolve_executors()
             self._frozen = True
             # do nothing on subsequent calls
             self._app_providers = nullcontext
         return nullcontext()
 
+    async def _not_found(self, req: Request, res: Response) -> Response:
+        # NOTE: exceptions are mutable (e.g. their traceback), so a new one
+        # is created for each request.
+        return await self.exception_middleware.handle(req, res, HTTPError(404))
+
+    def _apps(self) -> Iterator["App"]:
+        # This app and the apps mounted onto it, recursively.
+        yield self
+        for app in self._prefix_to_app.values():
+            if isinstance(app, App):
+                yield from app._apps()  # pylint: disable=protected-access
+
+    def _resolve_executors(self):
+        self._configure_process_pool()
+        # Fail early if a route uses an executor that does not exist.
+        for app in self._apps():
+            for route in app.http_router.routes.values():
+                route.resolve_executor()
+
+    def _configure_process_pool(self):
+        # Configure a default process pool if process views have none.
+        # NOTE: this is done once all apps have been mounted, so that process
+        # views of mounted apps (e.g. recipes) use the pool of their parent.
+        if any(
+            route.view.process and route.executors.process_pool is None
+            for app in self._apps()
+            for route in app.http_router.routes.values()
+        ):
+            self.add_process_pool()
+
+    async def _start_executors(self):
+        self._configure_process_pool()
+        for app in self._apps():
+            # pylint: disable=protected-access
+            pool = app.executors._process_pool
+            if pool is not None:
+                await pool.start()
+
+    def _stop_executors(self):
+        for app in self._apps():
+            app.executors.shutdown(wait=False)
+
     @property
     @deprecated(
         since="0.13",
@@ -297,8 +454,11 @@ class App(RoutingMixin, metaclass=DocsMeta):
 
         self._prefix_to_app[prefix] = app
 
-        if isinstance(app, App) and app.name is not None:
-            self._name_to_prefix_and_app[app.name] = (prefix, app)
+        if isinstance(app, App):
+            # Routes of the mounted app can use our executors.
+            app.executors.parent = self.executors
+            if app.name is not None:
+                self._name_to_prefix_and_app[app.name] = (prefix, app)
 
         if isinstance(app, WhiteNoise):
             self._static_apps[prefix] = app
@@ -342,19 +502,220 @@ class App(RoutingMixin, metaclass=DocsMeta):
 
         return wrapper
 
-    def add_middleware(self, middleware_cls, **kwargs):
+    def add_executor(
+        self,
+        name: str,
+        *,
+        max_workers: int = None,
+        max_queue: int = None,
+        default: bool = False,
+    ) -> Executor:
+        """Register a named executor for synchronous code.
+
+        Synchronous views, hooks and middleware are run in a thread pool so
+        that they do not block the event loop. Routes can be assigned
+        a dedicated executor using `@app.route(..., executor=name)`, so that
+        slow synchronous endpoints cannot starve other endpoints of threads.
+
+        Executors are shut down when the application (or, for recipes, the
+        application they are applied to) shuts down.
+
+        # Parameters
+        name (str): the name of the executor.
+        max_workers (int): the maximum number of threads.
+        max_queue (int):
+            the maximum number of calls waiting for a thread. Past this
+            limit, requests get a `503 Service Unavailable` response.
+        default (bool):
+            whether this executor should be used for routes that do not
+            specify one. Otherwise, Starlette's thread pool is used.
+
+        # Returns
+        executor (Executor): the registered executor.
+
+        # See Also
+        - [Executors](../guides/http/views.md#executors)
+        """
+        executor = Executor(name, max_workers=max_workers, max_queue=max_queue)
+        self.executors[name] = executor
+        if default:
+            self.executors.default = executor
+        return executor
+
+    def add_process_pool(
+        self,
+        max_workers: int = None,
+        *,
+        warm_start: bool = False,
+        timeout: float = None,
+    ) -> ProcessPool:
+        """Configure the process pool used by process views.
+
+        The pool is started when the application starts up, and shut down
+        when the application shuts down. If process views are registered but
+        no pool has been configured (here or, for recipes, on the application
+        they are applied to), a pool with default settings is configured on
+        startup.
+
+        # Parameters
+        max_workers (int):
+            the number of worker processes. Defaults to the number of CPUs.
+        warm_start (bool):
+            whether to start all worker processes on startup instead of on
+            demand, which avoids slow first requests. Defaults to `False`.
+        timeout (float):
+            the default maximum duration of a task, in seconds. Tasks that
+            take longer result in a `504 Gateway Timeout` response.
+            Defaults to `None` (no timeout).
+
+        # Returns
+        pool (ProcessPool): the configured process pool.
+
+        # See Also
+        - [Process views](../guides/http/views.md#process-views)
+        """
+        # NOTE: do not shut down the pool of the app we're mounted onto.
+        # pylint: disable=protected-access
+        previous = self.executors._process_pool
+        if previous is not None:
+            previous.shutdown(wait=False)
+        pool = ProcessPool(
+            max_workers=max_workers, warm_start=warm_start, timeout=timeout
+        )
+        self.executors.process_pool = pool
+        return pool
+
+    def add_fast_route(
+        self,
+        path: str,
+        body: Body = b"",
+        *,
+        status: int = 200,
+        media_type: str = None,
+        headers: Dict[str, str] = None,
+        handler: FastHandler = None,
+    ):
+        """Register a fast route.
+
+        Fast routes are answered before the ASGI middleware stack, i.e.
+        without going through host checks, CORS, GZip, error handling,
+        HTTP middleware, routing, hooks or providers. They only accept
+        `GET` and `HEAD` requests and match paths exactly.
+
+        This is useful for cheap, high-frequency endpoints such as health
+        checks from load balancers.
+
+        # Parameters
+        path (str): the exact path of the route, e.g. `"/health"`.
+        body (bytes, str, dict or list):
+            a constant response body, encoded once and for all.
+            Dicts and lists are serialized to JSON.
+        status (int): the response status code. Defaults to `200`.
+        media_type (str): the response content type.
+        headers (dict): extra response headers.
+        handler (callable):
+            a sync or async function called with the ASGI scope on
+            each request, which returns the response body.
+            Sync handlers are run in a thread pool so that they do not
+            block the event loop. If the handler raises an exception,
+            a plain `500` response is sent and the exception is re-raised
+            so that the server logs it. Error handlers are not used.
+
+        # See Also
+        - [Fast routes](../guides/http/routing.md#fast-routes)
+        """
+        self.fast_lane.add(
+            path,
+            FastRoute(
+                body,
+                status=status,
+                media_type=media_type,
+                headers=headers,
+                handler=handler,
+            ),
+        )
+
+    def fast_route(self, path: str, **kwargs):
+        """Register a fast route by decorating a handler.
+
+        # Parameters
+        path (str): the exact path of the route.
+        kwargs (dict):
+            extra options passed to
+            #::bocadillo.applications#App.add_fast_route.
+
+        # Example
+
+        ```python
+        @app.fast_route("/metrics")
+        def metrics(scope):
+            return {"requests": counter.value}
+        ```
+        """
+
+        def decorate(handler: FastHandler) -> FastHandler:
+            self.add_fast_route(path, handler=handler, **kwargs)
+            return handler
+
+        return decorate
+
+    def add_middleware(
+        self, middleware_cls, *, namespace: str = None, **kwargs
+    ):
         """Register a middleware class.
 
         # Parameters
         middleware_cls: a subclass of #::bocadillo.middleware#Middleware.
+        namespace (str):
+            if given, the middleware is only applied to routes in this
+            namespace (including routes registered later), after routing.
+            Otherwise, it is applied to all requests.
 
         # See Also
         - [Middleware](../guides/http/middleware.md)
         """
-        self.exception_middleware.app = middleware_cls(
-            self.exception_middleware.app, app=self, **kwargs
+        if namespace is not None:
+            self._namespace_middleware.setdefault(namespace, []).append(
+                (middleware_cls, kwargs)
+            )
+            for route in self.http_router.routes.values():
+                if route.namespace == namespace:
+                    route.wrap(
+                        partial(
+                            self._build_middleware, middleware_cls, **kwargs
+                        )
+                    )
+            return
+
+        self.exception_middleware.app = self._build_middleware(
+            middleware_cls, self.exception_middleware.app, **kwargs
         )
 
+    def _build_middleware(self, middleware_cls, inner: HTTPApp, **kwargs):
+        middleware = middleware_cls(inner, app=self, **kwargs)
+        # NOTE: no-op hooks are removed from the chain here, once and
+        # for all, instead of being called on every request.
+        compiled = compile_middleware(middleware)
+        if self.timing_stats is not None and compiled is not inner:
+            compiled = timed_http(f"mw.{middleware_cls.__name__}", compiled)
+        return compiled
+
+    def _setup_route(self, route: HTTPRoute, middleware: Sequence[Any]):
+        route.executors = self.executors
+
+        # Apply route middleware first, so that it is the innermost.
+        namespace_middleware = self._namespace_middleware.get(
+            route.namespace, []
+        )
+        for item in [*reversed(middleware), *namespace_middleware]:
+            if isinstance(item, tuple):
+                middleware_cls, kwargs = item
+            else:
+                middleware_cls, kwargs = item, {}
+            route.wrap(
+                partial(self._build_middleware, middleware_cls, **kwargs)
+            )
+
     def add_asgi_middleware(self, middleware_cls, **kwargs):
         """Register an ASGI middleware class.
 
@@ -367,6 +728,10 @@ class App(RoutingMixin, metaclass=DocsMeta):
         """
         args = (self,) if issubclass(middleware_cls, ASGIMiddleware) else ()
         self.asgi = middleware_cls(self.asgi, *args, **kwargs)
+        if self.timing_stats is not None:
+            self.asgi = TimedASGIMiddleware(
+                self.asgi, name=f"asgi.{middleware_cls.__name__}"
+            )
 
     def on(self, event: str, handler: Optional[EventHandler] = None):
         """Register an event handler.
@@ -404,19 +769,36 @@ class App(RoutingMixin, metaclass=DocsMeta):
         return handler
 
     async def dispatch_http(self, receive: Receive, send: Send, scope: Scope):
-        req = Request(scope, receive)
+        req = Request(
+            scope,
+            receive,
+            media_decoders=self.media_decoders,
+            max_body_size=self.max_body_size,
+        )
         res = Response(
             req,
             media_type=self.media_type,
             media_handler=self.media_handlers[self.media_type],
+            gzip=self.gzip,
+            gzip_cache=self.gzip_cache,
+        )
+
+        executors = self.executors
+        executor_context = (
+            nullcontext()
+            if executors.default is None and executors.process_pool is None
+            else use_executors(executors)
         )
 
-        with self._http_context.assign(req=req, res=res):
+        with self._http_context.assign(req=req, res=res), executor_context:
             res: Response = await self.server_error_middleware(req, res)
+            self.error_stats.record(
+                scope.get(ROUTE_NAME), res.status_code or 200
+            )
             await res(receive, send)
             # Re-raise the exception to allow the server to log the error
             # and for the test client to optionally re-raise it too.
-            self.server_error_middleware.raise_if_exception()
+            self.server_error_middleware.raise_if_exception(req)
 
     async def dispatch_websocket(
         self, receive: Receive, send: Send, scope: Scope
@@ -445,9 +827,32 @@ class App(RoutingMixin, metaclass=DocsMeta):
             assert scope["type"] == "http"
             return partial(self.dispatch_http, scope=scope)
 
+    def _timed_asgi(self, scope: Scope) -> ASGIAppInstance:
+        # Record the timings of the request once it has been processed.
+        timings = scope[TIMINGS] = Timings()
+        instance = self.asgi(scope)
+
+        async def asgi(receive: Receive, send: Send):
+            try:
+                await instance(receive, send)
+            finally:
+                self.timing_stats.record(scope, timings)
+
+        return asgi  # type: ignore
+
     def __call__(self, scope: Scope) -> ASGIAppInstance:
         if scope["type"] == "lifespan":
             return self._lifespan(scope)
+        if self.fast_lane:
+            instance = self.fast_lane.match(scope)
+            if instance is not None:
+                return instance
+        if (
+            self.timing_stats is not None
+            and scope["type"] == "http"
+            and TIMINGS not in scope
+        ):
+            return self._timed_asgi(scope)
         return self.asgi(scope)
 
     def run(
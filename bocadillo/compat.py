@@ -22,7 +22,7 @@ except ImportError:  # pragma: no cover
         yield enter_result
 
 
-from starlette.concurrency import run_in_threadpool
+from .executors import run_sync
 
 _CAMEL_REGEX = re.compile(r"(.)([A-Z][a-z]+)")
 _SNAKE_REGEX = re.compile(r"([a-z0-9])([A-Z])")
@@ -41,7 +41,8 @@ async def call_async(
     # Parameters
     func:
         a callable that is either awaited (if a coroutine function)
-        or run in the thread pool (if a regular function).
+        or run in the thread pool of the current executor
+        (if a regular function).
     sync (bool):
         a hint as to whether `func` is synchronous. If not given, it is
         inferred as `asyncio.iscoroutinefunction(func)`.
@@ -50,7 +51,7 @@ async def call_async(
     - [Executing code in thread or process pools](https://docs.python.org/3/library/asyncio-eventloop.html#executing-code-in-thread-or-process-pools)
     """
     if sync or (sync is None and not asyncio.iscoroutinefunction(func)):
-        return await run_in_threadpool(func, *args, **kwargs)
+        return await run_sync(func, *args, **kwargs)
 
     async_func = cast(Callable[..., Awaitable[_V]], func)
     return await async_func(*args, **kwargs)
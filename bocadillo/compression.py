@@ -0,0 +1,181 @@
+import zlib
+from collections import OrderedDict
+from typing import AsyncIterable, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware as _GZipMiddleware
+from starlette.middleware.gzip import GZipResponder as _GZipResponder
+from starlette.types import ASGIApp, ASGIInstance, Message, Scope
+
+# Scope key set when a Bocadillo route has already decided whether
+# the response should be compressed.
+GZIP_HANDLED = "bocadillo.gzip_handled"
+
+# Using `16 + MAX_WBITS` makes zlib produce a GZip container (with a zero
+# `mtime`, which makes the output deterministic).
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GZipConfig:
+    """GZip compression settings.
+
+    # Parameters
+    enabled (bool):
+        whether responses should be compressed.
+        `None` means "not configured", i.e. inherit from an outer level.
+    min_size (int):
+        the minimum size in bytes of a response body for it to be compressed.
+    level (int):
+        the compression level, from `1` (fastest) to `9` (smallest).
+    cache (bool):
+        whether compressed bodies should be cached. Only meant for
+        routes that send identical responses.
+    """
+
+    __slots__ = ("enabled", "min_size", "level", "cache")
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        min_size: Optional[int] = None,
+        level: Optional[int] = None,
+        cache: Optional[bool] = None,
+    ):
+        self.enabled = enabled
+        self.min_size = min_size
+        self.level = level
+        self.cache = cache
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, attr) is None for attr in self.__slots__)
+
+    def merge(self, defaults: "GZipConfig") -> "GZipConfig":
+        """Return settings where unset values are taken from `defaults`."""
+        return GZipConfig(
+            **{
+                attr: (
+                    getattr(self, attr)
+                    if getattr(self, attr) is not None
+                    else getattr(defaults, attr)
+                )
+                for attr in self.__slots__
+            }
+        )
+
+
+class CompressedBodyCache:
+    """A bounded LRU cache of compressed response bodies.
+
+    Only used for routes that opt in with `gzip_cache=True`. Views that
+    always return the same content (constant pages, cached results…) then
+    only pay for a dictionary lookup instead of re-compressing the same
+    bytes on every request.
+
+    # Parameters
+    max_bytes (int):
+        the maximum total size of cached bodies, counting both the
+        original and the compressed bodies. Least recently used bodies
+        are evicted first. Defaults to 16 MiB.
+    max_body_size (int):
+        bodies larger than this many bytes are compressed but not cached.
+        Defaults to 64 KiB.
+
+    # Attributes
+    hits (int): the number of cache hits.
+    misses (int): the number of cache misses.
+    size (int): the total size of cached bodies, in bytes.
+    """
+
+    def __init__(
+        self, max_bytes: int = 16 * 1024 * 1024, max_body_size: int = 64 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.max_body_size = max_body_size
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._cache: "OrderedDict[Tuple[int, bytes], bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = self.size = 0
+
+    def compress(self, body: bytes, level: int) -> bytes:
+        """Return the GZip-compressed version of `body`."""
+        if len(body) > self.max_body_size:
+            return gzip_compress(body, level)
+
+        key = (level, body)
+        try:
+            compressed = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            compressed = gzip_compress(body, level)
+            self._cache[key] = compressed
+            self.size += len(body) + len(compressed)
+            while self.size > self.max_bytes:
+                (_, evicted), evicted_compressed = self._cache.popitem(
+                    last=False
+                )
+                self.size -= len(evicted) + len(evicted_compressed)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+
+        return compressed
+
+
+def gzip_compress(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+async def gzip_stream(
+    source: AsyncIterable, level: int, charset: str = "utf-8"
+) -> AsyncIterable[bytes]:
+    # Compress chunks of a streamed response on the fly.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    async for chunk in source:
+        if not isinstance(chunk, bytes):
+            chunk = chunk.encode(charset)
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(headers: Headers) -> bool:
+    return "gzip" in headers.get("accept-encoding", "")
+
+
+class GZipMiddleware(_GZipMiddleware):
+    """Compress responses for clients that support it.
+
+    Subclass of Starlette's `GZipMiddleware` which leaves alone responses
+    for which a Bocadillo route has already applied its own compression
+    settings.
+    """
+
+    def __call__(self, scope: Scope) -> ASGIInstance:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope)):
+            return GZipResponder(self.app, scope, self.minimum_size)
+        return self.app(scope)
+
+
+class GZipResponder(_GZipResponder):
+    def __init__(self, app: ASGIApp, scope: Scope, minimum_size: int):
+        super().__init__(app, scope, minimum_size)
+        self.scope = scope
+        self.passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.passthrough = self.scope.get(GZIP_HANDLED, False)
+
+        if self.passthrough:
+            await self.send(message)
+        else:
+            await super().send_with_gzip(message)
@@ -1,6 +1,36 @@
+from typing import Hashable
+
 from .request import Request
 from .response import Response
-from .errors import HTTPError
+from .errors import HTTPError, canned_bodies
+
+# NOTE: bodies of error responses without `detail` only depend on the
+# handler, the status code and (for media) the response's media settings,
+# so they are computed once and stored by the app's `HTTPErrorMiddleware`.
+
+
+def _get_canned(res: Response, key: Hashable) -> bool:
+    bodies = canned_bodies.get()
+    if bodies is None or not isinstance(res, Response):
+        # E.g. a debug response built by `ServerErrorMiddleware`.
+        return False
+    try:
+        content, content_type = bodies[key]
+    except KeyError:
+        return False
+    res.content = content
+    res.headers["content-type"] = content_type
+    return True
+
+
+def _set_canned(res: Response, key: Hashable):
+    bodies = canned_bodies.get()
+    if bodies is None or not isinstance(res, Response):
+        return
+    content = res.content
+    if isinstance(content, str):
+        content = res.content = content.encode("utf-8")
+    bodies[key] = (content, res.headers["content-type"])
 
 
 # Built-in HTTP error handlers.
@@ -20,10 +50,13 @@ async def error_to_html(req: Request, res: Response, exc: HTTPError):
     ```
     """
     res.status_code = exc.status_code
-    html = f"<h1>{exc.title}</h1>"
     if exc.detail:
-        html += f"\n<p>{exc.detail}</p>"
-    res.html = html
+        res.html = f"<h1>{exc.title}</h1>\n<p>{exc.detail}</p>"
+        return
+    key = ("html", exc.status_code)
+    if not _get_canned(res, key):
+        res.html = f"<h1>{exc.title}</h1>"
+        _set_canned(res, key)
 
 
 async def error_to_media(req: Request, res: Response, exc: HTTPError):
@@ -49,7 +82,13 @@ async def error_to_media(req: Request, res: Response, exc: HTTPError):
     media = {"error": exc.title, "status": exc.status_code}
     if exc.detail:
         media["detail"] = exc.detail
-    res.media = media
+        res.media = media
+        return
+    # pylint: disable=protected-access
+    key = ("media", exc.status_code, res._media_type, res._media_handler)
+    if not _get_canned(res, key):
+        res.media = media
+        _set_canned(res, key)
 
 
 async def error_to_text(req: Request, res: Response, exc: HTTPError):
@@ -65,7 +104,10 @@ async def error_to_text(req: Request, res: Response, exc: HTTPError):
     ```
     """
     res.status_code = exc.status_code
-    text = exc.title
     if exc.detail:
-        text += f"\n{exc.detail}"
-    res.text = text
+        res.text = f"{exc.title}\n{exc.detail}"
+        return
+    key = ("text", exc.status_code)
+    if not _get_canned(res, key):
+        res.text = exc.title
+        _set_canned(res, key)
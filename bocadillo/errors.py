@@ -1,6 +1,7 @@
 import traceback
+from contextvars import ContextVar
 from http import HTTPStatus
-from typing import Any, Dict, Optional, Type, Union
+from typing import Any, Dict, Hashable, Optional, Tuple, Type, Union
 
 import jinja2
 from starlette.responses import HTMLResponse, PlainTextResponse
@@ -11,6 +12,16 @@ from .misc import read_asset
 from .request import Request
 from .response import Response
 
+# Scope key where the unhandled exception raised by a request is stored.
+SERVER_ERROR = "bocadillo.server_error"
+
+# Pre-encoded `(content, content_type)` of error responses, owned by the
+# `HTTPErrorMiddleware` handling the current exception (see `error_handlers`).
+CannedBodies = Dict[Hashable, Tuple[bytes, str]]
+canned_bodies: ContextVar[Optional[CannedBodies]] = ContextVar(
+    "bocadillo.canned_bodies", default=None
+)
+
 
 class HTTPError(Exception):
     """Raised when an HTTP error occurs.
@@ -64,6 +75,10 @@ class ServerErrorMiddleware(HTTPApp):
     """Return 500 response when an unhandled exception occurs.
 
     Adaptation of Starlette's `ServerErrorMiddleware`.
+
+    The exception is stored on the request (not on the middleware, which
+    is shared by concurrent requests) so that it can be re-raised once
+    the response has been sent. See `.raise_if_exception()`.
     """
 
     _template_name = "server_error.jinja"
@@ -74,15 +89,23 @@ class ServerErrorMiddleware(HTTPApp):
         self.app = app
         self.handler = handler
         self.debug = debug
-        self.exception: Optional[BaseException] = None
         self.jinja = jinja2.Environment()
+        self._template: Optional[jinja2.Template] = None
+
+    @property
+    def template(self) -> jinja2.Template:
+        # Only load and compile the debug template once, when first needed.
+        if self._template is None:
+            self._template = self.jinja.from_string(
+                read_asset(self._template_name)
+            )
+        return self._template
 
     def generate_html(self, req: Request, exc: BaseException) -> str:
-        template = self.jinja.from_string(read_asset(self._template_name))
         tb_exc = traceback.TracebackException.from_exception(
             exc, capture_locals=True
         )
-        return template.render(
+        return self.template.render(
             exc_type=exc.__class__.__name__,
             exc=exc,
             url_path=req.url.path,
@@ -102,15 +125,21 @@ class ServerErrorMiddleware(HTTPApp):
         content = self.generate_plain_text(exc)
         return PlainTextResponse(content, status_code=500)
 
-    def raise_if_exception(self):
-        if self.exception is not None:
-            raise self.exception from None
+    def raise_if_exception(self, req: Request):
+        """Re-raise the exception that occurred while processing `req`, if any.
+
+        The exception is removed from the request beforehand, so that its
+        traceback (and the frames' locals) are not kept alive.
+        """
+        exc = req.scope.pop(SERVER_ERROR, None)
+        if exc is not None:
+            raise exc from None
 
     async def __call__(self, req: Request, res: Response) -> Response:
         try:
             res = await self.app(req, res)
         except BaseException as exc:
-            self.exception = exc
+            req.scope[SERVER_ERROR] = exc
             if self.debug:
                 # In debug mode, return traceback responses.
                 res = self.debug_response(req, exc)
@@ -122,6 +151,68 @@ class ServerErrorMiddleware(HTTPApp):
             return res
 
 
+# Sentinel for "all routes" (`None` stands for unmatched requests).
+_ALL_ROUTES: Any = object()
+
+
+class ErrorStats:
+    """Count responses and errors per route and status code.
+
+    Routes are identified by their name. Requests that did not match
+    any route are counted under `None`.
+
+    # Attributes
+    requests (dict): the number of responses, per route.
+    errors (dict):
+        the number of error responses (i.e. with a `4xx` or `5xx` status
+        code), per `(route, status_code)` pair.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Optional[str], int] = {}
+        self.errors: Dict[Tuple[Optional[str], int], int] = {}
+
+    def record(self, route: Optional[str], status_code: int):
+        requests = self.requests
+        requests[route] = requests.get(route, 0) + 1
+        if status_code >= 400:
+            key = (route, status_code)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def error_rate(
+        self, route: Optional[str] = _ALL_ROUTES, status: int = None
+    ) -> float:
+        """Return the proportion of error responses.
+
+        # Parameters
+        route (str):
+            if given, only consider responses for this route. Pass `None`
+            to only consider requests that did not match any route.
+        status (int): if given, only consider errors with this status code.
+
+        # Returns
+        rate (float): a number between `0` and `1`.
+        """
+        all_routes = route is _ALL_ROUTES
+        if all_routes:
+            total = sum(self.requests.values())
+        else:
+            total = self.requests.get(route, 0)
+        if not total:
+            return 0.0
+        errors = sum(
+            count
+            for (error_route, error_status), count in self.errors.items()
+            if (all_routes or error_route == route)
+            and (status is None or error_status == status)
+        )
+        return errors / total
+
+    def reset(self):
+        self.requests.clear()
+        self.errors.clear()
+
+
 class HTTPErrorMiddleware(HTTPApp):
     """Handle exceptions that occur while handling HTTP requests.
 
@@ -132,27 +223,52 @@ class HTTPErrorMiddleware(HTTPApp):
         self.app = app
         self.debug = debug
         self._exception_handlers: Dict[Type[BaseException], ErrorHandler] = {}
+        # Resolved handlers, indexed by exception type.
+        self._handler_cache: Dict[type, Optional[ErrorHandler]] = {}
+        # Bodies of error responses reused by built-in error handlers.
+        self.canned_bodies: CannedBodies = {}
 
     def add_exception_handler(
         self, exception_class: Type[_E], handler: ErrorHandler
     ) -> None:
         assert issubclass(exception_class, BaseException)
         self._exception_handlers[exception_class] = handler
+        self._handler_cache.clear()
 
     def _get_exception_handler(self, exc: _E) -> Optional[ErrorHandler]:
-        for cls, handler in self._exception_handlers.items():
-            if issubclass(type(exc), cls):
-                return handler
-        return None
+        exc_type = type(exc)
+        try:
+            return self._handler_cache[exc_type]
+        except KeyError:
+            pass
+
+        # The handler registered for the most specific class wins, i.e.
+        # the first class in the method resolution order of the exception.
+        handler: Optional[ErrorHandler] = None
+        for cls in exc_type.__mro__:
+            if cls in self._exception_handlers:
+                handler = self._exception_handlers[cls]
+                break
+
+        self._handler_cache[exc_type] = handler
+        return handler
+
+    async def handle(self, req: Request, res: Response, exc: _E) -> Response:
+        """Call the error handler for `exc`, or raise it if there is none."""
+        handler = self._get_exception_handler(exc)
+        if handler is None:
+            raise exc from None
+        token = canned_bodies.set(self.canned_bodies)
+        try:
+            await call_async(handler, req, res, exc)  # type: ignore
+        finally:
+            canned_bodies.reset(token)
+        return res
 
     async def __call__(self, req: Request, res: Response) -> Response:
         try:
             res = await self.app(req, res)
         except Exception as exc:  # pylint: disable=broad-except
-            handler = self._get_exception_handler(exc)
-            if handler is None:
-                raise exc from None
-            await call_async(handler, req, res, exc)  # type: ignore
-            return res
+            return await self.handle(req, res, exc)
         else:
             return res
@@ -0,0 +1,393 @@
+import asyncio
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional, Set, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from contextvars import ContextVar, copy_context
+except ImportError:  # pragma: no cover
+    # Python 3.6 (installed along with `aiodine`).
+    # pylint: disable=import-error
+    from aiocontextvars import ContextVar, copy_context
+
+_V = TypeVar("_V")
+
+# The executor used to run synchronous code in the current context.
+_current_executor: ContextVar[Optional["Executor"]] = ContextVar(
+    "bocadillo.executor", default=None
+)
+# The process pool used to run CPU-bound views in the current context.
+_current_process_pool: ContextVar[Optional["ProcessPool"]] = ContextVar(
+    "bocadillo.process_pool", default=None
+)
+
+# Functions that can be run in a process pool, indexed by import path.
+# NOTE: decorated functions cannot be pickled by reference (their module
+# attribute is the decorated object), so worker processes look them up here.
+_PROCESS_FUNCTIONS: Dict[str, Callable] = {}
+
+
+class Executor:
+    """A named pool of threads used to run synchronous code.
+
+    Synchronous views, hooks and middleware are run in a thread pool so that
+    they do not block the event loop. Dedicated executors isolate routes
+    from each other: a slow synchronous endpoint can only use up the
+    threads of its own executor.
+
+    # Parameters
+    name (str): the name of the executor.
+    max_workers (int):
+        the maximum number of threads.
+        Defaults to the `concurrent.futures.ThreadPoolExecutor` default.
+    max_queue (int):
+        the maximum number of calls waiting for a thread. Past this limit,
+        calls are rejected with an `HTTPError(503)`.
+        Defaults to `None` (no limit).
+
+    # Attributes
+    active (int): the number of calls currently using a thread.
+    queued (int): the number of calls waiting for a thread.
+    completed (int): the number of calls that have completed.
+    rejected (int): the number of calls rejected due to `max_queue`.
+    """
+
+    def __init__(
+        self, name: str, max_workers: int = None, max_queue: int = None
+    ):
+        self.name = name
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"bocadillo-{name}"
+        )
+        # pylint: disable=protected-access
+        self.max_workers: int = self._pool._max_workers
+        self.max_queue = max_queue
+        # NOTE: counters are only updated from the event loop thread.
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def active(self) -> int:
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._pending - self.max_workers)
+
+    @property
+    def utilization(self) -> float:
+        """The proportion of threads in use, between `0` and `1`."""
+        return self.active / self.max_workers
+
+    def stats(self) -> dict:
+        """Return a snapshot of the executor's metrics."""
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "utilization": self.utilization,
+        }
+
+    async def run(self, func: Callable[..., _V], *args, **kwargs) -> _V:
+        """Run `func` in one of the executor's threads.
+
+        # Raises
+        HTTPError(503): if the executor's queue is full.
+        """
+        if self.max_queue is not None and self.queued >= self.max_queue:
+            from .errors import HTTPError  # prevent circular imports
+
+            self.rejected += 1
+            raise HTTPError(503, detail="Server is too busy.")
+
+        loop = asyncio.get_event_loop()
+        # Run in a copy of the current context, so that context variables
+        # (e.g. set by middleware) are visible in the thread.
+        context = copy_context()
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(
+                self._pool, context.run, partial(func, *args, **kwargs)
+            )
+        finally:
+            self._pending -= 1
+            self.completed += 1
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def __repr__(self):
+        return (
+            f"<Executor name={self.name!r} max_workers={self.max_workers} "
+            f"active={self.active} queued={self.queued}>"
+        )
+
+
+def register_process_function(func: Callable) -> str:
+    """Allow `func` to be run in worker processes and return its key.
+
+    `func` must be defined at the top level of a module.
+    """
+    key = f"{func.__module__}:{func.__qualname__}"
+    _PROCESS_FUNCTIONS[key] = func
+    return key
+
+
+def _call_process_function(key: str, args: tuple, kwargs: dict) -> Any:
+    # Executed in worker processes.
+    try:
+        func = _PROCESS_FUNCTIONS[key]
+    except KeyError:
+        # Worker was spawned (not forked): importing the module
+        # registers the function.
+        importlib.import_module(key.partition(":")[0])
+        func = _PROCESS_FUNCTIONS[key]
+    return func(*args, **kwargs)
+
+
+class ProcessPool:
+    """A managed pool of worker processes for CPU-bound code.
+
+    The pool is started and stopped with the application (see
+    #::bocadillo.applications#App.add_process_pool), or started
+    on first use if the application's lifespan is not run.
+
+    # Parameters
+    max_workers (int):
+        the number of worker processes. Defaults to the number of CPUs.
+    warm_start (bool):
+        whether to start all worker processes on startup, instead of
+        on demand. Defaults to `False`.
+    timeout (float):
+        the default maximum duration of a task, in seconds.
+        Defaults to `None` (no timeout). See `run()` for caveats.
+
+    # Attributes
+    submitted (int): the number of submitted tasks.
+    completed (int): the number of completed tasks.
+    timeouts (int): the number of tasks that timed out.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        warm_start: bool = False,
+        timeout: float = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.warm_start = warm_start
+        self.timeout = timeout
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    @property
+    def pids(self) -> Set[int]:
+        """The process IDs of the worker processes started so far."""
+        if self._pool is None:
+            return set()
+        # pylint: disable=protected-access
+        return set(self._pool._processes or ())
+
+    async def start(self):
+        if self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        if self.warm_start:
+            # Each task that finds no idle worker starts a new one.
+            loop = asyncio.get_event_loop()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._pool, os.getpid)
+                    for _ in range(self.max_workers)
+                )
+            )
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool's metrics."""
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+        }
+
+    async def run(
+        self,
+        func: Callable[..., _V],
+        args: tuple = (),
+        kwargs: dict = None,
+        timeout: float = None,
+    ) -> _V:
+        """Run `func` in a worker process and return its result.
+
+        # Parameters
+        func (callable):
+            a function registered with `register_process_function()`.
+            Arguments and return value must be picklable.
+        args (tuple): positional arguments passed to `func`.
+        kwargs (dict): keyword arguments passed to `func`.
+        timeout (float): overrides the pool's default `timeout`.
+
+        The timeout starts when the task is submitted, so time spent waiting
+        for a worker (i.e. when all workers are busy) counts towards it.
+        Worker processes cannot be interrupted: a task that timed out keeps
+        its worker busy until it completes.
+
+        # Raises
+        HTTPError(504): if the task did not complete in time.
+        """
+        if self._pool is None:
+            await self.start()
+        if timeout is None:
+            timeout = self.timeout
+
+        key = f"{func.__module__}:{func.__qualname__}"
+        assert key in _PROCESS_FUNCTIONS, f"{key} is not registered"
+        loop = asyncio.get_event_loop()
+        self.submitted += 1
+        future = loop.run_in_executor(
+            self._pool, _call_process_function, key, args, kwargs or {}
+        )
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            from .errors import HTTPError  # prevent circular imports
+
+            # NOTE: the worker process keeps running the task until it
+            # completes. Only the response is not waiting for it anymore.
+            self.timeouts += 1
+            raise HTTPError(504, detail="Task timed out.") from None
+        self.completed += 1
+        return result
+
+
+class Executors(Dict[str, Executor]):
+    """A registry of named executors.
+
+    # Attributes
+    default (Executor):
+        the executor used when a route does not specify one.
+        If `None`, Starlette's thread pool is used.
+    process_pool (ProcessPool):
+        the pool of worker processes used by process views, if any.
+    parent (Executors):
+        the registry of the app this app is mounted onto, if any (e.g. for
+        recipes). Executors that are not registered here are looked up
+        in the parent, which also provides the `default` executor and the
+        `process_pool` if they are not set here.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._default: Optional[Executor] = None
+        self._process_pool: Optional[ProcessPool] = None
+        self.parent: Optional["Executors"] = None
+
+    @property
+    def default(self) -> Optional[Executor]:
+        if self._default is None and self.parent is not None:
+            return self.parent.default
+        return self._default
+
+    @default.setter
+    def default(self, executor: Optional[Executor]):
+        self._default = executor
+
+    @property
+    def process_pool(self) -> Optional["ProcessPool"]:
+        if self._process_pool is None and self.parent is not None:
+            return self.parent.process_pool
+        return self._process_pool
+
+    @process_pool.setter
+    def process_pool(self, pool: Optional["ProcessPool"]):
+        self._process_pool = pool
+
+    def __missing__(self, name: str) -> Executor:
+        if self.parent is not None:
+            return self.parent[name]
+        raise KeyError(f"No executor named {name!r} has been registered.")
+
+    def stats(self) -> Dict[str, dict]:
+        """Return the metrics of all executors, indexed by name."""
+        return {name: executor.stats() for name, executor in self.items()}
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the executors and the process pool of this registry."""
+        for executor in self.values():
+            executor.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+
+
+@contextmanager
+def use_executor(executor: Optional[Executor]) -> Iterator[None]:
+    """Run synchronous code in `executor` within the context block."""
+    token = _current_executor.set(executor)
+    try:
+        yield
+    finally:
+        _current_executor.reset(token)
+
+
+@contextmanager
+def use_executors(executors: Executors) -> Iterator[None]:
+    """Use the default executor and process pool of a registry."""
+    token = _current_process_pool.set(executors.process_pool)
+    try:
+        with use_executor(executors.default):
+            yield
+    finally:
+        _current_process_pool.reset(token)
+
+
+async def run_sync(func: Callable[..., _V], *args: Any, **kwargs: Any) -> _V:
+    """Run a synchronous function in the current executor.
+
+    If no executor is being used, Starlette's thread pool is used.
+    """
+    executor = _current_executor.get()
+    if executor is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await executor.run(func, *args, **kwargs)
+
+
+async def run_in_process(
+    func: Callable[..., _V],
+    args: tuple = (),
+    kwargs: dict = None,
+    timeout: float = None,
+) -> _V:
+    """Run a registered function in the current process pool.
+
+    See #::bocadillo.executors#ProcessPool.run for parameters.
+
+    # Raises
+    RuntimeError: if no process pool is being used.
+    """
+    pool = _current_process_pool.get()
+    if pool is None:
+        raise RuntimeError("No process pool has been configured.")
+    return await pool.run(func, args, kwargs, timeout=timeout)
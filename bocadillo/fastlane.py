@@ -0,0 +1,167 @@
+import inspect
+import json
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from starlette.types import ASGIInstance, Receive, Scope, Send
+
+from .constants import CONTENT_TYPE
+from .executors import run_sync
+
+FastHandler = Callable[[Scope], Any]
+Body = Union[bytes, str, dict, list]
+
+FAST_ROUTE_METHODS = ("GET", "HEAD")
+
+_EMPTY_BODY = {"type": "http.response.body", "body": b""}
+
+
+def _encode(body: Body) -> Tuple[bytes, str]:
+    # Return the encoded body and its default media type.
+    if isinstance(body, bytes):
+        return body, CONTENT_TYPE.PLAIN_TEXT
+    if isinstance(body, str):
+        return body.encode("utf-8"), CONTENT_TYPE.PLAIN_TEXT
+    return json.dumps(body).encode("utf-8"), CONTENT_TYPE.JSON
+
+
+def _start_message(
+    status: int, media_type: str, headers: Dict[str, str], length: int
+) -> dict:
+    if media_type.startswith("text/") and "charset" not in media_type:
+        media_type += "; charset=utf-8"
+    raw_headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", media_type.encode("latin-1")),
+        (b"content-length", str(length).encode("latin-1")),
+    ]
+    raw_headers.extend(
+        (key.lower().encode("latin-1"), value.encode("latin-1"))
+        for key, value in headers.items()
+    )
+    return {
+        "type": "http.response.start",
+        "status": status,
+        "headers": raw_headers,
+    }
+
+
+_SERVER_ERROR_START = _start_message(
+    500, CONTENT_TYPE.PLAIN_TEXT, {}, len(b"Internal Server Error")
+)
+_SERVER_ERROR_BODY = {
+    "type": "http.response.body",
+    "body": b"Internal Server Error",
+}
+
+
+class FastRoute:
+    """A route answered before the ASGI and HTTP middleware stacks.
+
+    Fast routes are meant for cheap, high-frequency endpoints such as health
+    checks. When no `handler` is given, the response messages are computed
+    once and for all, so that answering a request only costs a dictionary
+    lookup and sending the messages.
+
+    # Parameters
+    body (bytes, str, dict or list):
+        a constant response body. Dicts and lists are serialized to JSON.
+    status (int): the response status code. Defaults to `200`.
+    media_type (str):
+        the response content type. Defaults to plain text for
+        bytes and strings, and JSON otherwise.
+    headers (dict): extra response headers.
+    handler (callable):
+        a sync or async function called with the ASGI scope
+        that returns the response body. Takes precedence over `body`.
+        Sync handlers are run in the thread pool.
+        If it raises an exception, a plain `500` response is sent and
+        the exception is re-raised so that the server can log it.
+    """
+
+    __slots__ = (
+        "status",
+        "media_type",
+        "headers",
+        "handler",
+        "_is_async",
+        "_start",
+        "_body",
+    )
+
+    def __init__(
+        self,
+        body: Body = b"",
+        *,
+        status: int = 200,
+        media_type: Optional[str] = None,
+        headers: Dict[str, str] = None,
+        handler: Optional[FastHandler] = None,
+    ):
+        self.status = status
+        self.media_type = media_type
+        self.headers = headers or {}
+        self.handler = handler
+        self._is_async = inspect.iscoroutinefunction(handler)
+
+        if handler is None:
+            self._start, self._body = self._build(body)
+        else:
+            self._start = self._body = None
+
+    def _build(self, body: Body) -> Tuple[dict, dict]:
+        content, default_media_type = _encode(body)
+        start = _start_message(
+            self.status,
+            self.media_type or default_media_type,
+            self.headers,
+            len(content),
+        )
+        return start, {"type": "http.response.body", "body": content}
+
+    async def __call__(self, receive: Receive, send: Send, scope: Scope):
+        if self.handler is None:
+            start, body = self._start, self._body
+        else:
+            try:
+                if self._is_async:
+                    result = await self.handler(scope)
+                else:
+                    result = await run_sync(self.handler, scope)
+                start, body = self._build(result)
+            except Exception:
+                # NOTE: fast routes bypass the error middleware, so send
+                # the error response here.
+                await send(_SERVER_ERROR_START)
+                await send(_SERVER_ERROR_BODY)
+                raise
+
+        await send(start)
+        await send(_EMPTY_BODY if scope["method"] == "HEAD" else body)
+
+
+class FastLane:
+    """Registry of fast routes, indexed by path.
+
+    # Attributes
+    routes (dict): a mapping of paths to #::bocadillo.fastlane#FastRoute.
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, FastRoute] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.routes)
+
+    def add(self, path: str, route: FastRoute):
+        if not path.startswith("/"):
+            path = "/" + path
+        self.routes[path] = route
+
+    def match(self, scope: Scope) -> Optional[ASGIInstance]:
+        """Return an ASGI instance if the request is for a fast route."""
+        if scope["type"] != "http" or scope["method"] not in FAST_ROUTE_METHODS:
+            return None
+        route = self.routes.get(scope["path"])
+        if route is None:
+            return None
+        return partial(route, scope=scope)
@@ -1,11 +1,23 @@
 import inspect
 from functools import wraps
-from typing import Callable, cast, Dict, Union, Awaitable, Type
-
-from .compat import call_async
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Type,
+    Union,
+    cast,
+)
+
+from .executors import run_sync
 from .request import Request
 from .response import Response
 from .routing import HTTPRoute
+from .timing import TIMINGS
 from .views import Handler, get_handlers, View
 
 HookFunction = Callable[[Request, Response, dict], Awaitable[None]]
@@ -14,6 +26,145 @@ HookCollection = Dict[HTTPRoute, HookFunction]
 BEFORE = "before"
 AFTER = "after"
 
+# How a hook function is called.
+_AWAIT = 0  # Awaited (coroutine functions).
+_INLINE = 1  # Called directly on the event loop (sync, marked with `inline`).
+_THREAD = 2  # Run in the thread pool (other sync functions).
+
+_INLINE_ATTR = "__bocadillo_inline__"
+
+
+def inline(hook: Any) -> Any:
+    """Mark a synchronous hook function as safe to call on the event loop.
+
+    By default, synchronous hooks are run in a thread pool so that they
+    do not block the event loop. Hooks that are fast and do not perform
+    any I/O can skip this overhead by being decorated with `@inline`.
+
+    # Example
+
+    ```python
+    from bocadillo import hooks
+
+    @hooks.inline
+    def require_token(req, res, params):
+        if "x-token" not in req.headers:
+            raise HTTPError(401)
+    ```
+    """
+    setattr(hook, _INLINE_ATTR, True)
+    return hook
+
+
+class _Hook(NamedTuple):
+    name: str
+    func: Callable
+    mode: int
+    args: tuple
+    kwargs: dict
+
+
+def _make_hook(hook_type: str, func: Callable, args, kwargs) -> _Hook:
+    if inspect.iscoroutinefunction(func):
+        mode = _AWAIT
+    elif getattr(func, _INLINE_ATTR, False):
+        mode = _INLINE
+    else:
+        mode = _THREAD
+    name = getattr(func, "__name__", type(func).__name__)
+    return _Hook(f"hook.{hook_type}.{name}", func, mode, args, kwargs)
+
+
+async def _run_hooks(hooks: List[_Hook], req: Request, res: Response, params):
+    timings = req.get(TIMINGS)
+    for name, func, mode, args, kwargs in hooks:
+        if timings is not None:
+            start = timings.start()
+        try:
+            if mode == _AWAIT:
+                await func(req, res, params, *args, **kwargs)
+            elif mode == _INLINE:
+                func(req, res, params, *args, **kwargs)
+            else:
+                await run_sync(func, req, res, params, *args, **kwargs)
+        finally:
+            if timings is not None:
+                timings.stop(name, start)
+
+
+class _HookChain:
+    # The hooks attached to a handler, compiled into a single coroutine.
+
+    def __init__(
+        self,
+        handler: Handler,
+        before: List[_Hook],
+        after: List[_Hook],
+        method: bool = False,
+    ):
+        self.handler = handler
+        self.before = before
+        self.after = after
+        # Whether `handler` is a method of a class-based view,
+        # i.e. is passed `self` before `req` and `res`.
+        self.method = method
+        self.compiled: Optional[Callable] = None
+
+    def add(self, hook_type: str, hook: _Hook) -> "_HookChain":
+        # Decorators are applied bottom-up, so the new hook is the outermost:
+        # it runs first among "before" hooks, and last among "after" hooks.
+        before, after = self.before, self.after
+        if hook_type == BEFORE:
+            before = [hook, *before]
+        else:
+            after = [*after, hook]
+        return _HookChain(self.handler, before, after, method=self.method)
+
+    def compile(self) -> Callable:
+        handler = self.handler
+        before, after = self.before, self.after
+        handler_is_async = inspect.iscoroutinefunction(handler)
+
+        # NOTE: providers pass all arguments positionally, so `req` and `res`
+        # are located by position. Other arguments may have been injected by
+        # providers, so `params` only contains the route parameters.
+        offset = 1 if self.method else 0
+
+        @wraps(handler)
+        async def with_hooks(*args, **kwargs):
+            req, res = args[offset], args[offset + 1]
+            params = dict(req.path_params)
+            if before:
+                await _run_hooks(before, req, res, params)
+            if handler_is_async:
+                await handler(*args, **kwargs)
+            else:
+                await run_sync(handler, *args, **kwargs)
+            if after:
+                await _run_hooks(after, req, res, params)
+
+        setattr(with_hooks, "__hooks__", self)
+        self.compiled = with_hooks
+        return with_hooks
+
+
+def _defined_in_class(func: Callable) -> bool:
+    # Whether `func` is defined in a class body, i.e. is a method of a
+    # class-based view decorated individually, e.g. `Index.get`.
+    # NOTE: within functions, the qualified name contains `<locals>`.
+    qualname = getattr(func, "__qualname__", "")
+    parts = qualname.split(".")
+    return len(parts) > 1 and parts[-2] != "<locals>"
+
+
+def _get_chain(handler: Handler, method: bool) -> _HookChain:
+    chain: Optional[_HookChain] = getattr(handler, "__hooks__", None)
+    # NOTE: `@wraps()` copies `__hooks__` onto other decorators' wrappers,
+    # so check that `handler` really is the compiled chain.
+    if chain is not None and chain.compiled is handler:
+        return chain
+    return _HookChain(handler, before=[], after=[], method=method)
+
 
 class Hooks:
     """Hooks manager."""
@@ -37,58 +188,31 @@ class Hooks:
     def _hook_decorator(
         self, hook_type: str, hook: HookFunction, *args, **kwargs
     ):
-        # Enclose args and kwargs
-        async def hook_func(req: Request, res: Response, params: dict):
-            await call_async(  # type: ignore
-                hook, req, res, params, *args, **kwargs
-            )
+        # NOTE: how the hook should be called is resolved once here,
+        # instead of on every request.
+        compiled_hook = _make_hook(hook_type, hook, args, kwargs)
+
+        def attach(handler: Handler, method: bool) -> Callable:
+            chain = _get_chain(handler, method=method)
+            return chain.add(hook_type, compiled_hook).compile()
 
         def decorator(handler: Union[Type[View], Handler]):
             """Attach the hook to the given handler."""
             if not inspect.isclass(handler):
-                return _with_hook(hook_type, hook_func, cast(Handler, handler))
+                handler = cast(Handler, handler)
+                return attach(handler, method=_defined_in_class(handler))
 
             view_cls = cast(View, handler)
 
-            # Recursively apply hook to all handlers.
+            # Apply hook to all handlers, which are methods.
             for method, _handler in get_handlers(view_cls).items():
-                setattr(view_cls, method, decorator(_handler))
+                setattr(view_cls, method, attach(_handler, method=True))
 
             return view_cls
 
         return decorator
 
 
-def _with_hook(hook_type: str, func: HookFunction, handler: Handler):
-    async def call_hook(args, kw):
-        if len(args) == 2:
-            req, res = args
-        else:
-            # method that has `self` as a first parameter
-            req, res = args[1:3]
-        assert isinstance(req, Request)
-        assert isinstance(res, Response)
-        await call_async(func, req, res, kw)
-
-    if hook_type == BEFORE:
-
-        @wraps(handler)
-        async def with_before_hook(*args, **kwargs):
-            await call_hook(args, kwargs)
-            await call_async(handler, *args, **kwargs)
-
-        return with_before_hook
-
-    assert hook_type == AFTER
-
-    @wraps(handler)
-    async def with_after_hook(*args, **kwargs):
-        await call_async(handler, *args, **kwargs)
-        await call_hook(args, kwargs)
-
-    return with_after_hook
-
-
 # Pre-bind to module
 hooks = Hooks()
 before = hooks.before
@@ -1,7 +1,386 @@
+import asyncio
+import dis
+import inspect
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from weakref import WeakSet
+
 from aiodine import Store, scopes
+from aiodine.compat import AsyncExitStack
+from aiodine.consumers import Consumer
+from aiodine.providers import Provider, SessionProvider, _terminate_agen
+
+
+class _Step(NamedTuple):
+    # How to obtain the value of one parameter of a consumer.
+    name: str
+    keyword: bool  # Keyword-only parameter.
+    provider: Optional[Provider]  # `None` if passed by the caller.
+    singleton: bool  # App-scoped provider (its value can be reused).
+    cleanup: bool  # Whether the provider may register cleanup code.
+    # Set on the first step of a group of consecutive providers which are
+    # awaited concurrently (see `CompiledConsumer._group_concurrent()`).
+    group: Optional[Tuple["_Step", ...]] = None
+
+
+class _Plan(NamedTuple):
+    external: List[Provider]  # Autouse and used providers.
+    steps: List[_Step]
+    needs_stack: bool  # Whether any provider may register cleanup code.
+    version: int  # Version of the store the plan was built against.
+
+
+# Exit stack of the consumer being called, so that the cleanup code of
+# providers resolved by other providers runs after the consumer returns.
+_EXIT_STACK: ContextVar[Optional[AsyncExitStack]] = ContextVar(
+    "bocadillo.exit_stack", default=None
+)
+
+# Opcodes of `await`, `async for` and `async with`.
+_AWAIT_OPCODES = {
+    "GET_AWAITABLE",
+    "GET_AITER",
+    "GET_ANEXT",
+    "BEFORE_ASYNC_WITH",
+    "SETUP_ASYNC_WITH",
+}
+
+
+def _original_function(prov: Provider) -> Callable:
+    # Unwrap the function that was decorated with `@provider`.
+    func: Any = prov.func
+    while True:
+        if isinstance(func, Consumer):
+            func = func.func
+        wrapped = getattr(func, "__wrapped__", None)
+        if wrapped is None:
+            return func
+        func = wrapped
+
+
+def _awaits(func: Callable) -> bool:
+    # Whether a coroutine (or async generator) function awaits anything,
+    # i.e. whether it may actually wait for I/O.
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return True
+    return any(
+        instruction.opname in _AWAIT_OPCODES
+        for instruction in dis.get_instructions(code)
+    )
+
+
+def _may_need_cleanup(prov: Provider) -> bool:
+    # Only (async) generator providers push callbacks onto the exit stack.
+    if isinstance(prov, SessionProvider):
+        return False
+    func = _original_function(prov)
+    return inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func)
+
+
+class CompiledConsumer(Consumer):
+    # A consumer whose providers are resolved once, ahead of time.
+    # aiodine's consumers inspect the signature of the consumer function and
+    # look up providers on every call. Here, this work is done once (when
+    # providers are frozen, or on first call), and the resulting plan is
+    # executed as a flat loop.
+
+    # NOTE: `__doc__` is redeclared so that the consumed function's
+    # docstring can be copied (see `functools.update_wrapper()`).
+    __slots__ = ("_plan", "__weakref__", "__doc__")
+
+    def __init__(self, store: Store, consumer_function: Callable):
+        super().__init__(store, consumer_function)
+        self._plan: Optional[_Plan] = None
+
+    def compile(self) -> _Plan:
+        version = self.store.version
+        resolved = self.resolve()
+        parameters = [(name, False, prov) for name, prov in resolved.positional]
+        parameters.extend(
+            (name, True, prov) for name, prov in resolved.keyword.items()
+        )
+        steps = []
+        for name, keyword, prov in parameters:
+            # NOTE: `resolve()` uses a sentinel for parameters
+            # without a provider.
+            if not isinstance(prov, Provider):
+                prov = None
+            singleton = isinstance(prov, SessionProvider)
+            cleanup = prov is not None and _may_need_cleanup(prov)
+            steps.append(_Step(name, keyword, prov, singleton, cleanup))
+        store: "_Store" = self.store
+        providers = [*resolved.external]
+        providers.extend(step.provider for step in steps if step.provider)
+        # Providers used by other providers register their cleanup code on
+        # the exit stack of this consumer too.
+        for prov in list(providers):
+            for name in store.dependencies(prov.name):
+                providers.append(store.providers[name])
+        self._plan = _Plan(
+            external=resolved.external,
+            steps=self._group_concurrent(steps),
+            needs_stack=any(map(_may_need_cleanup, providers)),
+            version=version,
+        )
+        return self._plan
+
+    def _group_concurrent(self, steps: List[_Step]) -> List[_Step]:
+        # Find runs of consecutive async providers that can be awaited
+        # concurrently, and attach each run to its first step. Runs are
+        # resolved when their first parameter is reached, so providers are
+        # still set up (and torn down) in the order of parameters.
+        store: "_Store" = self.store
+        runs: List[List[int]] = [[]]
+        for index, step in enumerate(steps):
+            prov = step.provider
+            if prov is None or not store.is_concurrent(prov):
+                runs.append([])
+                continue
+            run = runs[-1]
+            if any(
+                store.conflict(prov.name, steps[other].provider.name)
+                for other in run
+            ):
+                run = []
+                runs.append(run)
+            run.append(index)
+
+        steps = list(steps)
+        for run in runs:
+            # Awaiting a single provider concurrently is pointless.
+            if len(run) > 1:
+                group = tuple(steps[index] for index in run)
+                steps[run[0]] = steps[run[0]]._replace(group=group)
+        return steps
+
+    async def __call__(self, *args, **kwargs):
+        plan = self._plan
+        if plan is None or plan.version != self.store.version:
+            # Providers were added or replaced since the plan was built.
+            plan = self.compile()
+        stack = _EXIT_STACK.get()
+        if stack is not None:
+            # Called while resolving the providers of another consumer:
+            # cleanup must wait until that consumer returns.
+            args, kwargs = await self._resolve(plan, stack, args, kwargs)
+            return await self.func(*args, **kwargs)
+        if not plan.needs_stack:
+            args, kwargs = await self._resolve(plan, None, args, kwargs)
+            return await self.func(*args, **kwargs)
+        async with AsyncExitStack() as stack:
+            token = _EXIT_STACK.set(stack)
+            try:
+                args, kwargs = await self._resolve(plan, stack, args, kwargs)
+            finally:
+                _EXIT_STACK.reset(token)
+            return await self.func(*args, **kwargs)
+
+    async def _resolve(
+        self,
+        plan: _Plan,
+        stack: Optional[AsyncExitStack],
+        args: tuple,
+        kwargs: dict,
+    ) -> Tuple[list, dict]:
+        # Return the arguments to call the consumer function with.
+        for prov in plan.external:
+            await _get_value(prov, False, stack)
+
+        resolved: Dict[str, Any] = {}
+        injected_args = []
+        injected_kwargs = {}
+        next_arg = 0
+        for name, keyword, prov, singleton, _, group in plan.steps:
+            if group is not None:
+                await _get_values(group, stack, kwargs, resolved)
+            if name in kwargs:
+                # Values passed by the caller have priority.
+                value = kwargs.pop(name)
+            elif name in resolved:
+                value = resolved[name]
+            elif prov is not None:
+                value = await _get_value(prov, singleton, stack)
+            elif keyword:
+                continue
+            elif next_arg < len(args):
+                value = args[next_arg]
+                next_arg += 1
+            else:
+                continue
+
+            if keyword:
+                injected_kwargs[name] = value
+            else:
+                injected_args.append(value)
+
+        return injected_args, injected_kwargs
+
+
+async def _get_value(
+    prov: Provider, singleton: bool, stack: Optional[AsyncExitStack]
+) -> Any:
+    if singleton:
+        # pylint: disable=protected-access
+        instance = prov._instance  # type: ignore
+        if instance is not None:
+            return instance
+    if prov.lazy:
+        return prov(stack)
+    value = await prov(stack)
+    if inspect.isasyncgen(value):
+        # Frozen generator provider: its consumer returned the generator
+        # instead of the yielded value.
+        agen = value
+        value = await agen.asend(None)
+        stack.push_async_callback(partial(_terminate_agen, agen))
+    return value
+
+
+async def _get_value_on(
+    prov: Provider, singleton: bool, stack: Optional[AsyncExitStack]
+) -> Any:
+    # Resolve a provider in its own task, registering the cleanup code of
+    # the providers it uses on `stack`.
+    _EXIT_STACK.set(stack)
+    return await _get_value(prov, singleton, stack)
+
+
+async def _get_values(
+    group: List[_Step],
+    stack: Optional[AsyncExitStack],
+    kwargs: dict,
+    resolved: Dict[str, Any],
+):
+    # Await the providers of a group concurrently.
+    steps = [step for step in group if step.name not in kwargs]
+    # NOTE: each yield provider gets its own exit stack, so that cleanup
+    # code runs in the reverse order of parameters (as if providers had
+    # been resolved one after the other), not in the order of completion.
+    substacks = [AsyncExitStack() if step.cleanup else None for step in steps]
+    results = await asyncio.gather(
+        *(
+            _get_value_on(step.provider, step.singleton, substack or stack)
+            for step, substack in zip(steps, substacks)
+        ),
+        return_exceptions=True,
+    )
+    # Register cleanup code before raising errors, so that providers that
+    # were set up successfully are still torn down.
+    for substack in substacks:
+        if substack is not None:
+            await stack.enter_async_context(substack)
+    for step, result in zip(steps, results):
+        if isinstance(result, BaseException):
+            raise result
+        resolved[step.name] = result
+
+
+class _Store(Store):
+    # A store which creates compiled consumers.
+
+    __slots__ = (
+        "_consumers",
+        "_context_providers",
+        "_dependencies",
+        "_dependencies_version",
+        "version",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._consumers: "WeakSet[CompiledConsumer]" = WeakSet()
+        # Incremented whenever providers change, so that resolution plans
+        # built against previous providers are rebuilt.
+        self.version = 0
+        self._context_providers: Set[str] = set()
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._dependencies_version = 0
+
+    def _add(self, prov: Provider):
+        super()._add(prov)
+        self.version += 1
+
+    def consumer(self, consumer_function: Callable) -> CompiledConsumer:
+        consumer_ = CompiledConsumer(self, consumer_function)
+        self._consumers.add(consumer_)
+        return consumer_
+
+    def create_context_provider(self, *names: str):
+        self._context_providers.update(names)
+        return super().create_context_provider(*names)
+
+    def freeze(self):
+        # NOTE: unlike `Store.freeze()`, providers that are already frozen
+        # are not wrapped again (this is called once per app).
+        for prov in self.providers.values():
+            if not isinstance(prov.func, Consumer):
+                prov.func = self.consumer(prov.func)
+        self.version += 1
+        # Providers are known at this point: resolution plans can be built.
+        for consumer_ in list(self._consumers):
+            consumer_.compile()
+
+    # Dependency graph.
+
+    def dependencies(self, name: str) -> Set[str]:
+        """Return the names of the providers `name` depends on, recursively."""
+        if self._dependencies_version != self.version:
+            self._dependencies.clear()
+            self._dependencies_version = self.version
+        try:
+            return self._dependencies[name]
+        except KeyError:
+            pass
+        found: Set[str] = set()
+        pending = [name]
+        while pending:
+            prov = self.providers.get(pending.pop())
+            if prov is None:
+                continue
+            func = _original_function(prov)
+            for param in inspect.signature(func).parameters:
+                if param in self.providers and param not in found:
+                    found.add(param)
+                    pending.append(param)
+        self._dependencies[name] = found
+        return found
+
+    def conflict(self, first: str, second: str) -> bool:
+        """Return whether two providers cannot be resolved concurrently.
+
+        This is the case if one depends on the other, or if both depend on
+        the same app-scoped provider (which could otherwise be set up twice).
+        """
+        first_deps = self.dependencies(first)
+        second_deps = self.dependencies(second)
+        if first in second_deps or second in first_deps:
+            return True
+        return any(
+            name in self.session_providers for name in first_deps & second_deps
+        )
+
+    def is_concurrent(self, prov: Provider) -> bool:
+        # Whether it is worth awaiting the provider concurrently with others,
+        # i.e. whether it may actually wait for I/O. Running a provider in a
+        # task costs more than awaiting it directly, so async providers that
+        # never `await` are excluded.
+        if prov.lazy or isinstance(prov, SessionProvider):
+            return False
+        if prov.name in self._context_providers:
+            return False
+        func = _original_function(prov)
+        if not (
+            inspect.iscoroutinefunction(func)
+            or inspect.isasyncgenfunction(func)
+        ):
+            return False
+        return _awaits(func)
+
 
 # pylint: disable=invalid-name
-_STORE = Store(
+_STORE = _Store(
     scope_aliases={"request": scopes.FUNCTION, "app": scopes.SESSION},
     providers_module="providerconf",
     default_scope=scopes.FUNCTION,
@@ -0,0 +1,129 @@
+import asyncio
+import inspect
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+BatchFunction = Callable[[List[Hashable]], Any]
+
+
+class DataLoader:
+    """Batch and cache lookups of values by key.
+
+    Keys passed to `load()` during the same iteration of the event loop
+    (e.g. by coroutines awaited with `asyncio.gather()`) are collected, and
+    the batch function is called once with all of them.
+
+    Loaded values are cached, so a loader is typically created for each
+    request by a request-scoped provider.
+
+    # Parameters
+    batch_fn (callable):
+        called with a list of unique keys. It should return (or resolve to)
+        a list of values in the same order as the keys, or a mapping of keys
+        to values, in which case missing keys are loaded as `None`.
+        If a value is an exception, it is raised when loading its key.
+    max_batch_size (int):
+        maximum number of keys passed to `batch_fn` at once.
+        Defaults to `None` (no limit).
+
+    # Attributes
+    batches (int): the number of calls to the batch function.
+    hits (int): the number of keys that were loaded from the cache.
+    misses (int): the number of keys that were passed to the batch function.
+    """
+
+    def __init__(
+        self, batch_fn: BatchFunction, *, max_batch_size: Optional[int] = None
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Tuple[Hashable, asyncio.Future]] = []
+        self.batches = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, key: Hashable) -> Awaitable:
+        """Load the value of a key.
+
+        # Returns
+        value (awaitable): resolves to the value of the key.
+        """
+        future = self._cache.get(key)
+        if future is not None:
+            self.hits += 1
+            # NOTE: the future is shared, so it must not be cancelled if
+            # one of the tasks awaiting it is.
+            return asyncio.shield(future)
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append((key, future))
+        if len(self._queue) == 1:
+            # Let other tasks ready to run add their keys to the batch.
+            loop.call_soon(self._dispatch)
+        return asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Load the values of several keys, in a single batch if possible."""
+        return list(await asyncio.gather(*map(self.load, keys)))
+
+    def prime(self, key: Hashable, value: Any):
+        """Store the value of a key in the cache, unless already loaded."""
+        if key not in self._cache:
+            future = asyncio.get_event_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Hashable = None):
+        """Remove a key (or all keys, if not given) from the cache."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        size = self.max_batch_size or len(queue)
+        for start in range(0, len(queue), size):
+            asyncio.ensure_future(self._load_batch(queue[start : start + size]))
+
+    async def _load_batch(self, batch: List[Tuple[Hashable, asyncio.Future]]):
+        keys = [key for key, _ in batch]
+        self.batches += 1
+        self.misses += len(keys)
+        try:
+            values = self.batch_fn(keys)
+            if inspect.isawaitable(values):
+                values = await values
+            if isinstance(values, Mapping):
+                values = [values.get(key) for key in keys]
+            else:
+                values = list(values)
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"Batch function returned {len(values)} values "
+                    f"for {len(keys)} keys"
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            values = [exc] * len(keys)
+
+        for (key, future), value in zip(batch, values):
+            if isinstance(value, Exception):
+                # Don't cache errors, so that the key can be loaded again.
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                future.set_exception(value)
+            else:
+                future.set_result(value)
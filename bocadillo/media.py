@@ -8,6 +8,8 @@ _V = TypeVar("_V")
 
 MediaHandler = Callable[[Any], str]
 Handlers = Dict[str, MediaHandler]
+MediaDecoder = Callable[[bytes], Any]
+Decoders = Dict[str, MediaDecoder]
 
 
 def handle_json(value: Union[dict, list]) -> str:
@@ -23,6 +25,19 @@ def get_default_handlers() -> Handlers:
     return {CONTENT_TYPE.JSON: handle_json}
 
 
+def decode_json(body: bytes) -> Any:
+    """A media decoder that parses a request body using `json.loads`."""
+    return json.loads(body)
+
+
+def get_default_decoders() -> Decoders:
+    """Return the default media decoders.
+
+    - `application/json`: [decode_json](#decode-json)
+    """
+    return {CONTENT_TYPE.JSON: decode_json}
+
+
 class UnsupportedMediaType(Exception):
     """Raised when trying to use an unsupported media type.
 
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Optional
+import inspect
+from functools import partial
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 
 from .app_types import ASGIApp, ASGIAppInstance, HTTPApp, Scope
 from .compat import call_async
@@ -91,6 +93,82 @@ class Middleware(HTTPApp):
     __call__ = process
 
 
+MiddlewareHook = Callable[[Request, Response], Awaitable[Optional[Response]]]
+
+
+def _get_hook(middleware: Middleware, name: str) -> Optional[MiddlewareHook]:
+    # Return an async version of a hook, or `None` if it is not overridden
+    # (in which case it is a no-op).
+    if getattr(type(middleware), name) is getattr(Middleware, name):
+        return None
+
+    hook = getattr(middleware, name)
+    if inspect.iscoroutinefunction(hook):
+        return hook
+
+    return partial(call_async, hook, sync=True)
+
+
+def compile_middleware(middleware: Middleware) -> HTTPApp:
+    """Build an HTTP app that behaves like the given middleware.
+
+    The hooks that a middleware class overrides (and whether they are
+    synchronous) are resolved once, instead of on every request:
+
+    - Hooks that are not overridden are not called at all, and a middleware
+    that overrides neither hook is removed from the chain altogether.
+    - Asynchronous hooks are awaited directly, and only synchronous hooks
+    are run in the thread pool.
+
+    Middleware that implement `__call__()` or `process()` themselves
+    are returned as-is.
+
+    # Parameters
+    middleware: a #::bocadillo.middleware#Middleware object.
+
+    # Returns
+    app (callable): an HTTP app to use in place of `middleware`.
+    """
+    cls = type(middleware)
+
+    if cls.__call__ is not Middleware.__call__:
+        return middleware
+
+    if cls.process is not Middleware.process:
+        return middleware.process  # type: ignore
+
+    inner = middleware.inner
+    before = _get_hook(middleware, "before_dispatch")
+    after = _get_hook(middleware, "after_dispatch")
+
+    if before is None and after is None:
+        return inner
+
+    if after is None:
+
+        async def before_only(req: Request, res: Response) -> Response:
+            return await before(req, res) or await inner(req, res)
+
+        return before_only  # type: ignore
+
+    if before is None:
+
+        async def after_only(req: Request, res: Response) -> Response:
+            res = await inner(req, res)
+            return await after(req, res) or res
+
+        return after_only  # type: ignore
+
+    async def before_and_after(req: Request, res: Response) -> Response:
+        before_res = await before(req, res)
+        if before_res:
+            return before_res
+        res = await inner(req, res)
+        return await after(req, res) or res
+
+    return before_and_after  # type: ignore
+
+
 class ASGIMiddleware(ASGIApp):
     """Base class for ASGI middleware classes.
 
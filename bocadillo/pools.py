@@ -0,0 +1,349 @@
+import asyncio
+import inspect
+from collections import deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple
+
+from .injection import provider as _provider
+
+# Handed to a waiter instead of a resource when a slot became vacant, i.e.
+# when the waiter is allowed to create a new resource.
+_VACANT = object()
+
+
+class PoolTimeout(asyncio.TimeoutError):
+    """Raised when no resource could be acquired in time."""
+
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class Pool:
+    """An asynchronous pool of reusable resources.
+
+    Resources (e.g. database connections) are created on demand, up to
+    `max_size`. When the pool is exhausted, tasks that `acquire()` a resource
+    wait in line, and released resources are handed over in the order tasks
+    started waiting.
+
+    # Parameters
+    create (callable):
+        called (without arguments) to create a new resource.
+        May be synchronous or asynchronous.
+    close (callable):
+        called with a resource to dispose of it.
+        May be synchronous or asynchronous. Defaults to `None`.
+    check (callable):
+        called with an idle resource when it is checked out, and should
+        return whether it can be used. Unhealthy resources are closed and
+        replaced. May be synchronous or asynchronous. Defaults to `None`.
+    min_size (int):
+        number of resources created by `open()` and kept when evicting
+        idle resources. Defaults to `0`.
+    max_size (int):
+        maximum number of resources. Defaults to `10`.
+    acquire_timeout (float):
+        maximum time to wait for a resource, in seconds.
+        Defaults to `None` (wait forever).
+    idle_timeout (float):
+        time after which a resource that was not used is closed, in seconds.
+        Idle resources are evicted when a resource is acquired or released,
+        or when calling `evict()`. Defaults to `None` (never evict).
+
+    # Attributes
+    size (int): the number of resources, in use or idle.
+    created (int): the number of resources created so far.
+    acquired (int): the number of successful calls to `acquire()`.
+    timeouts (int): the number of calls to `acquire()` that timed out.
+    evicted (int):
+        the number of idle resources closed because of `idle_timeout`.
+    unhealthy (int): the number of resources that failed the health check.
+    wait_time (float):
+        the total time spent waiting for a resource, in seconds.
+    max_wait_time (float):
+        the maximum time spent waiting for a resource, in seconds.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[], Any],
+        *,
+        close: Callable[[Any], Any] = None,
+        check: Callable[[Any], Any] = None,
+        min_size: int = 0,
+        max_size: int = 10,
+        acquire_timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._create = create
+        self._close = close
+        self._check = check
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+
+        # `(resource, released_at)` pairs, the most recently used last.
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._closed = False
+
+        self.size = 0
+        self.created = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.evicted = 0
+        self.unhealthy = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @property
+    def idle(self) -> int:
+        """The number of resources that are ready to be acquired."""
+        return len(self._idle)
+
+    @property
+    def in_use(self) -> int:
+        """The number of resources that are currently acquired."""
+        return self.size - len(self._idle)
+
+    @property
+    def waiting(self) -> int:
+        """The number of tasks waiting for a resource."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    @property
+    def utilization(self) -> float:
+        """The fraction of `max_size` that is currently in use."""
+        return self.in_use / self.max_size
+
+    @property
+    def mean_wait_time(self) -> float:
+        """The mean time spent waiting for a resource, in seconds."""
+        return self.wait_time / self.acquired if self.acquired else 0.0
+
+    async def open(self):
+        """Create resources until the pool contains `min_size` of them."""
+        while self.size < self.min_size:
+            self.size += 1
+            try:
+                resource = await self._new()
+            except BaseException:
+                self.size -= 1
+                raise
+            self._idle.append((resource, monotonic()))
+
+    async def _new(self) -> Any:
+        resource = await _maybe_await(self._create())
+        self.created += 1
+        return resource
+
+    async def _dispose(self, resource: Any):
+        # NOTE: the slot of the resource must have been freed already.
+        if self._close is not None:
+            await _maybe_await(self._close(resource))
+
+    async def _is_healthy(self, resource: Any) -> bool:
+        if self._check is None:
+            return True
+        try:
+            return bool(await _maybe_await(self._check(resource)))
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def _free_slot(self):
+        # Give the slot of a removed resource to the first waiter, if any.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(_VACANT)
+                return
+        self.size -= 1
+
+    async def evict(self):
+        """Close resources that have been idle for longer than `idle_timeout`.
+
+        At least `min_size` resources are kept.
+        """
+        if self.idle_timeout is None:
+            return
+        deadline = monotonic() - self.idle_timeout
+        # The least recently used resources come first.
+        while (
+            self._idle
+            and self._idle[0][1] < deadline
+            and self.size > self.min_size
+        ):
+            resource, _ = self._idle.popleft()
+            self.evicted += 1
+            self._free_slot()
+            await self._dispose(resource)
+
+    async def acquire(self) -> Any:
+        """Check out a resource.
+
+        Resources must be given back with `release()`.
+
+        # Raises
+        PoolTimeout: if no resource was available after `acquire_timeout`.
+        RuntimeError: if the pool was closed.
+        """
+        if self._closed:
+            raise RuntimeError("Pool is closed")
+        await self.evict()
+        start = monotonic()
+        while True:
+            resource = await self._checkout(start)
+            if resource is _VACANT:
+                try:
+                    resource = await self._new()
+                except BaseException:
+                    self._free_slot()
+                    raise
+            elif not await self._is_healthy(resource):
+                self.unhealthy += 1
+                self._free_slot()
+                await self._dispose(resource)
+                continue
+            waited = monotonic() - start
+            self.acquired += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+            return resource
+
+    async def _checkout(self, start: float) -> Any:
+        # Return an idle resource, or `_VACANT` if a resource can be created.
+        if self._idle:
+            resource, _ = self._idle.pop()
+            return resource
+        if self.size < self.max_size:
+            self.size += 1
+            return _VACANT
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        timeout = self.acquire_timeout
+        if timeout is not None:
+            timeout = max(0, timeout - (monotonic() - start))
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.CancelledError:
+            # Don't leak a resource that was handed over in the meantime.
+            if waiter.done() and not waiter.cancelled():
+                result = waiter.result()
+                if result is _VACANT:
+                    self._free_slot()
+                else:
+                    await self.release(result)
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolTimeout(
+                f"No resource available after {self.acquire_timeout}s"
+            ) from None
+
+    async def release(self, resource: Any, discard: bool = False):
+        """Give back a resource obtained with `acquire()`.
+
+        # Parameters
+        resource (any): the resource to give back.
+        discard (bool):
+            if `True`, the resource is closed instead of being reused, e.g.
+            because it is known to be broken. Defaults to `False`.
+        """
+        if discard or self._closed:
+            self._free_slot()
+            await self._dispose(resource)
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the resource over to the task that waited first.
+                waiter.set_result(resource)
+                return
+        self._idle.append((resource, monotonic()))
+        await self.evict()
+
+    def checkout(self) -> "_Checkout":
+        """Acquire a resource for the duration of an `async with` block."""
+        return _Checkout(self)
+
+    async def close(self):
+        """Close idle resources.
+
+        Resources that are in use are closed when they are released, and
+        resources can no longer be acquired.
+        """
+        self._closed = True
+        while self._idle:
+            resource, _ = self._idle.popleft()
+            self.size -= 1
+            await self._dispose(resource)
+
+
+class _Checkout:
+    __slots__ = ("pool", "resource")
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+        self.resource: Any = None
+
+    async def __aenter__(self) -> Any:
+        self.resource = await self.pool.acquire()
+        return self.resource
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.pool.release(self.resource)
+
+
+def pool_provider(
+    name: str, create: Callable[[], Awaitable[Any]], **kwargs: Any
+) -> Pool:
+    """Register a provider which checks out a resource from a pool.
+
+    A resource is acquired when a view requires the provider, and released
+    once the request has been processed.
+
+    # Parameters
+    name (str): the name of the provider.
+    create (callable): how to create a resource.
+    **kwargs (any): extra options passed to #::bocadillo.pools#Pool.
+
+    # Returns
+    pool (Pool): the pool of resources.
+
+    # Example
+
+    ```python
+    from bocadillo import App
+    from bocadillo.pools import pool_provider
+
+    db_pool = pool_provider("db", create=connect, close=disconnect)
+
+    app = App()
+    app.on("shutdown", db_pool.close)
+
+    @app.route("/")
+    async def index(req, res, db):
+        ...
+    ```
+    """
+    pool = Pool(create, **kwargs)
+
+    async def checkout():
+        resource = await pool.acquire()
+        try:
+            yield resource
+        finally:
+            await pool.release(resource)
+
+    _provider(checkout, name=name)
+    return pool
@@ -1,8 +1,22 @@
 from json import JSONDecodeError
-from typing import Any, AsyncGenerator
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    List,
+    Optional,
+)
 
 from starlette.requests import Request as _Request, ClientDisconnect as _CD
+from starlette.types import Receive, Scope
 
+from .constants import CONTENT_TYPE
+from .media import Decoders, decode_json, get_default_decoders
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .uploads import Part
 
 ClientDisconnect = _CD
 
@@ -16,12 +30,92 @@ class Request(_Request):
 
     [starlette-request]: https://www.starlette.io/requests/
 
+    # Parameters
+    scope (dict): ASGI scope.
+    receive (callable): ASGI receive function.
+    media_decoders (dict):
+        the media decoders used by [.media()](#media)
+        (given by the #::bocadillo.applications#App).
+        Defaults to the built-in decoders.
+    max_body_size (int):
+        the maximum size of the request body, in bytes
+        (given by the #::bocadillo.applications#App, and possibly overridden
+        by the route). Reading a larger body raises an `HTTPError(413)`.
+        Defaults to `None` (no limit).
+
     # Methods
     `__aiter__`:
         shortcut for `.stream()`. Allows to process the request body in
         byte chunks using `async for chunk in req: ...`.
     """
 
+    _media: Any
+
+    def __init__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        media_decoders: Decoders = None,
+        max_body_size: Optional[int] = None,
+    ):
+        super().__init__(scope, receive)
+        if media_decoders is None:
+            media_decoders = get_default_decoders()
+        self.media_decoders = media_decoders
+        self.max_body_size = max_body_size
+
+    @property
+    def scope(self) -> Scope:
+        """The ASGI scope of the request."""
+        return self._scope
+
+    def check_content_length(self) -> None:
+        """Reject the request early if its declared body is too large.
+
+        # Raises
+        HTTPError(413):
+            if the `Content-Length` header is greater than `max_body_size`.
+        HTTPError(400): if the `Content-Length` header is invalid.
+        """
+        if self.max_body_size is None:
+            return
+
+        content_length = self.headers.get("content-length")
+        if content_length is None:
+            return
+
+        from .errors import HTTPError  # prevent circular imports
+
+        try:
+            size = int(content_length)
+        except ValueError:
+            raise HTTPError(400, detail="Invalid Content-Length.") from None
+
+        if size > self.max_body_size:
+            raise HTTPError(413, detail="Request body is too large.")
+
+    async def stream(self) -> AsyncGenerator[bytes, None]:
+        """Stream the request body in bytes chunks.
+
+        # Raises
+        HTTPError(413):
+            if more than `max_body_size` bytes are received.
+        """
+        limit = self.max_body_size
+        if limit is None:
+            async for chunk in super().stream():
+                yield chunk
+            return
+
+        from .errors import HTTPError  # prevent circular imports
+
+        received = 0
+        async for chunk in super().stream():
+            received += len(chunk)
+            if received > limit:
+                raise HTTPError(413, detail="Request body is too large.")
+            yield chunk
+
     async def json(self) -> Any:
         """Parse the request body as JSON.
 
@@ -38,6 +132,163 @@ class Request(_Request):
 
             raise HTTPError(400, detail="JSON is malformed.")
 
+    async def media(self) -> Any:
+        """Parse the request body according to its `Content-Type`.
+
+        The parsed value is cached on the request, so that it is only
+        decoded once even if hooks and views all call this method.
+
+        # Returns
+        media (any):
+            the result of the media decoder registered for the request's
+            content type, called with the request body (bytes).
+
+        # Raises
+        HTTPError(415): if no media decoder exists for the content type.
+        HTTPError(400): if the media decoder failed with a `ValueError`.
+        """
+        if hasattr(self, "_media"):
+            return self._media
+
+        from .errors import HTTPError  # prevent circular imports
+
+        content_type = self.headers.get("content-type", "")
+        media_type = content_type.partition(";")[0].strip().lower()
+
+        try:
+            decoder = self.media_decoders[media_type]
+        except KeyError:
+            raise HTTPError(
+                415, detail=f"Unsupported media type: {media_type!r}."
+            ) from None
+
+        try:
+            self._media = decoder(await self.body())
+        except ValueError:
+            raise HTTPError(400, detail="Media is malformed.") from None
+
+        return self._media
+
+    async def ndjson(
+        self, *, max_record_size: int = 1024 * 1024, batch_size: int = None
+    ) -> AsyncIterator[Any]:
+        """Decode a stream of newline-delimited JSON records.
+
+        Records are decoded as soon as they have been received, using the
+        JSON media decoder, so that bodies of arbitrary size can be
+        processed in constant memory.
+
+        # Example
+
+        ```python
+        async for record in req.ndjson():
+            ...
+
+        async for batch in req.ndjson(batch_size=100):
+            await db.insert_many(batch)
+        ```
+
+        # Parameters
+        max_record_size (int):
+            the maximum size of a single record, in bytes.
+            Defaults to 1MB.
+        batch_size (int):
+            if given, lists of (at most) `batch_size` records are yielded
+            instead of individual records.
+
+        # Raises
+        HTTPError(400): if a record is not valid JSON.
+        HTTPError(413): if a record exceeds `max_record_size`.
+        """
+        from .errors import HTTPError  # prevent circular imports
+
+        decode = self.media_decoders.get(CONTENT_TYPE.JSON, decode_json)
+
+        def parse(line: bytes) -> Any:
+            if len(line) > max_record_size:
+                raise HTTPError(413, detail="Record is too large.")
+            try:
+                return decode(line)
+            except ValueError:
+                raise HTTPError(400, detail="JSON is malformed.") from None
+
+        async def records() -> AsyncIterator[Any]:
+            buffer = bytearray()
+            async for chunk in self.stream():
+                buffer += chunk
+                start = 0
+                end = buffer.find(b"\n")
+                while end != -1:
+                    line = bytes(buffer[start:end]).strip()
+                    if line:
+                        yield parse(line)
+                    start = end + 1
+                    end = buffer.find(b"\n", start)
+                del buffer[:start]
+                if len(buffer) > max_record_size:
+                    raise HTTPError(413, detail="Record is too large.")
+            line = bytes(buffer).strip()
+            if line:
+                yield parse(line)
+
+        if batch_size is None:
+            async for record in records():
+                yield record
+            return
+
+        batch: List[Any] = []
+        async for record in records():
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def multipart(
+        self,
+        *,
+        max_body_size: Optional[int] = None,
+        max_part_size: Optional[int] = None,
+        max_parts: Optional[int] = None,
+        spool_threshold: int = 1024 * 1024,
+    ) -> AsyncIterator["Part"]:
+        """Stream the parts of a `multipart/form-data` request body.
+
+        Each part is yielded as soon as it has been received, as a
+        #::bocadillo.uploads#Part object, which is valid until the iteration
+        moves on to the next part.
+
+        # Example
+
+        ```python
+        async for part in req.multipart(max_part_size=10 * 1024 * 1024):
+            async for chunk in part:
+                ...
+        ```
+
+        # Parameters
+        max_body_size (int): the maximum size of the request body, in bytes.
+        max_part_size (int): the maximum size of a single part, in bytes.
+        max_parts (int): the maximum number of parts.
+        spool_threshold (int):
+            size in bytes above which a part is written to a temporary file
+            instead of being kept in memory. Defaults to 1MB.
+
+        # Raises
+        HTTPError(400): if the request body is not `multipart/form-data`.
+        HTTPError(413): if one of the limits is exceeded.
+        """
+        from .uploads import parse_multipart  # prevent circular imports
+
+        return parse_multipart(
+            self,
+            max_body_size=max_body_size,
+            max_part_size=max_part_size,
+            max_parts=max_parts,
+            spool_threshold=spool_threshold,
+        )
+
     async def __aiter__(self) -> AsyncGenerator[bytes, None]:
         async for chunk in self.stream():
             yield chunk
@@ -8,9 +8,18 @@ from starlette.responses import FileResponse as _FileResponse
 from starlette.responses import Response as _Response
 from starlette.responses import StreamingResponse as _StreamingResponse
 
+from .compression import (
+    GZIP_HANDLED,
+    CompressedBodyCache,
+    GZipConfig,
+    accepts_gzip,
+    gzip_compress,
+    gzip_stream,
+)
 from .constants import CONTENT_TYPE
 from .media import MediaHandler
 from .streaming import Stream, StreamFunc, stream_until_disconnect
+from .timing import TIMINGS
 
 AnyStr = Union[str, bytes]
 BackgroundFunc = Callable[..., Coroutine]
@@ -47,6 +56,12 @@ class Response:
     media_handler (callable):
         the configured media handler
         (given by the #::bocadillo.applications#App).
+    gzip (GZipConfig):
+        compression settings (given by the #::bocadillo.applications#App,
+        and possibly overridden by the route).
+    gzip_cache (CompressedBodyCache):
+        a cache of compressed bodies (given by the
+        #::bocadillo.applications#App).
 
     # Attributes
     content (bytes or str): the raw response content.
@@ -66,7 +81,13 @@ class Response:
     html = _content_setter(CONTENT_TYPE.HTML)
 
     def __init__(
-        self, request: Request, media_type: str, media_handler: MediaHandler
+        self,
+        request: Request,
+        media_type: str,
+        media_handler: MediaHandler,
+        *,
+        gzip: GZipConfig = None,
+        gzip_cache: CompressedBodyCache = None,
     ):
         # Public attributes.
         self.content: Optional[AnyStr] = None
@@ -81,6 +102,10 @@ class Response:
         self._media_handler = media_handler
         self._background: Optional[BackgroundFunc] = None
         self._stream: Optional[Stream] = None
+        self.gzip = gzip if gzip is not None else GZipConfig()
+        self._gzip_cache = (
+            gzip_cache if gzip_cache is not None else CompressedBodyCache()
+        )
 
     media = property(
         doc=(
@@ -188,6 +213,10 @@ class Response:
 
     async def __call__(self, receive, send):
         """Build and send the response."""
+        timings = self.request.get(TIMINGS)
+        if timings is not None:
+            start = timings.start()
+
         if self.status_code is None:
             self.status_code = 200
 
@@ -210,6 +239,11 @@ class Response:
 
         response_cls = _Response
 
+        if self.gzip.enabled is not None and self._file_path is None:
+            self._apply_gzip(response_kwargs)
+        elif self.gzip.enabled is False:
+            self._mark_gzip_handled()
+
         if self._file_path is not None:
             response_cls = _FileResponse
             response_kwargs["path"] = self._file_path
@@ -223,4 +257,46 @@ class Response:
             response_kwargs["content"] = self._stream
 
         response: _Response = response_cls(**response_kwargs)
+
+        if timings is not None:
+            timings.stop("render", start)
+            response.headers["server-timing"] = timings.to_header()
+
         await response(receive, send)
+
+    def _mark_gzip_handled(self):
+        # Let the app-level GZip middleware know that compression settings
+        # have already been applied to this response.
+        # pylint: disable=protected-access
+        self.request._scope[GZIP_HANDLED] = True
+
+    def _apply_gzip(self, response_kwargs: dict):
+        self._mark_gzip_handled()
+
+        if not self.gzip.enabled or "content-encoding" in self.headers:
+            return
+
+        if not accepts_gzip(self.request.headers):
+            return
+
+        if self._stream is not None:
+            self._stream = gzip_stream(self._stream, level=self.gzip.level)
+        else:
+            content = self.content or b""
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            if len(content) < self.gzip.min_size:
+                return
+            if self.gzip.cache:
+                compressed = self._gzip_cache.compress(
+                    content, level=self.gzip.level
+                )
+            else:
+                compressed = gzip_compress(content, level=self.gzip.level)
+            response_kwargs["content"] = compressed
+
+        self.headers["content-encoding"] = "gzip"
+        vary = self.headers.get("vary")
+        self.headers["vary"] = (
+            f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        )
@@ -9,6 +9,7 @@
 """
 
 import inspect
+from collections import OrderedDict
 from typing import (
     Any,
     Callable,
@@ -16,6 +17,7 @@ from typing import (
     Generic,
     NoReturn,
     Optional,
+    Sequence,
     Tuple,
     TypeVar,
 )
@@ -25,16 +27,23 @@ from starlette.websockets import WebSocketClose
 
 from . import views
 from .app_types import HTTPApp, Receive, Scope, Send
+from .compression import GZipConfig
 from .errors import HTTPError
+from .executors import Executor, Executors, use_executor
 from .injection import consumer
 from .redirection import Redirection
 from .request import Request
 from .response import Response
+from .throttling import Throttle
+from .timing import TIMINGS
 from .views import AsyncHandler, HandlerDoesNotExist, View
 from .websockets import WebSocket, WebSocketView
 
 WILDCARD = "{}"
 
+# Scope key where the name of the matched HTTP route is stored.
+ROUTE_NAME = "bocadillo.route_name"
+
 # Route generic types.
 _R = TypeVar("_R", bound="BaseRoute")  # route
 _V = TypeVar("_V")  # view
@@ -103,16 +112,64 @@ class RouteMatch(Generic[_R]):  # pylint: disable=unsubscriptable-object
         self.params = params
 
 
+class MissCache:
+    """A bounded LRU set of URL paths that did not match any route.
+
+    Unmatched paths are the slowest to resolve, because all route patterns
+    must be tried. Remembering them means repeated probes for unknown paths
+    (e.g. from scanner bots) only cost a hash lookup.
+
+    # Parameters
+    maxsize (int):
+        the maximum number of cached paths. `0` disables the cache.
+    max_path_length (int):
+        paths longer than this are never cached.
+
+    # Attributes
+    hits (int): the number of cache hits.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_path_length: int = 1024):
+        self.maxsize = maxsize
+        self.max_path_length = max_path_length
+        self.hits = 0
+        self._paths: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        if path not in self._paths:
+            return False
+        self.hits += 1
+        self._paths.move_to_end(path)
+        return True
+
+    def add(self, path: str):
+        if not self.maxsize or len(path) > self.max_path_length:
+            return
+        self._paths[path] = None
+        if len(self._paths) > self.maxsize:
+            self._paths.popitem(last=False)
+
+    def clear(self):
+        self._paths.clear()
+        self.hits = 0
+
+
 class BaseRouter(Generic[_R, _V]):
     """The base router class.
 
     # Attributes
     routes (dict):
         a mapping of URL patterns to route objects.
+    misses (MissCache):
+        recently unmatched paths. It is cleared when a route is added.
     """
 
     def __init__(self):
         self.routes: Dict[str, _R] = {}
+        self.misses = MissCache()
 
     def _get_key(self, route: _R) -> str:
         # Return the key at which `route` should be stored internally.
@@ -131,6 +188,7 @@ class BaseRouter(Generic[_R, _V]):
 
     def add(self, route: _R) -> None:
         self.routes[self._get_key(route)] = route
+        self.misses.clear()
 
     def route(self, *args, **kwargs) -> Callable[[Any], _R]:
         """Register a route by decorating a view.
@@ -162,10 +220,13 @@ class BaseRouter(Generic[_R, _V]):
             a #::bocadillo.routing#RouteMatch object if the path matched
             a registered route, `None` otherwise.
         """
+        if path in self.misses:
+            return None
         for route in self.routes.values():
             params = route.parse(path)
             if params is not None:
                 return RouteMatch(route=route, params=params)
+        self.misses.add(path)
         return None
 
 
@@ -184,13 +245,130 @@ class HTTPRoute(BaseRoute[View]):
         a #::bocadillo.views#View object.
     name (str):
         the route's name.
+    gzip (bool):
+        whether to compress responses, overriding the app's settings.
+    gzip_min_size (int):
+        minimum size of compressed responses, overriding the app's settings.
+    gzip_level (int):
+        compression level, overriding the app's settings.
+    gzip_cache (bool):
+        whether to cache compressed bodies, overriding the app's settings.
+    max_body_size (int):
+        maximum size of request bodies, overriding the app's settings.
+    executor (str):
+        name of the executor that runs synchronous code for this route.
+
+    # Attributes
+    executors (Executors):
+        the registry where `executor` is looked up, set by the application.
     """
 
-    def __init__(self, pattern: str, view: View, name: str):
+    def __init__(
+        self,
+        pattern: str,
+        view: View,
+        name: str,
+        gzip: bool = None,
+        gzip_min_size: int = None,
+        gzip_level: int = None,
+        gzip_cache: bool = None,
+        max_body_size: int = None,
+        executor: str = None,
+    ):
         super().__init__(pattern, view)
         self.name = name
+        self.gzip = GZipConfig(
+            enabled=gzip,
+            min_size=gzip_min_size,
+            level=gzip_level,
+            cache=gzip_cache,
+        )
+        self.max_body_size = max_body_size
+        # HTTP app made of the route's middleware wrapping `.dispatch()`.
+        self.middleware_app: Optional[HTTPApp] = None
+        self.executor = executor
+        self.executors: Optional[Executors] = None
+        self._executor: Optional[Executor] = None
+
+    @property
+    def namespace(self) -> Optional[str]:
+        """The route's namespace, if any."""
+        namespace, sep, _ = self.name.rpartition(":")
+        return namespace if sep else None
+
+    def wrap(self, build: Callable[[HTTPApp], HTTPApp]) -> None:
+        """Wrap the route's middleware chain with another middleware.
+
+        # Parameters
+        build (callable):
+            called with the current (innermost) HTTP app of the route,
+            should return an HTTP app that wraps it.
+        """
+        inner = self.middleware_app
+        if inner is None:
+            inner = self.dispatch  # type: ignore
+        self.middleware_app = build(inner)
+
+    async def __call__(self, req: Request, res: Response, **params) -> Response:
+        req.scope[ROUTE_NAME] = self.name
 
-    async def __call__(self, req: Request, res: Response, **params):
+        executor = self._executor
+        if executor is None and self.executor is not None:
+            executor = self.resolve_executor()
+        if executor is not None:
+            with use_executor(executor):
+                return await self._call(req, res, params)
+        return await self._call(req, res, params)
+
+    def resolve_executor(self) -> Optional[Executor]:
+        """Look up the route's executor by name.
+
+        This is done when the application is frozen, i.e. when it receives
+        its first request, so that all executors have been registered.
+
+        # Returns
+        executor (Executor): the route's executor, or `None` if the route
+        does not use a dedicated executor.
+
+        # Raises
+        LookupError: if no executor with that name has been registered.
+        """
+        if self.executor is None:
+            return None
+        try:
+            if self.executors is None:
+                raise KeyError(self.executor)
+            self._executor = self.executors[self.executor]
+        except KeyError:
+            raise LookupError(
+                f"Route {self.name!r} uses the executor {self.executor!r}, "
+                "which has not been registered. Register it using "
+                f"`app.add_executor({self.executor!r})`."
+            ) from None
+        return self._executor
+
+    async def _call(self, req: Request, res: Response, params: dict):
+        req.scope["path_params"] = params
+
+        if self.max_body_size is not None:
+            req.max_body_size = self.max_body_size
+        req.check_content_length()
+
+        if not self.gzip.is_empty():
+            res.gzip = self.gzip.merge(res.gzip)
+
+        if self.middleware_app is None:
+            await self._handle(req, params)
+            return res
+
+        return await self.middleware_app(req, res)
+
+    async def dispatch(self, req: Request, res: Response) -> Response:
+        """Call the view's handler (innermost app of the middleware chain)."""
+        await self._handle(req, req.path_params)
+        return res
+
+    async def _handle(self, req: Request, params: dict):
         method: str = req.method.lower()
 
         try:
@@ -200,7 +378,16 @@ class HTTPRoute(BaseRoute[View]):
 
         # NOTE: do not pass `req` and `res` because they are injected
         # into the view by the app's providers.
-        await handler(**params)  # type: ignore
+        timings = req.get(TIMINGS)
+        if timings is None:
+            await handler(**params)  # type: ignore
+            return
+
+        start = timings.start()
+        try:
+            await handler(**params)  # type: ignore
+        finally:
+            timings.stop("view", start)
 
 
 class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute, View]):
@@ -209,8 +396,21 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute, View]):
     Subclass of #::bocadillo.routing#BaseRouter.
 
     Note: routes are stored by `name` instead of `pattern`.
+
+    # Attributes
+    not_found (HTTPApp):
+        if set, called to build the response when no route matches,
+        instead of raising an `HTTPError(404)`.
+    not_found_throttle (Throttle):
+        if set, clients that exceed its limit of unmatched requests
+        get a `429 Too Many Requests` response instead of a 404.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.not_found: Optional[HTTPApp] = None
+        self.not_found_throttle: Optional[Throttle] = None
+
     def _get_key(self, route: HTTPRoute) -> str:
         # NOTE: this ensures that no two routes stored in this
         # router have the same name.
@@ -271,6 +471,7 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute, View]):
         pattern (str): an URL pattern.
         name (str): a route name (inferred from the view if not given).
         namespace (str): an optional route namespace.
+        kwargs (any): passed to the #::bocadillo.routing#HTTPRoute.
 
         # Returns
         route: the registered #::bocadillo.routing#HTTPRoute.
@@ -280,7 +481,7 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute, View]):
         if namespace is not None:
             name = namespace + ":" + name
 
-        route = HTTPRoute(pattern=pattern, view=view, name=name)
+        route = HTTPRoute(pattern=pattern, view=view, name=name, **kwargs)
         self.add(route)
 
         return route
@@ -289,10 +490,20 @@ class HTTPRouter(HTTPApp, BaseRouter[HTTPRoute, View]):
         match = self.match(req.url.path)
 
         if match is None:
+            throttle = self.not_found_throttle
+            if throttle is not None:
+                client = req.client.host if req.client else None
+                if not throttle.hit(client):
+                    res.headers["retry-after"] = str(
+                        throttle.retry_after(client)
+                    )
+                    raise HTTPError(status=429)
+            if self.not_found is not None:
+                return await self.not_found(req, res)
             raise HTTPError(status=404)
 
         try:
-            await match.route(req, res, **match.params)
+            res = await match.route(req, res, **match.params)
         except Redirection as redirection:
             res = redirection.response
 
@@ -379,7 +590,20 @@ class RoutingMixin:
         self.http_router = HTTPRouter()
         self.websocket_router = WebSocketRouter()
 
-    def route(self, pattern: str, *, name: str = None, namespace: str = None):
+    def route(
+        self,
+        pattern: str,
+        *,
+        name: str = None,
+        namespace: str = None,
+        gzip: bool = None,
+        gzip_min_size: int = None,
+        gzip_level: int = None,
+        gzip_cache: bool = None,
+        max_body_size: int = None,
+        middleware: Sequence[Any] = None,
+        executor: str = None,
+    ):
         """Register a new route by decorating a view.
 
         # Parameters
@@ -395,11 +619,60 @@ class RoutingMixin:
         namespace (str):
             an optional namespace for the route. If given, it is prefixed to
             the name and separated by a colon.
+        gzip (bool):
+            enable or disable GZip compression of responses for this route.
+            Defaults to the app's `enable_gzip`.
+        gzip_min_size (int):
+            the minimum size of responses compressed on this route.
+            Defaults to the app's `gzip_min_size`.
+        gzip_level (int):
+            the GZip compression level, from `1` (fastest) to `9` (smallest).
+            Defaults to the app's `gzip_level`.
+        gzip_cache (bool):
+            whether to cache compressed response bodies (see
+            `App.gzip_cache`). Only enable this for routes that send
+            identical responses, e.g. constant pages.
+            Defaults to `False`.
+        max_body_size (int):
+            the maximum size of request bodies on this route, in bytes.
+            Defaults to the app's `max_body_size`.
+        middleware (list):
+            HTTP middleware applied to this route only, given as
+            #::bocadillo.middleware#Middleware subclasses or
+            `(middleware_cls, kwargs)` tuples. The first item is the
+            outermost middleware.
+        executor (str):
+            the name of the executor used to run synchronous code
+            (views, hooks and middleware) for this route.
+            Defaults to the app's default executor.
         """
-        return self.http_router.route(
-            pattern=pattern, name=name, namespace=namespace
+        register = self.http_router.route(
+            pattern=pattern,
+            name=name,
+            namespace=namespace,
+            gzip=gzip,
+            gzip_min_size=gzip_min_size,
+            gzip_level=gzip_level,
+            gzip_cache=gzip_cache,
+            max_body_size=max_body_size,
+            executor=executor,
         )
 
+        def decorate(view: Any) -> HTTPRoute:
+            route = register(view)
+            self._setup_route(route, middleware=middleware or ())
+            return route
+
+        return decorate
+
+    def _setup_route(self, route: HTTPRoute, middleware: Sequence[Any]):
+        # Perform any extra setup on newly registered HTTP routes.
+        # NOTE: route middleware are built by the application class.
+        if middleware:
+            raise TypeError(
+                f"{type(self).__name__} does not support route middleware."
+            )
+
     def websocket_route(
         self,
         pattern: str,
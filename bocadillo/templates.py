@@ -1,12 +1,219 @@
-from contextlib import contextmanager, suppress
-from typing import Any, Optional, cast
-
-from jinja2 import Environment, FileSystemLoader, Template
+from collections import OrderedDict
+from contextlib import suppress
+from hashlib import sha1
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    nodes,
+)
+from jinja2.ext import Extension
 
 DEFAULT_TEMPLATES_DIR = "templates"
 
 
+class _AsyncBytecodeCache(BytecodeCache):
+    # Templates compiled in async mode differ from their sync counterpart,
+    # so they must be stored under different keys.
+
+    def __init__(self, cache: BytecodeCache):
+        self.cache = cache
+
+    def get_cache_key(self, name: str, filename: str = None) -> str:
+        key = self.cache.get_cache_key(name, filename)
+        return sha1(f"async:{key}".encode()).hexdigest()
+
+    def load_bytecode(self, bucket):
+        self.cache.load_bytecode(bucket)
+
+    def dump_bytecode(self, bucket):
+        self.cache.dump_bytecode(bucket)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class CompiledTemplateCache:
+    """A bounded LRU cache of templates compiled from strings.
+
+    Templates are looked up by a hash of their source, so rendering the
+    same source again does not compile it again.
+
+    # Parameters
+    max_size (int):
+        the maximum number of cached templates. Least recently used
+        templates are evicted first. Defaults to `256`.
+
+    # Attributes
+    hits (int): the number of cache hits.
+    misses (int): the number of cache misses.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[bytes, Template]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def get(self, source: str, compile_: Callable[[str], Template]) -> Template:
+        """Return the template compiled from `source`.
+
+        `compile_` is called with `source` on cache misses.
+        """
+        key = sha1(source.encode()).digest()
+        try:
+            template = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            template = compile_(source)
+            if self.max_size > 0:
+                self._cache[key] = template
+                if len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return template
+
+
+class FragmentCache:
+    """A bounded in-memory store of rendered template fragments.
+
+    Used by the `{% cache %}` template tag.
+
+    # Parameters
+    max_size (int):
+        the maximum number of cached fragments. Least recently used
+        fragments are evicted first. Defaults to `1024`.
+
+    # Attributes
+    hits (int): the number of fragments that were served from the cache.
+    misses (int): the number of fragments that had to be rendered.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Hashable, Tuple[Optional[float], str]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return a cached fragment, or `None` if missing or expired."""
+        try:
+            expires_at, fragment = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        if expires_at is not None and expires_at <= monotonic():
+            del self._cache[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return fragment
+
+    def set(self, key: Hashable, fragment: str, ttl: float = None):
+        """Store a fragment, for `ttl` seconds if given."""
+        expires_at = None if ttl is None else monotonic() + ttl
+        self._cache[key] = (expires_at, fragment)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+
+class FragmentCacheExtension(Extension):
+    """A jinja2 extension which adds the `{% cache %}` tag.
+
+    The rendered content of the tag is stored in the `fragment_cache` of the
+    environment, under a name and an optional key, for `ttl` seconds if
+    given:
+
+    ```jinja
+    {% cache "sidebar", ttl=60, key=user.tier %}
+      ...
+    {% endcache %}
+    ```
+
+    The key must be hashable.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment: Environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        options = {"ttl": nodes.Const(None), "key": nodes.Const(None)}
+        while parser.stream.skip_if("comma"):
+            option = parser.stream.expect("name")
+            if option.value not in options:
+                parser.fail(
+                    f"Unknown cache option: {option.value!r}", option.lineno
+                )
+            parser.stream.expect("assign")
+            options[option.value] = parser.parse_expression()
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method(
+            "_render", [name, options["ttl"], options["key"]]
+        )
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, name: str, ttl: Optional[float], key: Any, caller):
+        cache: FragmentCache = self.environment.fragment_cache  # type: ignore
+        cache_key = (name, key)
+        fragment = cache.get(cache_key)
+        if fragment is not None:
+            return fragment
+        if self.environment.is_async:
+            # `caller()` returns a coroutine.
+            return self._render_async(cache, cache_key, ttl, caller)
+        fragment = caller()
+        cache.set(cache_key, fragment, ttl)
+        return fragment
+
+    @staticmethod
+    async def _render_async(
+        cache: FragmentCache, cache_key: tuple, ttl: Optional[float], caller
+    ) -> str:
+        fragment = await caller()
+        cache.set(cache_key, fragment, ttl)
+        return fragment
+
+
 class Templates:
     """This class provides templating capabilities.
 
@@ -30,6 +237,31 @@ class Templates:
         global template variables.
         If present, the app's `.url_for()` method is registered as
         an `url_for` global variable.
+    bytecode_cache (str or BytecodeCache, optional):
+        where to store compiled templates, so that they can be reused
+        across processes and restarts. Either a directory, or a
+        [jinja2 bytecode cache][bytecode-cache] instance.
+        Defaults to `None` (templates are compiled by each process).
+    precompile (bool):
+        whether to compile all templates when the app starts up
+        (see #::bocadillo.templates.Templates#precompile).
+        If the app has no `.on()` method (or no app was given), templates
+        are compiled right away. Defaults to `False`.
+    string_cache_size (int):
+        the maximum number of templates compiled by `render_string()`
+        to keep in memory. Defaults to `256`.
+    fragment_cache_size (int):
+        the maximum number of fragments stored by the `{% cache %}` tag
+        (see #::bocadillo.templates#FragmentCacheExtension).
+        Defaults to `1024`.
+
+    # Attributes
+    string_cache (CompiledTemplateCache):
+        the templates compiled by `render_string()`.
+    fragment_cache (FragmentCache):
+        the fragments stored by the `{% cache %}` tag.
+
+    [bytecode-cache]: http://jinja.pocoo.org/docs/latest/api/#bytecode-cache
     """
 
     def __init__(
@@ -37,6 +269,10 @@ class Templates:
         app: Optional[Any] = None,
         directory: str = DEFAULT_TEMPLATES_DIR,
         context: dict = None,
+        bytecode_cache: Union[str, BytecodeCache] = None,
+        precompile: bool = False,
+        string_cache_size: int = 256,
+        fragment_cache_size: int = 1024,
     ):
         if context is None:
             context = {}
@@ -46,11 +282,38 @@ class Templates:
 
         self.app = app
 
+        if isinstance(bytecode_cache, str):
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache)
+
         self._directory = directory
         self._environment = Environment(
-            loader=FileSystemLoader([self.directory]), autoescape=True
+            loader=FileSystemLoader([self.directory]),
+            autoescape=True,
+            bytecode_cache=bytecode_cache,
+            extensions=[FragmentCacheExtension],
         )
         self._environment.globals.update(context)
+        # NOTE: the async environment shares the loader and globals of the
+        # sync environment, but has its own cache of compiled templates.
+        self._async_environment = self._environment.overlay(
+            enable_async=True,
+            bytecode_cache=(
+                _AsyncBytecodeCache(bytecode_cache) if bytecode_cache else None
+            ),
+        )
+
+        self.string_cache = CompiledTemplateCache(string_cache_size)
+        # NOTE: shared by the sync and async environments.
+        self.fragment_cache: FragmentCache = (
+            self._environment.fragment_cache  # type: ignore
+        )
+        self.fragment_cache.max_size = fragment_cache_size
+
+        if precompile:
+            try:
+                app.on("startup", self.precompile)  # type: ignore
+            except AttributeError:
+                self.precompile()
 
     @property
     def directory(self) -> str:
@@ -68,6 +331,9 @@ class Templates:
     @context.setter
     def context(self, context: dict):
         self._environment.globals = context
+        self._async_environment.globals = context
+        # Compiled templates refer to the previous globals.
+        self.string_cache.clear()
 
     @property
     def _loader(self) -> FileSystemLoader:
@@ -76,14 +342,32 @@ class Templates:
     def _get_template(self, name: str) -> Template:
         return self._environment.get_template(name)
 
-    @contextmanager
-    def _enable_async(self):
-        # Temporarily enable jinja2 async support.
-        self._environment.is_async = True
-        try:
-            yield
-        finally:
-            self._environment.is_async = False
+    def _get_async_template(self, name: str) -> Template:
+        return self._async_environment.get_template(name)
+
+    def precompile(self, extensions: List[str] = None) -> int:
+        """Compile all templates located inside `directory`.
+
+        Compiled templates are kept in memory (up to jinja2's cache size of
+        400 templates) and written to the bytecode cache, if any, so that
+        the first render of each template does not have to compile it.
+
+        Templates are compiled for both synchronous and asynchronous
+        rendering.
+
+        # Parameters
+        extensions (list of str):
+            if given, only compile templates with these file extensions,
+            e.g. `["html"]`.
+
+        # Returns
+        count (int): the number of compiled templates.
+        """
+        names = self._environment.list_templates(extensions=extensions)
+        for name in names:
+            self._get_template(name)
+            self._get_async_template(name)
+        return len(names)
 
     async def render(self, filename: str, *args: dict, **kwargs: Any) -> str:
         """Render a template asynchronously.
@@ -100,10 +384,38 @@ class Templates:
         *kwargs (str):
             context variables to inject in the template.
         """
-        with self._enable_async():
-            return await self._get_template(filename).render_async(
-                *args, **kwargs
-            )
+        template = self._get_async_template(filename)
+        return await template.render_async(*args, **kwargs)
+
+    def render_stream(
+        self, filename: str, *args: dict, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Render a template asynchronously, chunk by chunk.
+
+        This allows to start sending large pages before they are fully
+        rendered, e.g. using `res.stream`.
+
+        # Returns
+        chunks (async iterator of str): chunks of the rendered template.
+
+        # See Also
+        [Templates.render](#render) for the accepted arguments.
+
+        # Example
+
+        ```python
+        @app.route("/")
+        async def index(req, res):
+            res.headers["content-type"] = "text/html"
+
+            @res.stream
+            async def page():
+                async for chunk in templates.render_stream("index.html"):
+                    yield chunk
+        ```
+        """
+        template = self._get_async_template(filename)
+        return template.generate_async(*args, **kwargs)
 
     def render_sync(self, filename: str, *args: dict, **kwargs: Any) -> str:
         """Render a template synchronously.
@@ -116,11 +428,14 @@ class Templates:
     def render_string(self, source: str, *args: dict, **kwargs: Any) -> str:
         """Render a template from a string (synchronously).
 
+        Compiled templates are cached (see `string_cache`), so rendering
+        the same source repeatedly only compiles it once.
+
         # Parameters
         source (str): a template given as a string.
 
         # See Also
         [Templates.render](#render) for the other accepted arguments.
         """
-        template = self._environment.from_string(source=source)
+        template = self.string_cache.get(source, self._environment.from_string)
         return template.render(*args, **kwargs)
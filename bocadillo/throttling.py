@@ -0,0 +1,71 @@
+import math
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Hashable, List
+
+
+class Throttle:
+    """A fixed-window rate limiter, keyed by client.
+
+    # Parameters
+    limit (int): the maximum number of events per client and per window.
+    period (float): the duration of a window, in seconds.
+    maxsize (int):
+        the maximum number of tracked clients. The least recently seen
+        clients are forgotten first.
+    clock (callable):
+        returns the current time in seconds. Defaults to `time.monotonic`.
+
+    # Raises
+    ValueError: if `limit` is not positive.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        period: float = 60.0,
+        maxsize: int = 10000,
+        clock: Callable[[], float] = monotonic,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.period = period
+        self.maxsize = maxsize
+        self._clock = clock
+        # client -> [window start, count]
+        self._windows: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def clear(self):
+        self._windows.clear()
+
+    def hit(self, key: Hashable) -> bool:
+        """Record an event for `key`.
+
+        # Returns
+        allowed (bool): whether the client is still within the limit.
+        """
+        now = self._clock()
+        try:
+            window = self._windows[key]
+        except KeyError:
+            window = self._windows[key] = [now, 0]
+            if len(self._windows) > self.maxsize:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+            if now - window[0] >= self.period:
+                window[0], window[1] = now, 0
+
+        window[1] += 1
+        return window[1] <= self.limit
+
+    def retry_after(self, key: Hashable) -> int:
+        """Return the number of seconds until the window of `key` ends."""
+        window = self._windows.get(key)
+        if window is None:
+            return 0
+        return max(0, math.ceil(window[0] + self.period - self._clock()))
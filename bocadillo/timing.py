@@ -0,0 +1,156 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, ASGIInstance, Receive, Scope, Send
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .app_types import HTTPApp
+    from .request import Request
+    from .response import Response
+
+# Scope key where the `Timings` of the current request are stored.
+TIMINGS = "bocadillo.timings"
+
+TimingsCallback = Callable[[Scope, "Timings"], None]
+
+
+class Timings:
+    """Timings of the processing stages of a single request.
+
+    Stages can be nested (e.g. a middleware wraps the view), but the
+    recorded durations are **exclusive**, i.e. the time spent in a stage
+    does not include the time spent in the stages it wraps.
+
+    # Attributes
+    entries (list of tuples):
+        `(name, duration)` pairs, in order of completion.
+        Durations are expressed in seconds.
+    """
+
+    __slots__ = ("entries", "_children")
+
+    def __init__(self):
+        self.entries: List[Tuple[str, float]] = []
+        self._children: List[float] = []
+
+    def start(self) -> float:
+        """Start timing a stage and return an opaque start time."""
+        self._children.append(0.0)
+        return perf_counter()
+
+    def stop(self, name: str, start: float):
+        """Stop timing the stage named `name`, started at `start`."""
+        elapsed = perf_counter() - start
+        children = self._children.pop()
+        self.entries.append((name, elapsed - children))
+        if self._children:
+            self._children[-1] += elapsed
+
+    def to_header(self) -> str:
+        """Format entries as the value of a `Server-Timing` header."""
+        return ", ".join(
+            f"{name};dur={1000 * duration:.3f}"
+            for name, duration in self.entries
+        )
+
+
+class StageStats:
+    """Aggregated durations of a processing stage.
+
+    # Attributes
+    count (int): the number of times the stage was run.
+    total (float): the total time spent in the stage, in seconds.
+    max (float): the maximum time spent in the stage, in seconds.
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """The mean time spent in the stage, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+
+class TimingStats:
+    """Collect the timings of all requests processed by an application.
+
+    # Attributes
+    stages (dict): a mapping of stage names to #::bocadillo.timing#StageStats.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self._callbacks: List[TimingsCallback] = []
+
+    def on_request(self, callback: TimingsCallback) -> TimingsCallback:
+        """Register a callback to call with `(scope, timings)` after requests.
+
+        Callbacks are called synchronously, so they should be fast.
+        Can be used as a decorator.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def record(self, scope: Scope, timings: Timings):
+        for name, duration in timings.entries:
+            try:
+                stats = self.stages[name]
+            except KeyError:
+                stats = self.stages[name] = StageStats()
+            stats.add(duration)
+
+        for callback in self._callbacks:
+            callback(scope, timings)
+
+    def reset(self):
+        self.stages.clear()
+
+
+def timed_http(name: str, app: "HTTPApp") -> "HTTPApp":
+    """Wrap an HTTP app so that its execution is timed as `name`."""
+
+    async def timed(req: "Request", res: "Response") -> "Response":
+        timings: Optional[Timings] = req.get(TIMINGS)
+        if timings is None:
+            return await app(req, res)
+        start = timings.start()
+        try:
+            return await app(req, res)
+        finally:
+            timings.stop(name, start)
+
+    return timed  # type: ignore
+
+
+class TimedASGIMiddleware:
+    """Wrap an ASGI app so that its execution is timed as `name`."""
+
+    def __init__(self, app: ASGIApp, name: str):
+        self.app = app
+        self.name = name
+
+    def __call__(self, scope: Scope) -> ASGIInstance:
+        instance = self.app(scope)
+        timings: Optional[Timings] = scope.get(TIMINGS)
+        if timings is None:
+            return instance
+
+        async def timed(receive: Receive, send: Send):
+            start = timings.start()
+            try:
+                await instance(receive, send)
+            finally:
+                timings.stop(self.name, start)
+
+        return timed  # type: ignore
@@ -0,0 +1,272 @@
+from collections import deque
+from tempfile import SpooledTemporaryFile
+from typing import TYPE_CHECKING, AsyncIterator, Deque, List, Optional, Tuple
+
+from multipart import MultipartParser
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from .errors import HTTPError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .request import Request
+
+DEFAULT_SPOOL_THRESHOLD = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class Part:
+    """A part of a `multipart/form-data` request body.
+
+    Parts are async iterables: the part's content can be processed in byte
+    chunks using `async for chunk in part: ...`.
+
+    Part contents are kept in memory until they exceed a threshold,
+    after which they are spooled to a temporary file on disk.
+
+    # Attributes
+    name (str): the name of the form field.
+    filename (str): the name of the uploaded file, if any.
+    content_type (str): the content type of the part, if any.
+    headers (dict): the part's headers.
+    size (int): the size of the part's content in bytes.
+    file (file-like): the underlying (spooled) temporary file.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        filename: Optional[str],
+        headers: Headers,
+        spool_threshold: int,
+    ):
+        self.name = name
+        self.filename = filename
+        self.headers = headers
+        self.content_type = headers.get("content-type", "")
+        self.size = 0
+        self.file = SpooledTemporaryFile(max_size=spool_threshold)
+        self._spool_threshold = spool_threshold
+
+    @property
+    def in_memory(self) -> bool:
+        """Whether the part's content has not been spooled to disk."""
+        return self.size <= self._spool_threshold
+
+    async def _run(self, func, *args):
+        # Avoid blocking the event loop on disk I/O.
+        if self.in_memory:
+            return func(*args)
+        return await run_in_threadpool(func, *args)
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        await self._run(self.file.write, data)
+
+    async def read(self) -> bytes:
+        """Read the whole content of the part."""
+        await self._run(self.file.seek, 0)
+        return await self._run(self.file.read)
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        """Read the whole content of the part and decode it to a string."""
+        return (await self.read()).decode(encoding)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await self._run(self.file.seek, 0)
+        while True:
+            chunk = await self._run(self.file.read, DEFAULT_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self.file.close()
+
+    def __repr__(self):
+        return (
+            f"<Part name={self.name!r} filename={self.filename!r} "
+            f"size={self.size}>"
+        )
+
+
+class _PartsCollector:
+    # Gather `multipart` parser events into `Part` objects.
+
+    def __init__(
+        self,
+        spool_threshold: int,
+        max_part_size: Optional[int],
+        max_parts: Optional[int],
+    ):
+        self.spool_threshold = spool_threshold
+        self.max_part_size = max_part_size
+        self.max_parts = max_parts
+        self.count = 0
+        # Parser callbacks are synchronous, so events are queued here
+        # and processed asynchronously after each chunk is fed.
+        self.events: List[Tuple[str, bytes]] = []
+        self.header_field = b""
+        self.header_value = b""
+        self.raw_headers: List[Tuple[bytes, bytes]] = []
+        self.current: Optional[Part] = None
+        self.ready: Deque[Part] = deque()
+        # Whether the closing boundary has been reached.
+        self.complete = False
+
+    def callbacks(self) -> dict:
+        def event(name: str):
+            def on_event(data: bytes = b"", start: int = 0, end: int = 0):
+                self.events.append((name, data[start:end]))
+
+            return on_event
+
+        return {
+            f"on_{name}": event(name)
+            for name in (
+                "part_begin",
+                "part_data",
+                "part_end",
+                "header_field",
+                "header_value",
+                "header_end",
+                "headers_finished",
+                "end",
+            )
+        }
+
+    async def process(self):
+        events, self.events = self.events, []
+        for name, data in events:
+            if name == "part_begin":
+                self.count += 1
+                if self.max_parts is not None and self.count > self.max_parts:
+                    raise HTTPError(413, detail="Too many parts.")
+                self.raw_headers = []
+            elif name == "header_field":
+                self.header_field += data
+            elif name == "header_value":
+                self.header_value += data
+            elif name == "header_end":
+                field = self.header_field.lower()
+                self.raw_headers.append((field, self.header_value))
+                self.header_field = self.header_value = b""
+            elif name == "headers_finished":
+                self.current = self._create_part()
+            elif name == "part_data":
+                await self._write(data)
+            elif name == "part_end":
+                assert self.current is not None
+                self.ready.append(self.current)
+                self.current = None
+            elif name == "end":
+                self.complete = True
+
+    def _create_part(self) -> Part:
+        headers = Headers(raw=self.raw_headers)
+        _, options = parse_options_header(
+            headers.get("content-disposition", "")
+        )
+        if b"name" not in options:
+            raise HTTPError(400, detail="Part is missing a field name.")
+        filename = options.get(b"filename")
+        return Part(
+            name=options[b"name"].decode("latin-1"),
+            filename=filename.decode("latin-1") if filename else None,
+            headers=headers,
+            spool_threshold=self.spool_threshold,
+        )
+
+    async def _write(self, data: bytes):
+        assert self.current is not None
+        size = self.current.size + len(data)
+        if self.max_part_size is not None and size > self.max_part_size:
+            raise HTTPError(413, detail="Part is too large.")
+        await self.current.write(data)
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+        while self.ready:
+            self.ready.popleft().close()
+
+
+async def parse_multipart(
+    req: "Request",
+    max_body_size: Optional[int] = None,
+    max_part_size: Optional[int] = None,
+    max_parts: Optional[int] = None,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+) -> AsyncIterator[Part]:
+    """Incrementally parse a `multipart/form-data` request body.
+
+    Parts are yielded as soon as they have been entirely received,
+    and closed when the iteration moves on to the next part.
+
+    # Parameters
+    req: a #::bocadillo.request#Request object.
+    max_body_size (int): the maximum size of the request body, in bytes.
+    max_part_size (int): the maximum size of a single part, in bytes.
+    max_parts (int): the maximum number of parts.
+    spool_threshold (int):
+        the size in bytes above which the content of a part is moved from
+        memory to a temporary file. Defaults to 1MB.
+
+    # Raises
+    HTTPError(400):
+        if the request body is not `multipart/form-data`, if it is malformed
+        or truncated, or if the `Content-Length` header is invalid.
+    HTTPError(413): if one of the limits is exceeded.
+    """
+    content_type, params = parse_options_header(
+        req.headers.get("content-type", "")
+    )
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPError(400, detail="Expected multipart/form-data.")
+
+    content_length = req.headers.get("content-length")
+    if max_body_size is not None and content_length is not None:
+        try:
+            size = int(content_length)
+        except ValueError:
+            raise HTTPError(400, detail="Invalid Content-Length.") from None
+        if size > max_body_size:
+            raise HTTPError(413, detail="Request body is too large.")
+
+    collector = _PartsCollector(
+        spool_threshold=spool_threshold,
+        max_part_size=max_part_size,
+        max_parts=max_parts,
+    )
+    parser = MultipartParser(boundary, collector.callbacks())
+    received = 0
+    stream = req.stream()
+
+    try:
+        async for chunk in stream:
+            received += len(chunk)
+            if max_body_size is not None and received > max_body_size:
+                raise HTTPError(413, detail="Request body is too large.")
+            try:
+                parser.write(chunk)
+            except MultipartParseError:
+                raise HTTPError(
+                    400, detail="Malformed multipart body."
+                ) from None
+            await collector.process()
+            while collector.ready:
+                part = collector.ready.popleft()
+                try:
+                    yield part
+                finally:
+                    part.close()
+        parser.finalize()
+        if not collector.complete:
+            raise HTTPError(400, detail="Incomplete multipart body.")
+    finally:
+        # Don't leave the body stream pending if parsing stopped early.
+        await stream.aclose()
+        collector.close()
@@ -1,11 +1,12 @@
 import inspect
 from functools import partial, wraps
-from typing import Any, cast, Dict, List, Optional, Type, Union
+from typing import Any, Callable, cast, Dict, List, Optional, Type, Union
 
 from . import injection
 from .app_types import AsyncHandler, Handler
 from .compat import call_async, camel_to_snake
 from .constants import ALL_HTTP_METHODS
+from .executors import register_process_function, run_in_process
 
 MethodsParam = Union[List[str], all]  # type: ignore
 
@@ -42,10 +43,12 @@ class View:
 
     # Attributes
     name (str): the name of the view.
+    process (bool): whether the view runs in a process pool.
     """
 
     def __init__(self, name: str, doc: str = None):
         self.name = name
+        self.process = False
         if doc is not None:
             self.__doc__ = doc
 
@@ -170,9 +173,69 @@ def get_handlers(obj: Any) -> Dict[str, Handler]:
         return {method: handle for method in all_methods}
 
 
-def view(methods: MethodsParam = None):
+def _process_handler(func: Callable, timeout: Optional[float]) -> Handler:
+    # Build a handler that runs `func` in a worker process, and sends
+    # its return value as the response's media.
+    register_process_function(func)
+
+    async def handler(req, res, *args, **kwargs):
+        res.media = await run_in_process(func, args, kwargs, timeout=timeout)
+
+    # NOTE: route parameters are injected by name, so expose them.
+    func_params = list(inspect.signature(func).parameters.values())
+    handler_params = [
+        inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        for name in ("req", "res")
+    ]
+    setattr(
+        handler,
+        "__signature__",
+        inspect.Signature(handler_params + func_params),
+    )
+    handler.__name__ = func.__name__
+    handler.__doc__ = func.__doc__
+    return handler
+
+
+def view(
+    methods: MethodsParam = None,
+    *,
+    executor: Optional[str] = None,
+    timeout: Optional[float] = None,
+):
     """Convert the decorated function to a proper #::bocadillo.views#View.
 
     This decorator is a shortcut for [from_handler](#from-handler).
+
+    # Parameters
+    methods (list of str): see [from_handler](#from-handler).
+    executor (str):
+        if `"process"`, the decorated function is run in the application's
+        process pool. It does not receive `req` and `res`, only route
+        parameters, and its return value is sent as the response's media.
+        It must be defined at the top level of a module, and its
+        parameters and return value must be picklable.
+        This is useful for CPU-bound views.
+    timeout (float):
+        with `executor="process"`, the maximum duration of the task
+        in seconds. Defaults to the process pool's `timeout`.
+
+    # See Also
+    - [Process views](../guides/http/views.md#process-views)
     """
-    return partial(from_handler, methods=methods)
+    if executor is None:
+        return partial(from_handler, methods=methods)
+
+    if executor != "process":
+        raise ValueError(
+            f"Unsupported view executor: {executor!r}. Use "
+            "`@app.route(..., executor=...)` for thread executors."
+        )
+
+    def decorate(func: Callable) -> View:
+        handler = _process_handler(func, timeout=timeout)
+        vue = from_handler(handler, methods=methods)
+        vue.process = True
+        return vue
+
+    return decorate
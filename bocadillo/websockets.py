@@ -1,4 +1,16 @@
-from typing import Any, Awaitable, Callable, Optional, Tuple, Union
+import asyncio
+import json
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from starlette.datastructures import URL, Headers, QueryParams
 from starlette.websockets import WebSocket as StarletteWebSocket
@@ -76,6 +88,9 @@ class WebSocket:
         self.receive_type = receive_type
         self.send_type = send_type
 
+        # Broadcast groups this connection is a member of.
+        self._groups: Set["Group"] = set()
+
     def __getattr__(self, name: str) -> Any:
         return getattr(self._ws, name)
 
@@ -184,6 +199,9 @@ class WebSocket:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        for group in list(self._groups):
+            group.remove(self)
+
         if exc_type == WebSocketDisconnect:
             # Client has closed the connection.
             # Returning `True` here silences the exception. See:
@@ -205,3 +223,212 @@ class WebSocket:
 
 WebSocketView = Callable[[WebSocket], Awaitable[None]]
 WebSocketDisconnect = _WebSocketDisconnect
+
+# Close code sent to members that cannot keep up with broadcast messages.
+SLOW_CONSUMER_CLOSE_CODE = 1013  # Try Again Later
+
+
+def encode_event(message: Any, send_type: str) -> dict:
+    """Build the ASGI event which sends `message` over a WebSocket.
+
+    # Parameters
+    message (any): a message.
+    send_type (str): one of `"text"`, `"bytes"` or `"json"`.
+    """
+    if send_type == "bytes":
+        return {"type": "websocket.send", "bytes": message}
+    if send_type == "json":
+        message = json.dumps(message)
+    elif send_type != "text":
+        raise ValueError(f"Unknown send type: {send_type!r}")
+    return {"type": "websocket.send", "text": message}
+
+
+class _Member:
+    __slots__ = ("queue", "task")
+
+    def __init__(self, queue: asyncio.Queue, task: asyncio.Future):
+        self.queue = queue
+        self.task = task
+
+
+class Group:
+    """A group of WebSocket connections that messages can be broadcast to.
+
+    Each member has a bounded queue of outbound messages, which are sent
+    by a dedicated task. Broadcasting a message encodes it once and adds it
+    to the queue of every member, so members receive it concurrently and
+    a slow member does not hold back the others.
+
+    Members are removed when their connection fails, when their queue is
+    full (they are then closed with code 1013, "Try Again Later"), or when
+    exiting the `async with ws:` block.
+
+    # Parameters
+    name (str): the name of the group.
+    send_type (str):
+        the type of broadcast messages: `"text"`, `"bytes"` or `"json"`.
+        Defaults to `"text"`.
+    max_queue (int):
+        the maximum number of messages waiting to be sent to a member.
+        Defaults to `100`.
+
+    # Attributes
+    sent (int): the number of messages sent to members.
+    slow_consumers (int):
+        the number of members removed because their queue was full.
+    """
+
+    def __init__(
+        self, name: str, send_type: str = "text", max_queue: int = 100
+    ):
+        self.name = name
+        self.send_type = send_type
+        self.max_queue = max_queue
+        self.sent = 0
+        self.slow_consumers = 0
+        self._members: Dict[WebSocket, _Member] = {}
+        self._on_empty: Optional[Callable[["Group"], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, ws: WebSocket) -> bool:
+        return ws in self._members
+
+    def __iter__(self) -> Iterator[WebSocket]:
+        return iter(list(self._members))
+
+    def add(self, ws: WebSocket):
+        """Add a connection to the group."""
+        if ws in self._members:
+            return
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        task = asyncio.ensure_future(self._send_queued(ws, queue))
+        self._members[ws] = _Member(queue, task)
+        ws._groups.add(self)  # pylint: disable=protected-access
+
+    def remove(self, ws: WebSocket):
+        """Remove a connection from the group.
+
+        Messages that have not been sent to it yet are discarded.
+        """
+        member = self._members.pop(ws, None)
+        if member is None:
+            return
+        ws._groups.discard(self)  # pylint: disable=protected-access
+        member.task.cancel()
+        # Unblock `flush()`.
+        while not member.queue.empty():
+            member.queue.get_nowait()
+            member.queue.task_done()
+        if not self._members and self._on_empty is not None:
+            self._on_empty(self)
+
+    async def _send_queued(self, ws: WebSocket, queue: asyncio.Queue):
+        while True:
+            event = await queue.get()
+            try:
+                await ws.send_event(event)
+            except Exception:  # pylint: disable=broad-except
+                # Connection closed or broken.
+                self.remove(ws)
+                return
+            else:
+                self.sent += 1
+            finally:
+                queue.task_done()
+
+    async def broadcast(self, message: Any, exclude: WebSocket = None) -> int:
+        """Send a message to all members of the group.
+
+        This does not wait for the message to be sent (see `flush()`).
+
+        # Parameters
+        message (any): the message, of the group's `send_type`.
+        exclude (WebSocket):
+            an optional member that should not receive the message,
+            e.g. its sender.
+
+        # Returns
+        count (int): the number of members the message was queued for.
+        """
+        event = encode_event(message, self.send_type)
+        count = 0
+        for ws, member in list(self._members.items()):
+            if ws is exclude:
+                continue
+            try:
+                member.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.slow_consumers += 1
+                self.remove(ws)
+                asyncio.ensure_future(
+                    ws.ensure_closed(SLOW_CONSUMER_CLOSE_CODE)
+                )
+            else:
+                count += 1
+        return count
+
+    async def flush(self):
+        """Wait until queued messages have been sent to all members."""
+        await asyncio.gather(
+            *(member.queue.join() for member in self._members.values())
+        )
+
+
+class Groups:
+    """A registry of broadcast groups, e.g. chat rooms.
+
+    Groups are created on first access, and dropped once their last member
+    has been removed.
+
+    # Parameters
+    **kwargs (any): options passed to #::bocadillo.websockets#Group.
+
+    # Example
+
+    ```python
+    from bocadillo import App, provider
+    from bocadillo.websockets import Groups
+
+    @provider(scope="app")
+    def rooms() -> Groups:
+        return Groups(send_type="json")
+
+    app = App()
+
+    @app.websocket_route("/rooms/{name}", value_type="json")
+    async def chat(ws, name, rooms: Groups):
+        async with ws:
+            room = rooms[name]
+            room.add(ws)
+            async for message in ws:
+                await room.broadcast(message)
+    ```
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._options = kwargs
+        self._groups: Dict[str, Group] = {}
+
+    def __getitem__(self, name: str) -> Group:
+        try:
+            return self._groups[name]
+        except KeyError:
+            group = self._groups[name] = Group(name, **self._options)
+            group._on_empty = self._drop  # pylint: disable=protected-access
+            return group
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._groups
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._groups))
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def _drop(self, group: Group):
+        if self._groups.get(group.name) is group:
+            del self._groups[group.name]
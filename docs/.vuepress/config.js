@@ -183,6 +183,7 @@ module.exports = {
             "connections",
             "error-handling",
             "messages",
+            "groups",
             "example"
           ])
         },
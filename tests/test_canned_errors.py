@@ -0,0 +1,104 @@
+import pytest
+
+from bocadillo import App, HTTPError, Middleware
+from bocadillo.testing import create_client
+from bocadillo.error_handlers import (
+    error_to_html,
+    error_to_media,
+    error_to_text,
+)
+
+
+@pytest.mark.parametrize(
+    "handler, content_type, expected",
+    [
+        (error_to_text, "text/plain", "404 Not Found"),
+        (error_to_html, "text/html", "<h1>404 Not Found</h1>"),
+        (
+            error_to_media,
+            "application/json",
+            '{"error": "404 Not Found", "status": 404}',
+        ),
+    ],
+)
+def test_canned_bodies_are_reused(
+    app: App, client, handler, content_type: str, expected: str
+):
+    bodies = []
+
+    async def record(req, res, exc):
+        await handler(req, res, exc)
+        bodies.append(res.content)
+
+    app.add_error_handler(HTTPError, record)
+
+    for _ in range(2):
+        r = client.get("/foo")
+        assert r.status_code == 404
+        assert r.headers["content-type"] == content_type
+        assert r.text == expected
+
+    assert bodies[0] is bodies[1]
+
+
+def test_canned_bodies_are_stored_per_app():
+    apps = [App(), App()]
+    for app in apps:
+        assert create_client(app).get("/foo").status_code == 404
+
+    first, second = (app.exception_middleware.canned_bodies for app in apps)
+    assert first == second
+    assert first is not second
+
+
+def test_details_are_not_canned(app: App, client):
+    @app.route("/{detail}")
+    async def index(req, res, detail: str):
+        raise HTTPError(400, detail=detail)
+
+    assert client.get("/foo").text == "400 Bad Request\nfoo"
+    assert client.get("/bar").text == "400 Bad Request\nbar"
+
+
+def test_canned_media_follows_media_handler(app: App, client):
+    app.add_error_handler(HTTPError, error_to_media)
+    assert client.get("/foo").json() == {
+        "error": "404 Not Found",
+        "status": 404,
+    }
+
+    app.media_handlers["application/json"] = lambda value: "{}"
+    app.media_type = "application/json"
+    assert client.get("/foo").json() == {}
+
+
+@pytest.mark.parametrize("canned_errors", [True, False])
+def test_canned_not_found(canned_errors: bool):
+    app = App(canned_errors=canned_errors)
+    after = False
+
+    class Spy(Middleware):
+        async def after_dispatch(self, req, res):
+            nonlocal after
+            after = True
+
+    app.add_middleware(Spy)
+
+    r = create_client(app).get("/foo")
+    assert r.status_code == 404
+    assert r.text == "404 Not Found"
+    # Not found errors are not raised, so middleware sees a regular response.
+    assert after is canned_errors
+
+
+def test_canned_not_found_uses_custom_http_error_handler():
+    app = App(canned_errors=True)
+
+    @app.error_handler(HTTPError)
+    def handle(req, res, exc):
+        res.status_code = exc.status_code
+        res.text = "custom"
+
+    r = create_client(app).get("/foo")
+    assert r.status_code == 404
+    assert r.text == "custom"
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+from contextvars import ContextVar
+from time import monotonic
+
+import pytest
+
+from bocadillo import App, HTTPError, Middleware, Recipe, hooks
+from bocadillo.executors import Executor, Executors, run_sync, use_executor
+from bocadillo.testing import create_client
+
+
+def current_thread_name(*args, **kwargs) -> str:
+    return threading.current_thread().name
+
+
+async def wait_until(condition, timeout: float = 5):
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, "Condition not met in time"
+        await asyncio.sleep(0.001)
+
+
+def test_route_executor(app: App, client):
+    app.add_executor("reports", max_workers=2)
+    threads = {}
+
+    def record_hook(req, res, params):
+        threads["hook"] = current_thread_name()
+
+    @app.route("/report", executor="reports")
+    @hooks.before(record_hook)
+    def report(req, res):
+        threads["view"] = current_thread_name()
+
+    @app.route("/other")
+    def other(req, res):
+        threads["other"] = current_thread_name()
+
+    client.get("/report")
+    client.get("/other")
+
+    assert threads["view"].startswith("bocadillo-reports")
+    assert threads["hook"].startswith("bocadillo-reports")
+    assert not threads["other"].startswith("bocadillo-reports")
+    assert app.executors["reports"].completed == 2
+
+
+def test_default_executor(app: App, client):
+    app.add_executor("main", default=True)
+    app.add_executor("reports")
+    threads = {}
+
+    @app.route("/report", executor="reports")
+    def report(req, res):
+        threads["report"] = current_thread_name()
+
+    @app.route("/other")
+    def other(req, res):
+        threads["other"] = current_thread_name()
+
+    client.get("/report")
+    client.get("/other")
+
+    assert threads["report"].startswith("bocadillo-reports")
+    assert threads["other"].startswith("bocadillo-main")
+
+
+def test_recipe_routes_can_use_app_executors():
+    app = App()
+    app.add_executor("main", default=True)
+    app.add_executor("reports")
+    recipe = Recipe("tacos")
+    threads = {}
+
+    @recipe.route("/report", executor="reports")
+    def report(req, res):
+        threads["report"] = current_thread_name()
+
+    @recipe.route("/other")
+    def other(req, res):
+        threads["other"] = current_thread_name()
+
+    app.recipe(recipe)
+    client = create_client(app)
+
+    assert client.get("/tacos/report").status_code == 200
+    assert client.get("/tacos/other").status_code == 200
+    assert threads["report"].startswith("bocadillo-reports")
+    assert threads["other"].startswith("bocadillo-main")
+
+
+def test_context_variables_are_visible_in_executor_threads(app: App, client):
+    app.add_executor("reports")
+    user: ContextVar[str] = ContextVar("user", default="anonymous")
+
+    class SetUser(Middleware):
+        async def before_dispatch(self, req, res):
+            user.set(req.headers.get("x-user", "anonymous"))
+
+    app.add_middleware(SetUser)
+
+    @app.route("/report", executor="reports")
+    def report(req, res):
+        res.text = user.get()
+
+    assert client.get("/report", headers={"x-user": "alice"}).text == "alice"
+
+
+def test_if_executor_does_not_exist_then_error_on_first_request():
+    app = App()
+
+    @app.route("/report", executor="nope")
+    def report(req, res):
+        pass
+
+    @app.route("/")
+    def index(req, res):
+        pass
+
+    client = create_client(app)
+    # Fails regardless of the requested route.
+    with pytest.raises(LookupError, match="nope"):
+        client.get("/")
+
+
+def test_unknown_executor():
+    executors = Executors()
+    with pytest.raises(KeyError):
+        executors["unknown"]
+
+
+@pytest.mark.asyncio
+async def test_run_sync_uses_current_executor():
+    executor = Executor("test", max_workers=1)
+    try:
+        assert not (await run_sync(current_thread_name)).startswith(
+            "bocadillo-test"
+        )
+        with use_executor(executor):
+            name = await run_sync(current_thread_name)
+        assert name.startswith("bocadillo-test")
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_and_metrics():
+    executor = Executor("test", max_workers=1, max_queue=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        started.set()
+        release.wait()
+
+    try:
+        running = asyncio.ensure_future(executor.run(work))
+        queued = asyncio.ensure_future(executor.run(work))
+        await wait_until(lambda: started.is_set() and executor.queued == 1)
+
+        assert executor.active == 1
+        assert executor.queued == 1
+        assert executor.utilization == 1
+
+        with pytest.raises(HTTPError) as ctx:
+            await executor.run(work)
+        assert ctx.value.status_code == 503
+        assert executor.rejected == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert executor.stats() == {
+            "name": "test",
+            "max_workers": 1,
+            "max_queue": 1,
+            "active": 0,
+            "queued": 0,
+            "completed": 2,
+            "rejected": 1,
+            "utilization": 0,
+        }
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executors_are_shut_down_with_the_app():
+    app = App()
+    executor = app.add_executor("reports")
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    await app({"type": "lifespan"})(receive, send)
+
+    with pytest.raises(RuntimeError):
+        executor._pool.submit(print)
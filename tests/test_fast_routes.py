@@ -0,0 +1,140 @@
+import pytest
+
+from bocadillo import App, Middleware
+
+
+def test_constant_body(app: App, client):
+    app.add_fast_route("/health", "OK")
+    r = client.get("/health")
+    assert r.status_code == 200
+    assert r.text == "OK"
+    assert r.headers["content-type"] == "text/plain; charset=utf-8"
+    assert r.headers["content-length"] == "2"
+
+
+def test_json_body(app: App, client):
+    app.add_fast_route("/version", {"version": "1.0"})
+    r = client.get("/version")
+    assert r.json() == {"version": "1.0"}
+    assert r.headers["content-type"] == "application/json"
+
+
+def test_status_media_type_and_headers(app: App, client):
+    app.add_fast_route(
+        "/ping",
+        b"pong",
+        status=202,
+        media_type="application/octet-stream",
+        headers={"X-Fast": "yes"},
+    )
+    r = client.get("/ping")
+    assert r.status_code == 202
+    assert r.content == b"pong"
+    assert r.headers["content-type"] == "application/octet-stream"
+    assert r.headers["x-fast"] == "yes"
+
+
+@pytest.mark.parametrize("is_async", [True, False])
+def test_handler(app: App, client, is_async: bool):
+    count = 0
+
+    if is_async:
+
+        @app.fast_route("/metrics")
+        async def metrics(scope):
+            nonlocal count
+            count += 1
+            return {"count": count}
+
+    else:
+
+        @app.fast_route("/metrics")
+        def metrics(scope):
+            nonlocal count
+            count += 1
+            return {"count": count}
+
+    assert client.get("/metrics").json() == {"count": 1}
+    assert client.get("/metrics").json() == {"count": 2}
+
+
+@pytest.mark.asyncio
+async def test_head_request_has_no_body(app: App):
+    app.add_fast_route("/health", "OK")
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "HEAD", "path": "/health"}
+    await app(scope)(receive, send)
+
+    start, body = messages
+    assert start["status"] == 200
+    assert (b"content-length", b"2") in start["headers"]
+    assert body["body"] == b""
+
+
+def test_other_methods_go_through_regular_stack(app: App, client):
+    app.add_fast_route("/health", "OK")
+    assert client.post("/health").status_code == 404
+
+
+def test_fast_routes_bypass_middleware(app: App, client):
+    called = False
+
+    class Spy(Middleware):
+        async def before_dispatch(self, req, res):
+            nonlocal called
+            called = True
+
+    app.add_middleware(Spy)
+    app.add_fast_route("/health", "OK")
+
+    assert client.get("/health").text == "OK"
+    assert not called
+
+
+def test_fast_routes_take_precedence_over_routes(app: App, client):
+    @app.route("/health")
+    async def health(req, res):
+        res.text = "slow"
+
+    app.add_fast_route("/health", "fast")
+    assert client.get("/health").text == "fast"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_async", [True, False])
+async def test_if_handler_raises_then_500_is_sent(app: App, is_async: bool):
+    if is_async:
+
+        @app.fast_route("/metrics")
+        async def metrics(scope):
+            raise ValueError("oops")
+
+    else:
+
+        @app.fast_route("/metrics")
+        def metrics(scope):
+            raise ValueError("oops")
+
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/metrics"}
+    # The exception is re-raised for the server to log it.
+    with pytest.raises(ValueError):
+        await app(scope)(receive, send)
+
+    start, body = messages
+    assert start["status"] == 500
+    assert body["body"] == b"Internal Server Error"
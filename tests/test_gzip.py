@@ -1,4 +1,5 @@
-from bocadillo import App
+from bocadillo import App, Recipe
+from bocadillo.compression import CompressedBodyCache
 from bocadillo.testing import create_client
 
 
@@ -13,3 +14,130 @@ def test_if_gzip_enabled_then_response_is_compressed():
     response = client.get("/", headers={"Accept-Encoding": "gzip"})
     assert response.status_code == 200
     assert response.headers["content-encoding"] == "gzip"
+
+
+def test_if_route_disables_gzip_then_response_is_not_compressed():
+    app = App(enable_gzip=True, gzip_min_size=0)
+
+    @app.route("/", gzip=False)
+    async def index(req, res):
+        res.text = "Hello"
+
+    client = create_client(app)
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.text == "Hello"
+
+
+def test_route_can_enable_gzip_on_its_own():
+    app = App()
+
+    @app.route("/", gzip=True, gzip_min_size=10, gzip_level=1)
+    async def index(req, res):
+        res.text = req.query_params.get("text", "")
+
+    client = create_client(app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/", params={"text": "short"}, headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/", params={"text": "x" * 100}, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "x" * 100
+
+
+def test_if_client_does_not_accept_gzip_then_not_compressed():
+    app = App()
+
+    @app.route("/", gzip=True, gzip_min_size=0)
+    async def index(req, res):
+        res.text = "Hello"
+
+    client = create_client(app)
+    response = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_bodies_are_cached_if_route_opts_in():
+    app = App(enable_gzip=True, gzip_min_size=0)
+
+    @app.route("/", gzip_cache=True)
+    async def index(req, res):
+        res.media = {"message": "Hello, world!"}
+
+    client = create_client(app)
+    for _ in range(3):
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == {"message": "Hello, world!"}
+
+    assert app.gzip_cache.misses == 1
+    assert app.gzip_cache.hits == 2
+    assert len(app.gzip_cache) == 1
+
+
+def test_compressed_bodies_are_not_cached_by_default():
+    app = App(enable_gzip=True, gzip_min_size=0)
+
+    @app.route("/")
+    async def index(req, res):
+        res.text = "Hello, world!"
+
+    client = create_client(app)
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "Hello, world!"
+    assert len(app.gzip_cache) == 0
+    assert app.gzip_cache.misses == 0
+
+
+def test_compressed_body_cache_is_bounded_by_size():
+    cache = CompressedBodyCache(max_bytes=1000, max_body_size=400)
+
+    for i in range(5):
+        cache.compress(bytes([i]) * 300, level=9)
+    assert cache.size <= 1000
+    assert len(cache) < 5
+
+    # Most recently used bodies are kept.
+    cache.compress(bytes([4]) * 300, level=9)
+    assert cache.hits == 1
+
+    # Bodies that are too large are not cached.
+    cache.compress(b"x" * 500, level=9)
+    assert cache.misses == 5
+
+
+def test_streamed_responses_are_compressed():
+    app = App()
+
+    @app.route("/", gzip=True)
+    async def index(req, res):
+        @res.stream
+        async def stream():
+            for word in ("Hello", ", ", "world"):
+                yield word
+
+    client = create_client(app)
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "Hello, world"
+
+
+def test_sub_apps_are_still_compressed_by_the_root_app():
+    app = App(enable_gzip=True, gzip_min_size=0)
+    tacos = Recipe("tacos")
+
+    @tacos.route("/")
+    async def index(req, res):
+        res.text = "Tacos"
+
+    app.recipe(tacos)
+
+    client = create_client(app)
+    response = client.get("/tacos/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "Tacos"
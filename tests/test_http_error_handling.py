@@ -129,3 +129,42 @@ def test_http_error_status_must_be_int_or_http_status():
 
 def test_http_error_str_representation():
     assert str(HTTPError(404, detail="foo")) == "404 Not Found"
+
+
+def test_most_specific_error_handler_wins(app: App, client):
+    @app.error_handler(Exception)
+    def on_exception(req, res, exc):
+        res.text = "exception"
+
+    @app.error_handler(KeyError)
+    def on_key_error(req, res, exc):
+        res.text = "key error"
+
+    @app.route("/key")
+    async def key(req, res):
+        raise KeyError
+
+    @app.route("/value")
+    async def value(req, res):
+        raise ValueError
+
+    assert client.get("/key").text == "key error"
+    assert client.get("/value").text == "exception"
+
+
+def test_error_handlers_added_later_are_taken_into_account(app: App, client):
+    @app.error_handler(LookupError)
+    def on_lookup_error(req, res, exc):
+        res.text = "lookup error"
+
+    @app.route("/")
+    async def index(req, res):
+        raise KeyError
+
+    assert client.get("/").text == "lookup error"
+
+    @app.error_handler(KeyError)
+    def on_key_error(req, res, exc):
+        res.text = "key error"
+
+    assert client.get("/").text == "key error"
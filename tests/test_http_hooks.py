@@ -1,4 +1,4 @@
-from bocadillo import App, hooks
+from bocadillo import App, hooks, provider
 from .utils import function_hooks, async_function_hooks, class_hooks
 
 
@@ -115,3 +115,137 @@ def test_before_does_not_run_if_method_not_allowed(app: App, client):
 
         response = client.put("/foo")
         assert response.status_code == 405
+
+
+def test_stacked_hooks_run_in_decorator_order(app: App, client):
+    calls = []
+
+    def record(req, res, params, name):
+        calls.append(name)
+
+    @app.route("/foo")
+    @hooks.before(record, "before 1")
+    @hooks.after(record, "after 2")
+    @hooks.before(record, "before 2")
+    @hooks.after(record, "after 1")
+    async def foo(req, res):
+        calls.append("view")
+
+    client.get("/foo")
+    assert calls == ["before 1", "before 2", "view", "after 1", "after 2"]
+
+
+def test_stacked_hooks_are_compiled_into_a_single_wrapper():
+    async def noop(req, res, params):
+        pass
+
+    async def foo(req, res):
+        pass
+
+    hooked = hooks.before(noop)(hooks.after(noop)(hooks.before(noop)(foo)))
+    assert hooked.__wrapped__ is foo
+
+
+def test_hooks_receive_route_parameters(app: App, client):
+    received = None
+
+    async def capture(req, res, params):
+        nonlocal received
+        received = params
+
+    @app.route("/items/{pk}")
+    @hooks.before(capture)
+    async def item(req, res, pk):
+        pass
+
+    client.get("/items/1")
+    assert received == {"pk": "1"}
+
+
+def test_hooks_params_do_not_contain_injected_values(app: App, client):
+    received = None
+
+    @provider
+    def hooks_user():
+        return "alice"
+
+    async def capture(req, res, params):
+        nonlocal received
+        received = params
+
+    @app.route("/items/{pk}")
+    @hooks.before(capture)
+    async def item(req, res, hooks_user, pk):
+        res.text = hooks_user
+
+    assert client.get("/items/1").text == "alice"
+    assert received == {"pk": "1"}
+
+
+def test_inline_sync_hooks_run_on_event_loop(app: App, client):
+    import threading
+
+    threads = {}
+
+    @hooks.inline
+    def inline_hook(req, res, params):
+        threads["inline"] = threading.current_thread()
+
+    def threaded_hook(req, res, params):
+        threads["threaded"] = threading.current_thread()
+
+    async def async_hook(req, res, params):
+        threads["loop"] = threading.current_thread()
+
+    @app.route("/foo")
+    @hooks.before(async_hook)
+    @hooks.before(inline_hook)
+    @hooks.after(threaded_hook)
+    async def foo(req, res):
+        pass
+
+    client.get("/foo")
+    assert threads["inline"] is threads["loop"]
+    assert threads["threaded"] is not threads["loop"]
+
+
+def test_method_hooks_receive_route_parameters(app: App, client):
+    received = None
+
+    async def capture(req, res, params):
+        nonlocal received
+        received = params
+
+    @app.route("/items/{pk}")
+    class Item:
+        @hooks.after(capture)
+        async def get(self, req, res, pk):
+            res.text = pk
+
+    assert client.get("/items/1").text == "1"
+    assert received == {"pk": "1"}
+
+
+def test_method_hooks_do_not_rely_on_parameter_names(app: App, client):
+    received = None
+
+    async def capture(req, res, params):
+        nonlocal received
+        received = params
+
+    @app.route("/items/{pk}")
+    @hooks.before(capture)
+    class Item:
+        async def get(this, req, res, pk):
+            res.text = pk
+
+    @app.route("/other/{pk}")
+    class Other:
+        @hooks.before(capture)
+        async def get(this, req, res, pk):
+            res.text = pk
+
+    assert client.get("/items/1").text == "1"
+    assert received == {"pk": "1"}
+    assert client.get("/other/2").text == "2"
+    assert received == {"pk": "2"}
@@ -203,3 +203,85 @@ def test_middleware_called_if_routed_to_sub_app(app: App, client):
         r = client.get("/sub/home")
         assert r.status_code == 200
         assert r.text == "OK"
+
+
+def test_no_op_middleware_is_removed_from_the_chain(app: App, client):
+    initialized = False
+
+    class NoOp(Middleware):
+        def __init__(self, inner, app: App, **kwargs):
+            super().__init__(inner, app, **kwargs)
+            nonlocal initialized
+            initialized = True
+
+    router = app.exception_middleware.app
+    app.add_middleware(NoOp)
+    assert initialized
+    assert app.exception_middleware.app is router
+
+    @app.route("/")
+    async def index(req, res):
+        res.text = "OK"
+
+    assert client.get("/").text == "OK"
+
+
+@pytest.mark.parametrize("override", ["before_dispatch", "after_dispatch"])
+def test_only_overridden_hooks_are_called(app: App, client, override: str):
+    called = []
+
+    async def hook(self, req, res):
+        called.append(override)
+
+    app.add_middleware(type("OneHook", (Middleware,), {override: hook}))
+
+    @app.route("/")
+    async def index(req, res):
+        res.text = "OK"
+
+    r = client.get("/")
+    assert r.text == "OK"
+    assert called == [override]
+
+
+def test_async_hooks_are_not_run_in_thread_pool(app: App, client, monkeypatch):
+    import bocadillo.compat
+
+    calls = []
+
+    class Async(Middleware):
+        async def before_dispatch(self, req, res):
+            calls.append("before")
+
+    app.add_middleware(Async)
+
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    original = bocadillo.compat.run_sync
+
+    async def run_sync(*args, **kwargs):  # pragma: no cover
+        calls.append("threadpool")
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(bocadillo.compat, "run_sync", run_sync)
+    client.get("/")
+
+    assert calls == ["before"]
+
+
+def test_custom_call_implementation_is_used_as_is(app: App, client):
+    class Custom(Middleware):
+        async def __call__(self, req, res):
+            res = await self.inner(req, res)
+            res.headers["x-custom"] = "yes"
+            return res
+
+    app.add_middleware(Custom)
+
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    assert client.get("/").headers["x-custom"] == "yes"
@@ -0,0 +1,148 @@
+import pytest
+
+from bocadillo import App, Middleware, Recipe
+from bocadillo.routing import RoutingMixin
+
+
+def build_tagger(tag: str):
+    class Tagger(Middleware):
+        async def after_dispatch(self, req, res):
+            res.headers["x-tags"] = ",".join(
+                filter(None, [res.headers.get("x-tags"), tag])
+            )
+
+    return Tagger
+
+
+class Tag(Middleware):
+    def __init__(self, inner, tag: str = "", **kwargs):
+        super().__init__(inner, **kwargs)
+        self.tag = tag
+
+    async def after_dispatch(self, req, res):
+        res.headers["x-tags"] = ",".join(
+            filter(None, [res.headers.get("x-tags"), self.tag])
+        )
+
+
+def test_route_middleware_only_applies_to_route(app: App, client):
+    @app.route("/a", middleware=[build_tagger("a")])
+    async def a(req, res):
+        pass
+
+    @app.route("/b")
+    async def b(req, res):
+        pass
+
+    assert client.get("/a").headers["x-tags"] == "a"
+    assert "x-tags" not in client.get("/b").headers
+
+
+def test_first_route_middleware_is_outermost(app: App, client):
+    @app.route(
+        "/", middleware=[(Tag, {"tag": "outer"}), (Tag, {"tag": "inner"})]
+    )
+    async def index(req, res):
+        pass
+
+    # `after_dispatch()` of the inner middleware is called first.
+    assert client.get("/").headers["x-tags"] == "inner,outer"
+
+
+def test_route_middleware_can_short_circuit(app: App, client):
+    class Deny(Middleware):
+        async def before_dispatch(self, req, res):
+            res.status_code = 403
+            return res
+
+    called = False
+
+    @app.route("/", middleware=[Deny])
+    async def index(req, res):
+        nonlocal called
+        called = True
+
+    assert client.get("/").status_code == 403
+    assert not called
+
+
+def test_route_middleware_has_access_to_path_params(app: App, client):
+    class Echo(Middleware):
+        async def before_dispatch(self, req, res):
+            res.headers["x-pk"] = str(req.path_params["pk"])
+
+    @app.route("/items/{pk:d}", middleware=[Echo])
+    async def item(req, res, pk: int):
+        res.media = {"pk": pk}
+
+    r = client.get("/items/1")
+    assert r.headers["x-pk"] == "1"
+    assert r.json() == {"pk": 1}
+
+
+def test_route_middleware_sees_errors_raised_in_views(app: App, client):
+    @app.route("/", middleware=[build_tagger("a")])
+    async def index(req, res):
+        raise ValueError
+
+    @app.error_handler(ValueError)
+    def handle(req, res, exc):
+        res.status_code = 400
+
+    # Errors bubble up to the app-level error handlers.
+    r = client.get("/")
+    assert r.status_code == 400
+    assert "x-tags" not in r.headers
+
+
+def test_namespace_middleware(app: App, client):
+    @app.route("/before", namespace="admin")
+    async def before(req, res):
+        pass
+
+    app.add_middleware(Tag, namespace="admin", tag="admin")
+
+    @app.route("/after", namespace="admin", middleware=[build_tagger("r")])
+    async def after(req, res):
+        pass
+
+    @app.route("/public")
+    async def public(req, res):
+        pass
+
+    assert client.get("/before").headers["x-tags"] == "admin"
+    # Namespace middleware wraps route middleware.
+    assert client.get("/after").headers["x-tags"] == "r,admin"
+    assert "x-tags" not in client.get("/public").headers
+
+
+def test_recipe_middleware_only_applies_to_recipe():
+    app = App()
+    recipe = Recipe("tacos")
+    recipe.add_middleware(Tag, tag="tacos")
+
+    @recipe.route("/")
+    async def tacos(req, res):
+        pass
+
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    app.recipe(recipe)
+    client = app.client
+
+    assert client.get("/tacos/").headers["x-tags"] == "tacos"
+    assert "x-tags" not in client.get("/").headers
+
+
+def test_routing_mixin_without_middleware_support_rejects_middleware():
+    class Router(RoutingMixin):
+        pass
+
+    router = Router()
+    with pytest.raises(TypeError):
+
+        @router.route("/", middleware=[Tag])
+        async def index(req, res):
+            pass
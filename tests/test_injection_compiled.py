@@ -0,0 +1,130 @@
+from bocadillo import App, provider
+from bocadillo.injection import consumer, freeze_providers
+from bocadillo.testing import create_client
+
+
+def test_resolution_plan_is_built_when_providers_are_frozen():
+    @provider
+    async def compiled_greeting():
+        return "Hello"
+
+    async def greet(compiled_greeting, who):
+        return f"{compiled_greeting}, {who}!"
+
+    greet_consumer = consumer(greet)
+    freeze_providers()
+    # pylint: disable=protected-access
+    plan = greet_consumer._plan
+    assert plan is not None
+    assert [(step.name, step.provider is not None) for step in plan.steps] == [
+        ("compiled_greeting", True),
+        ("who", False),
+    ]
+    assert not plan.needs_stack
+
+
+def test_app_providers_are_marked_as_singletons():
+    @provider(scope="app")
+    async def compiled_settings():
+        return {"debug": True}
+
+    @provider
+    async def compiled_user():
+        return "john"
+
+    async def view(compiled_settings, compiled_user):
+        pass
+
+    plan = consumer(view).compile()
+    assert [step.singleton for step in plan.steps] == [True, False]
+
+
+def test_app_provider_instance_is_reused(app: App, client):
+    built = 0
+
+    @provider(scope="app")
+    async def compiled_counter():
+        nonlocal built
+        built += 1
+        return object()
+
+    @app.route("/")
+    async def index(req, res, compiled_counter):
+        res.text = str(id(compiled_counter))
+
+    assert client.get("/").text == client.get("/").text
+    assert built == 1
+
+
+def test_yield_provider_cleanup_runs_after_view(app: App, client):
+    events = []
+
+    @provider
+    async def compiled_resource():
+        events.append("setup")
+        yield "resource"
+        events.append("teardown")
+
+    @app.route("/")
+    async def index(req, res, compiled_resource):
+        events.append(compiled_resource)
+
+    assert client.get("/").status_code == 200
+    assert events == ["setup", "resource", "teardown"]
+
+
+def test_keyword_only_parameters_are_injected(app: App, client):
+    @provider
+    async def compiled_name():
+        return "Bocadillo"
+
+    @app.route("/{greeting}")
+    async def index(req, res, greeting, *, compiled_name):
+        res.text = f"{greeting}, {compiled_name}!"
+
+    assert client.get("/Hi").text == "Hi, Bocadillo!"
+
+
+def test_provider_replaced_after_first_request_is_used():
+    app = App()
+    client = create_client(app)
+
+    @provider(name="compiled_word")
+    async def hello():
+        return "hello"
+
+    @app.route("/")
+    async def index(req, res, compiled_word):
+        res.text = compiled_word
+
+    assert client.get("/").text == "hello"
+
+    @provider(name="compiled_word")
+    async def bonjour():
+        return "bonjour"
+
+    assert client.get("/").text == "bonjour"
+
+
+def test_provider_registered_after_freeze_is_injected():
+    app = App()
+    client = create_client(app)
+
+    @app.route("/")
+    async def index(req, res, compiled_late):
+        res.text = compiled_late
+
+    @app.route("/ping")
+    async def ping(req, res):
+        pass
+
+    # Freeze providers.
+    assert client.get("/ping").status_code == 200
+
+    @provider
+    async def compiled_late():
+        return "late"
+
+    r = client.get("/")
+    assert r.status_code == 200
+    assert r.text == "late"
@@ -0,0 +1,247 @@
+import asyncio
+
+import pytest
+
+from bocadillo import App, provider
+from bocadillo.injection import consumer
+
+
+@pytest.mark.asyncio
+async def test_independent_async_providers_are_awaited_concurrently():
+    ready = asyncio.Event()
+
+    @provider
+    async def concurrent_waiter():
+        # Would time out if providers were awaited one after the other.
+        await asyncio.wait_for(ready.wait(), timeout=1)
+        return "waited"
+
+    @provider
+    async def concurrent_setter():
+        await asyncio.sleep(0)
+        ready.set()
+        return "set"
+
+    async def view(concurrent_waiter, concurrent_setter):
+        return concurrent_waiter, concurrent_setter
+
+    assert await consumer(view)() == ("waited", "set")
+
+
+@pytest.mark.asyncio
+async def test_yield_providers_are_torn_down_in_reverse_parameter_order():
+    events = []
+
+    @provider
+    async def concurrent_slow():
+        await asyncio.sleep(0.02)
+        events.append("setup slow")
+        yield "slow"
+        events.append("teardown slow")
+
+    @provider
+    async def concurrent_fast():
+        await asyncio.sleep(0)
+        events.append("setup fast")
+        yield "fast"
+        events.append("teardown fast")
+
+    async def view(concurrent_slow, concurrent_fast):
+        events.append("view")
+
+    await consumer(view)()
+    # `fast` is set up first, but torn down first too (it comes last).
+    assert events == [
+        "setup fast",
+        "setup slow",
+        "view",
+        "teardown fast",
+        "teardown slow",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_if_provider_fails_then_others_are_torn_down():
+    events = []
+
+    @provider
+    async def concurrent_resource():
+        await asyncio.sleep(0)
+        events.append("setup")
+        yield "resource"
+        events.append("teardown")
+
+    @provider
+    async def concurrent_failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def view(concurrent_resource, concurrent_failing):
+        events.append("view")
+
+    with pytest.raises(ValueError, match="failed"):
+        await consumer(view)()
+    assert events == ["setup", "teardown"]
+
+
+def get_groups(func) -> list:
+    plan = consumer(func).compile()
+    return [
+        [step.name for step in step.group] for step in plan.steps if step.group
+    ]
+
+
+def test_dependent_providers_are_not_grouped():
+    @provider
+    async def concurrent_base():
+        await asyncio.sleep(0)
+        return 1
+
+    @provider
+    async def concurrent_derived(concurrent_base):
+        await asyncio.sleep(0)
+        return concurrent_base + 1
+
+    @provider
+    async def concurrent_other():
+        await asyncio.sleep(0)
+        return 0
+
+    async def view(concurrent_base, concurrent_derived, concurrent_other):
+        pass
+
+    assert get_groups(view) == [["concurrent_derived", "concurrent_other"]]
+
+
+def test_providers_sharing_an_app_provider_are_not_grouped():
+    @provider(scope="app")
+    async def concurrent_client():
+        return object()
+
+    @provider
+    async def concurrent_users(concurrent_client):
+        await asyncio.sleep(0)
+        return []
+
+    @provider
+    async def concurrent_posts(concurrent_client):
+        await asyncio.sleep(0)
+        return []
+
+    async def view(concurrent_users, concurrent_posts):
+        pass
+
+    # The app provider could otherwise be set up twice.
+    assert get_groups(view) == []
+
+
+def test_sync_and_builtin_providers_are_not_grouped():
+    App()  # Registers the `req` and `res` providers.
+
+    @provider
+    def concurrent_sync():
+        return 1
+
+    @provider
+    async def concurrent_async():
+        await asyncio.sleep(0)
+        return 2
+
+    async def view(req, res, concurrent_sync, concurrent_async):
+        pass
+
+    assert get_groups(view) == []
+
+
+def test_async_providers_that_never_await_are_not_grouped():
+    @provider
+    async def concurrent_constant():
+        return 1
+
+    @provider
+    async def concurrent_io():
+        await asyncio.sleep(0)
+        return 2
+
+    @provider
+    async def concurrent_other_constant():
+        return 3
+
+    async def view(
+        concurrent_constant, concurrent_io, concurrent_other_constant
+    ):
+        pass
+
+    assert get_groups(view) == []
+
+
+def test_only_consecutive_async_providers_are_grouped():
+    @provider
+    def concurrent_first_sync():
+        return 0
+
+    @provider
+    async def concurrent_a():
+        await asyncio.sleep(0)
+
+    @provider
+    async def concurrent_b():
+        await asyncio.sleep(0)
+
+    @provider
+    def concurrent_second_sync():
+        return 0
+
+    @provider
+    async def concurrent_c():
+        await asyncio.sleep(0)
+
+    async def view(
+        concurrent_a,
+        concurrent_first_sync,
+        concurrent_b,
+        concurrent_c,
+        concurrent_second_sync,
+    ):
+        pass
+
+    assert get_groups(view) == [["concurrent_b", "concurrent_c"]]
+
+
+@pytest.mark.asyncio
+async def test_mixed_sync_and_async_yield_providers_follow_parameter_order():
+    events = []
+
+    @provider
+    def concurrent_s():
+        events.append("setup s")
+        yield "s"
+        events.append("teardown s")
+
+    @provider
+    async def concurrent_a():
+        await asyncio.sleep(0.01)
+        events.append("setup a")
+        yield "a"
+        events.append("teardown a")
+
+    @provider
+    async def concurrent_b():
+        await asyncio.sleep(0)
+        events.append("setup b")
+        yield "b"
+        events.append("teardown b")
+
+    async def view(concurrent_s, concurrent_a, concurrent_b):
+        events.append("view")
+
+    await consumer(view)()
+    assert events == [
+        "setup s",
+        "setup b",  # `a` and `b` are set up concurrently.
+        "setup a",
+        "view",
+        "teardown b",
+        "teardown a",
+        "teardown s",
+    ]
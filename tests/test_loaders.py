@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from bocadillo import App, provider
+from bocadillo.loaders import DataLoader
+from bocadillo.testing import create_client
+
+USERS = {1: "alice", 2: "bob", 3: "carol"}
+
+
+class FakeRepository:
+    def __init__(self):
+        self.calls = []
+
+    async def get_many(self, keys: list) -> list:
+        self.calls.append(keys)
+        await asyncio.sleep(0)
+        return [USERS.get(key) for key in keys]
+
+
+@pytest.fixture
+def repository():
+    return FakeRepository()
+
+
+def test_loader_provider_batches_lookups_of_a_request(app: App, repository):
+    @provider
+    def user_loader() -> DataLoader:
+        return DataLoader(repository.get_many)
+
+    @app.route("/posts")
+    async def posts(req, res, user_loader: DataLoader):
+        authors = [1, 2, 1, 3]
+        names = await asyncio.gather(*map(user_loader.load, authors))
+        res.media = list(names)
+
+    client = create_client(app)
+    assert client.get("/posts").json() == ["alice", "bob", "alice", "carol"]
+    assert client.get("/posts").status_code == 200
+    # One call per request.
+    assert repository.calls == [[1, 2, 3], [1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_loads_of_the_same_tick_are_batched(repository):
+    loader = DataLoader(repository.get_many)
+
+    async def author_of(post: int) -> str:
+        return await loader.load(post % 2 + 1)
+
+    assert await asyncio.gather(*map(author_of, range(4))) == [
+        "alice",
+        "bob",
+        "alice",
+        "bob",
+    ]
+    assert repository.calls == [[1, 2]]
+    assert loader.batches == 1
+    assert loader.misses == 2
+    assert loader.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_values_are_cached(repository):
+    loader = DataLoader(repository.get_many)
+    assert await loader.load(1) == "alice"
+    assert await loader.load_many([1, 2]) == ["alice", "bob"]
+    assert repository.calls == [[1], [2]]
+
+    loader.clear(1)
+    assert await loader.load(1) == "alice"
+    assert repository.calls == [[1], [2], [1]]
+
+
+@pytest.mark.asyncio
+async def test_prime(repository):
+    loader = DataLoader(repository.get_many)
+    loader.prime(1, "alicia")
+    assert await loader.load(1) == "alicia"
+    assert repository.calls == []
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size(repository):
+    loader = DataLoader(repository.get_many, max_batch_size=2)
+    await loader.load_many([1, 2, 3])
+    assert repository.calls == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_batch_function_may_return_a_mapping():
+    loader = DataLoader(lambda keys: {key: key * 2 for key in keys if key})
+    assert await loader.load_many([0, 1, 2]) == [None, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_and_not_cached(repository):
+    async def get_many(keys):
+        if len(repository.calls) == 0:
+            repository.calls.append(keys)
+            raise ConnectionError
+        return await repository.get_many(keys)
+
+    loader = DataLoader(get_many)
+    with pytest.raises(ConnectionError):
+        await loader.load(1)
+    assert await loader.load(1) == "alice"
+
+
+@pytest.mark.asyncio
+async def test_exception_values_are_raised_for_their_key():
+    loader = DataLoader(
+        lambda keys: [KeyError(key) if key else key for key in keys]
+    )
+    zero, one = await asyncio.gather(
+        loader.load(0), loader.load(1), return_exceptions=True
+    )
+    assert zero == 0
+    assert isinstance(one, KeyError)
+
+
+@pytest.mark.asyncio
+async def test_wrong_number_of_values():
+    loader = DataLoader(lambda keys: [])
+    with pytest.raises(ValueError):
+        await loader.load(1)
@@ -0,0 +1,114 @@
+import pytest
+
+from bocadillo import App
+from bocadillo.routing import HTTPRouter, MissCache
+from bocadillo.testing import create_client
+from bocadillo.throttling import Throttle
+
+
+def test_unmatched_paths_are_cached():
+    router = HTTPRouter()
+
+    @router.route("/")
+    async def index(req, res):
+        pass
+
+    assert router.match("/wp-admin.php") is None
+    assert len(router.misses) == 1
+    assert router.misses.hits == 0
+
+    assert router.match("/wp-admin.php") is None
+    assert len(router.misses) == 1
+    assert router.misses.hits == 1
+
+    assert router.match("/") is not None
+    assert len(router.misses) == 1
+
+
+def test_miss_cache_is_cleared_when_routes_change():
+    router = HTTPRouter()
+    assert router.match("/foo") is None
+    assert len(router.misses) == 1
+
+    @router.route("/foo")
+    async def foo(req, res):
+        pass
+
+    assert len(router.misses) == 0
+    assert router.match("/foo") is not None
+
+
+def test_miss_cache_is_bounded():
+    cache = MissCache(maxsize=2, max_path_length=5)
+    cache.add("/a")
+    cache.add("/b")
+    assert "/a" in cache  # Mark as recently used.
+    cache.add("/c")
+    assert len(cache) == 2
+    assert "/b" not in cache
+    assert "/a" in cache
+
+    cache.add("/too-long")
+    assert "/too-long" not in cache
+
+
+def test_miss_cache_can_be_disabled():
+    cache = MissCache(maxsize=0)
+    cache.add("/a")
+    assert len(cache) == 0
+
+
+def test_throttle():
+    now = 0.0
+    throttle = Throttle(2, period=10, clock=lambda: now)
+
+    assert throttle.hit("a")
+    assert throttle.hit("a")
+    assert not throttle.hit("a")
+    assert throttle.hit("b")
+    assert throttle.retry_after("a") == 10
+
+    now = 4.5
+    assert throttle.retry_after("a") == 6
+
+    now = 10.0
+    assert throttle.hit("a")
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_throttle_limit_must_be_positive(limit: int):
+    with pytest.raises(ValueError):
+        Throttle(limit)
+
+
+def test_throttle_is_bounded():
+    throttle = Throttle(1, maxsize=2)
+    for client in "abc":
+        throttle.hit(client)
+    assert len(throttle) == 2
+    # "a" was forgotten.
+    assert throttle.hit("a")
+
+
+def test_not_found_throttling():
+    app = App(not_found_limit=2)
+
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    client = create_client(app)
+    assert client.get("/foo").status_code == 404
+    assert client.get("/bar").status_code == 404
+
+    r = client.get("/foo")
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) > 0
+
+    # Matched routes are not throttled.
+    assert client.get("/").status_code == 200
+
+
+def test_not_found_throttling_is_disabled_by_default(app: App, client):
+    for _ in range(10):
+        assert client.get("/foo").status_code == 404
@@ -0,0 +1,202 @@
+import asyncio
+
+import pytest
+
+from bocadillo import App, provider
+from bocadillo.pools import Pool, PoolTimeout, pool_provider
+from bocadillo.testing import create_client
+
+
+class FakeConnection:
+    def __init__(self, number: int):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.connections = []
+
+    async def connect(self) -> FakeConnection:
+        await asyncio.sleep(0)
+        conn = FakeConnection(len(self.connections))
+        self.connections.append(conn)
+        return conn
+
+    async def disconnect(self, conn: FakeConnection):
+        conn.closed = True
+
+    @staticmethod
+    def is_healthy(conn: FakeConnection) -> bool:
+        return conn.healthy
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+def test_checkout_is_released_after_the_request(app: App, database):
+    pool = pool_provider("pooled_conn", database.connect, max_size=2)
+
+    @app.route("/")
+    async def index(req, res, pooled_conn):
+        assert pool.in_use == 1
+        res.media = {"number": pooled_conn.number}
+
+    client = create_client(app)
+    for _ in range(3):
+        assert client.get("/").json() == {"number": 0}
+
+    assert pool.size == 1
+    assert pool.in_use == 0
+    assert pool.acquired == 3
+
+
+def test_checkout_is_held_through_an_intermediate_provider(app: App, database):
+    pool = pool_provider("repo_conn", database.connect)
+
+    @provider
+    async def repo(repo_conn):
+        return {"conn": repo_conn}
+
+    @app.route("/")
+    async def index(req, res, repo):
+        assert pool.in_use == 1
+        res.media = {"closed": repo["conn"].closed}
+
+    client = create_client(app)
+    assert client.get("/").json() == {"closed": False}
+    assert pool.in_use == 0
+
+
+def test_checkout_is_released_if_the_view_fails(app: App, database):
+    pool = pool_provider("failing_conn", database.connect)
+
+    @app.route("/")
+    async def index(req, res, failing_conn):
+        raise ValueError
+
+    client = create_client(app, raise_server_exceptions=False)
+    assert client.get("/").status_code == 500
+    assert pool.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_open_creates_min_size_resources(database):
+    pool = Pool(database.connect, min_size=2)
+    await pool.open()
+    assert pool.size == pool.idle == 2
+    assert pool.created == 2
+
+
+@pytest.mark.asyncio
+async def test_resources_are_reused(database):
+    pool = Pool(database.connect)
+    async with pool.checkout() as first:
+        pass
+    async with pool.checkout() as second:
+        pass
+    assert first is second
+    assert pool.created == 1
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_order(database):
+    pool = Pool(database.connect, max_size=1)
+    conn = await pool.acquire()
+    served = []
+
+    async def wait(name: str):
+        async with pool.checkout():
+            served.append(name)
+
+    tasks = [asyncio.ensure_future(wait(name)) for name in "abc"]
+    await asyncio.sleep(0.01)
+    assert pool.waiting == 3
+    assert pool.utilization == 1
+
+    await pool.release(conn)
+    await asyncio.gather(*tasks)
+    assert served == ["a", "b", "c"]
+    assert pool.size == 1
+    assert pool.max_wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout(database):
+    pool = Pool(database.connect, max_size=1, acquire_timeout=0.01)
+    await pool.acquire()
+    with pytest.raises(PoolTimeout):
+        await pool.acquire()
+    assert pool.timeouts == 1
+    assert pool.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_resources_are_replaced_on_checkout(database):
+    pool = Pool(
+        database.connect, close=database.disconnect, check=database.is_healthy
+    )
+    async with pool.checkout() as conn:
+        pass
+    conn.healthy = False
+
+    async with pool.checkout() as other:
+        assert other is not conn
+    assert conn.closed
+    assert pool.unhealthy == 1
+    assert pool.size == 1
+
+
+@pytest.mark.asyncio
+async def test_discarded_resource_frees_a_slot_for_waiters(database):
+    pool = Pool(database.connect, close=database.disconnect, max_size=1)
+    conn = await pool.acquire()
+    waiter = asyncio.ensure_future(pool.acquire())
+    await asyncio.sleep(0.01)
+
+    await pool.release(conn, discard=True)
+    other = await waiter
+    assert conn.closed
+    assert other is not conn
+    assert pool.size == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_resources_are_evicted(database):
+    pool = Pool(
+        database.connect,
+        close=database.disconnect,
+        min_size=1,
+        idle_timeout=0.01,
+    )
+    first, second = await pool.acquire(), await pool.acquire()
+    await pool.release(first)
+    await pool.release(second)
+    await asyncio.sleep(0.02)
+
+    await pool.evict()
+    assert pool.size == 1
+    assert pool.evicted == 1
+    assert first.closed  # The least recently used resource is evicted.
+    assert not second.closed
+
+
+@pytest.mark.asyncio
+async def test_close(database):
+    pool = Pool(database.connect, close=database.disconnect)
+    idle = await pool.acquire()
+    busy = await pool.acquire()
+    await pool.release(idle)
+
+    await pool.close()
+    assert idle.closed
+    assert not busy.closed
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+
+    await pool.release(busy)
+    assert busy.closed
+    assert pool.size == 0
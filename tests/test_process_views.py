@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+
+from bocadillo import App, Recipe, view
+from bocadillo.testing import create_client
+from bocadillo.executors import ProcessPool, register_process_function
+
+# NOTE: process views must be defined at the top level of a module.
+
+
+@view(executor="process")
+def square(x: int):
+    return {"result": x * x}
+
+
+@view(executor="process", timeout=0.05)
+def nap():
+    time.sleep(0.5)
+
+
+def get_pid():
+    import os
+
+    return os.getpid()
+
+
+register_process_function(get_pid)
+
+
+@pytest.fixture(autouse=True)
+def event_loop_for_lifespan():
+    # The test client runs lifespan events on the current event loop, which
+    # asyncio tests that ran before may have unset.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def test_process_view_returns_media(app: App, client):
+    app.add_process_pool(max_workers=1)
+
+    app.route("/square/{x:d}")(square)
+
+    with client:
+        r = client.get("/square/3")
+    assert r.status_code == 200
+    assert r.json() == {"result": 9}
+    assert app.executors.process_pool.stats()["completed"] == 1
+
+
+def test_process_pool_is_configured_automatically(app: App, client):
+    app.route("/square/{x:d}")(square)
+    assert app.executors.process_pool is None
+
+    with client:
+        assert isinstance(app.executors.process_pool, ProcessPool)
+        assert client.get("/square/3").json() == {"result": 9}
+    assert not app.executors.process_pool.running
+
+
+def test_recipe_process_views_use_the_pool_of_the_app():
+    app = App()
+    pool = app.add_process_pool(max_workers=1)
+    recipe = Recipe("maths")
+    recipe.route("/square/{x:d}")(square)
+    app.recipe(recipe)
+
+    with create_client(app) as client:
+        assert client.get("/maths/square/3").json() == {"result": 9}
+    assert recipe.executors.process_pool is pool
+    assert pool.completed == 1
+    assert not pool.running
+
+
+def test_recipe_pools_are_shut_down_with_the_app():
+    app = App()
+    recipe = Recipe("maths")
+    pool = recipe.add_process_pool(max_workers=1, warm_start=True)
+    executor = recipe.add_executor("reports")
+    app.recipe(recipe)
+
+    with create_client(app):
+        assert pool.running
+    assert not pool.running
+    with pytest.raises(RuntimeError):
+        executor._pool.submit(print)
+
+
+def test_if_task_times_out_then_504(app: App, client):
+    app.add_process_pool(max_workers=1)
+
+    app.route("/nap")(nap)
+
+    with client:
+        r = client.get("/nap")
+    assert r.status_code == 504
+    assert app.executors.process_pool.timeouts == 1
+
+
+def test_unknown_view_executor():
+    with pytest.raises(ValueError):
+        view(executor="gpu")
+
+
+@pytest.mark.asyncio
+async def test_warm_start_starts_all_workers():
+    pool = ProcessPool(max_workers=2, warm_start=True)
+    await pool.start()
+    try:
+        assert pool.running
+        pids = pool.pids
+        assert len(pids) == 2
+        assert await pool.run(get_pid) in pids
+    finally:
+        pool.shutdown()
+    assert not pool.running
+    assert pool.pids == set()
+
+
+@pytest.mark.asyncio
+async def test_workers_are_started_on_demand():
+    pool = ProcessPool(max_workers=2)
+    await pool.start()
+    try:
+        assert pool.pids == set()
+        assert await pool.run(get_pid) in pool.pids
+    finally:
+        pool.shutdown()
@@ -0,0 +1,81 @@
+import pytest
+
+from bocadillo import App, HTTPError, Recipe
+from bocadillo.testing import create_client
+
+
+def stream(data: bytes, size: int = 4):
+    # Chunk-encoded request, i.e. without a `Content-Length` header.
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.parametrize("app_cls", [App, lambda **kw: Recipe("tacos", **kw)])
+@pytest.mark.parametrize(
+    "data, status", [(b"x" * 10, 200), (b"x" * 11, 413), (b"", 200)]
+)
+def test_app_wide_limit(app_cls, data: bytes, status: int):
+    app = app_cls(max_body_size=10)
+
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            res.content = await req.body()
+
+    client = create_client(app)
+    assert client.post("/", data=data).status_code == status
+    assert client.post("/", data=stream(data)).status_code == status
+
+
+def test_declared_content_length_is_rejected_before_reading():
+    app = App(max_body_size=10)
+    called = False
+
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            nonlocal called
+            called = True
+
+    client = create_client(app)
+    r = client.post("/", data=b"x" * 100)
+    assert r.status_code == 413
+    assert not called
+
+
+def test_route_limit_overrides_app_limit():
+    app = App(max_body_size=10)
+
+    @app.route("/small", max_body_size=2)
+    class Small:
+        async def post(self, req, res):
+            res.content = await req.body()
+
+    @app.route("/large", max_body_size=100)
+    class Large:
+        async def post(self, req, res):
+            res.media = await req.json()
+
+    client = create_client(app)
+    assert client.post("/small", data=b"xxx").status_code == 413
+    assert client.post("/large", json={"x": "x" * 50}).status_code == 200
+    assert client.post("/large", data=stream(b"x" * 101)).status_code == 413
+
+
+def test_limit_error_goes_through_error_handlers():
+    app = App(max_body_size=1)
+
+    @app.error_handler(HTTPError)
+    async def handle(req, res, exc):
+        res.status_code = exc.status_code
+        res.text = "Too big!"
+
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            await req.body()
+
+    client = create_client(app)
+    r = client.post("/", data=b"xx")
+    assert r.status_code == 413
+    assert r.text == "Too big!"
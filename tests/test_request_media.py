@@ -0,0 +1,76 @@
+import pytest
+
+from bocadillo import App
+from bocadillo.hooks import before
+
+
+def test_json_media(app: App, client):
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            res.media = await req.media()
+
+    r = client.post("/", json={"message": "hello"})
+    assert r.status_code == 200
+    assert r.json() == {"message": "hello"}
+
+
+@pytest.mark.parametrize("data, status", [("{", 400), ("{}", 200)])
+def test_malformed_media(app: App, client, data: str, status: int):
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            res.media = await req.media()
+
+    r = client.post(
+        "/", data=data, headers={"content-type": "application/json"}
+    )
+    assert r.status_code == status
+
+
+def test_if_no_decoder_for_content_type_then_415(app: App, client):
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            res.media = await req.media()
+
+    r = client.post("/", data="hello", headers={"content-type": "text/foo"})
+    assert r.status_code == 415
+
+
+def test_add_custom_media_decoder(app: App, client):
+    app.media_decoders["text/csv"] = lambda body: body.decode().split(",")
+
+    @app.route("/")
+    class Index:
+        async def post(self, req, res):
+            res.media = await req.media()
+
+    r = client.post(
+        "/", data="a,b,c", headers={"content-type": "text/csv; charset=utf-8"}
+    )
+    assert r.json() == ["a", "b", "c"]
+
+
+def test_media_is_decoded_once(app: App, client):
+    calls = 0
+
+    def decode(body: bytes):
+        nonlocal calls
+        calls += 1
+        return body.decode()
+
+    app.media_decoders["text/plain"] = decode
+
+    async def read_media(req, res, params):
+        await req.media()
+
+    @app.route("/")
+    class Index:
+        @before(read_media)
+        async def post(self, req, res):
+            res.text = await req.media()
+
+    r = client.post("/", data="hello", headers={"content-type": "text/plain"})
+    assert r.text == "hello"
+    assert calls == 1
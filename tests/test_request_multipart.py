@@ -0,0 +1,141 @@
+import pytest
+
+from bocadillo import App, HTTPError, Request
+
+
+def test_parts_are_streamed(app: App, client):
+    @app.route("/")
+    class Upload:
+        async def post(self, req, res):
+            parts = []
+            async for part in req.multipart():
+                content = b"".join([chunk async for chunk in part])
+                parts.append(
+                    {
+                        "name": part.name,
+                        "filename": part.filename,
+                        "content_type": part.content_type,
+                        "size": part.size,
+                        "content": content.decode(),
+                    }
+                )
+            res.media = parts
+
+    r = client.post(
+        "/",
+        data={"title": "Hello"},
+        files={"doc": ("doc.txt", b"Lorem ipsum", "text/plain")},
+    )
+    assert r.status_code == 200
+    assert r.json() == [
+        {
+            "name": "title",
+            "filename": None,
+            "content_type": "",
+            "size": 5,
+            "content": "Hello",
+        },
+        {
+            "name": "doc",
+            "filename": "doc.txt",
+            "content_type": "text/plain",
+            "size": 11,
+            "content": "Lorem ipsum",
+        },
+    ]
+
+
+def test_large_parts_are_spooled_to_disk(app: App, client):
+    @app.route("/")
+    class Upload:
+        async def post(self, req, res):
+            async for part in req.multipart(spool_threshold=16):
+                res.media = {
+                    "in_memory": part.in_memory,
+                    "content": await part.text(),
+                }
+
+    r = client.post("/", files={"doc": ("doc.txt", b"x" * 64)})
+    assert r.json() == {"in_memory": False, "content": "x" * 64}
+
+
+@pytest.mark.parametrize(
+    "limits, status",
+    [
+        ({}, 200),
+        ({"max_body_size": 100}, 413),
+        ({"max_part_size": 100}, 413),
+        ({"max_part_size": 1000}, 200),
+        ({"max_parts": 1}, 413),
+        ({"max_parts": 2}, 200),
+    ],
+)
+def test_limits(app: App, client, limits: dict, status: int):
+    @app.route("/")
+    class Upload:
+        async def post(self, req, res):
+            async for _ in req.multipart(**limits):
+                pass
+
+    r = client.post("/", data={"a": "b"}, files={"doc": b"x" * 500})
+    assert r.status_code == status
+
+
+def test_if_not_multipart_then_400(app: App, client):
+    @app.route("/")
+    class Upload:
+        async def post(self, req, res):
+            async for _ in req.multipart():
+                pass
+
+    r = client.post("/", data="hello")
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(b"garbage", id="malformed"),
+        pytest.param(
+            b'--x\r\nContent-Disposition: form-data; name="a"\r\n\r\nhel',
+            id="truncated",
+        ),
+    ],
+)
+def test_if_body_is_invalid_then_400(app: App, client, body: bytes):
+    @app.route("/")
+    class Upload:
+        async def post(self, req, res):
+            async for _ in req.multipart():
+                pass
+
+    r = client.post(
+        "/",
+        data=body,
+        headers={"content-type": "multipart/form-data; boundary=x"},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_if_content_length_is_invalid_then_400():
+    # NOTE: the test client always sends a valid `Content-Length`.
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=x"),
+            (b"content-length", b"not-a-number"),
+        ],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"--x--\r\n"}
+
+    req = Request(scope, receive)
+    with pytest.raises(HTTPError) as ctx:
+        async for _ in req.multipart(max_body_size=1000):
+            pass
+    assert ctx.value.status_code == 400
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from bocadillo import App
+
+
+def chunked(data: bytes, size: int):
+    # Simulate records being split across chunks.
+    def stream():
+        for i in range(0, len(data), size):
+            yield data[i : i + size]
+
+    return stream()
+
+
+RECORDS = [{"id": i, "name": f"item-{i}"} for i in range(10)]
+NDJSON = "\n".join(json.dumps(record) for record in RECORDS).encode() + b"\n"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(NDJSON)])
+def test_records_are_decoded(app: App, client, chunk_size: int):
+    @app.route("/")
+    class Ingest:
+        async def post(self, req, res):
+            res.media = [record async for record in req.ndjson()]
+
+    r = client.post("/", data=chunked(NDJSON, chunk_size))
+    assert r.status_code == 200
+    assert r.json() == RECORDS
+
+
+def test_last_record_may_not_end_with_newline(app: App, client):
+    @app.route("/")
+    class Ingest:
+        async def post(self, req, res):
+            res.media = [record async for record in req.ndjson()]
+
+    r = client.post("/", data=b'{"a": 1}\n\n{"b": 2}')
+    assert r.json() == [{"a": 1}, {"b": 2}]
+
+
+def test_batches(app: App, client):
+    @app.route("/")
+    class Ingest:
+        async def post(self, req, res):
+            res.media = [batch async for batch in req.ndjson(batch_size=4)]
+
+    r = client.post("/", data=chunked(NDJSON, 16))
+    assert r.json() == [RECORDS[:4], RECORDS[4:8], RECORDS[8:]]
+
+
+@pytest.mark.parametrize(
+    "data, status",
+    [
+        (b'{"a": 1}\n{"b": 2}\n', 200),
+        (b'{"a": 1}\n{"b": ' + b"2" * 100 + b"}\n", 413),
+        (b'{"a": 1}\n{"b": ' + b"2" * 100, 413),
+        (b'{"a": 1}\n{"b"\n', 400),
+    ],
+)
+def test_errors(app: App, client, data: bytes, status: int):
+    @app.route("/")
+    class Ingest:
+        async def post(self, req, res):
+            async for _ in req.ndjson(max_record_size=32):
+                pass
+
+    r = client.post("/", data=chunked(data, 8))
+    assert r.status_code == status
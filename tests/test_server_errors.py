@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from bocadillo import App, HTTPError
+from bocadillo.errors import SERVER_ERROR, ErrorStats
+from bocadillo.testing import create_client
+
+
+def test_exception_is_not_reraised_in_later_requests(app: App):
+    @app.route("/fail")
+    async def fail(req, res):
+        raise ValueError("Oops")
+
+    @app.route("/ok")
+    async def ok(req, res):
+        res.text = "OK"
+
+    client = create_client(app)
+    with pytest.raises(ValueError):
+        client.get("/fail")
+    assert client.get("/ok").text == "OK"
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_captured_per_request():
+    app = App()
+    scopes = {}
+
+    @app.route("/fail")
+    async def fail(req, res):
+        scopes["fail"] = req.scope
+        await asyncio.sleep(0.01)
+        raise ValueError("Oops")
+
+    @app.route("/ok")
+    async def ok(req, res):
+        scopes["ok"] = req.scope
+        await asyncio.sleep(0.02)
+        res.text = "OK"
+
+    async def call(path: str):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            pass
+
+        await app(scope)(receive, send)
+
+    results = await asyncio.gather(
+        call("/fail"), call("/ok"), return_exceptions=True
+    )
+    assert isinstance(results[0], ValueError)
+    assert results[1] is None
+    # The exception is not kept alive once it has been re-raised.
+    assert SERVER_ERROR not in scopes["fail"]
+
+
+def test_debug_template_is_compiled_once(app: App, monkeypatch):
+    import bocadillo.errors
+
+    reads = 0
+    read_asset = bocadillo.errors.read_asset
+
+    def counting_read_asset(name):
+        nonlocal reads
+        reads += 1
+        return read_asset(name)
+
+    monkeypatch.setattr(bocadillo.errors, "read_asset", counting_read_asset)
+    app.debug = True
+
+    @app.route("/")
+    async def index(req, res):
+        raise ValueError("Oops")
+
+    client = create_client(app, raise_server_exceptions=False)
+    for _ in range(2):
+        r = client.get("/", headers={"accept": "text/html"})
+        assert r.status_code == 500
+        assert "ValueError" in r.text
+
+    assert reads == 1
+
+
+def test_error_stats(app: App):
+    @app.route("/ok")
+    async def ok(req, res):
+        pass
+
+    @app.route("/items/{pk}")
+    async def item(req, res, pk):
+        if pk == "0":
+            raise HTTPError(404)
+        if pk == "1":
+            raise ValueError
+
+    client = create_client(app, raise_server_exceptions=False)
+    client.get("/ok")
+    client.get("/items/0")
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/unknown")
+
+    stats = app.error_stats
+    assert stats.requests == {"ok": 1, "item": 3, None: 1}
+    assert stats.errors == {("item", 404): 1, ("item", 500): 1, (None, 404): 1}
+    assert stats.error_rate("ok") == 0
+    assert stats.error_rate("item") == pytest.approx(2 / 3)
+    assert stats.error_rate("item", status=500) == pytest.approx(1 / 3)
+    assert stats.error_rate() == pytest.approx(3 / 5)
+
+    stats.reset()
+    assert stats.error_rate() == 0
+
+
+def test_error_stats_record():
+    stats = ErrorStats()
+    stats.record("a", 200)
+    stats.record("a", 503)
+    assert stats.requests == {"a": 2}
+    assert stats.errors == {("a", 503): 1}
+    assert stats.error_rate("a", status=503) == 0.5
+    assert stats.error_rate("b") == 0
+
+
+def test_error_rate_of_unmatched_requests():
+    stats = ErrorStats()
+    stats.record("a", 200)
+    stats.record(None, 404)
+    stats.record(None, 200)
+    # `None` stands for requests that did not match any route.
+    assert stats.error_rate(None) == 0.5
+    assert stats.error_rate(None, status=404) == 0.5
+    assert stats.error_rate() == pytest.approx(1 / 3)
@@ -1,12 +1,23 @@
+import asyncio
+import time
+from functools import partial
+
 import pytest
 from bocadillo import App
-from jinja2.exceptions import TemplateNotFound
+from jinja2.exceptions import TemplateNotFound, TemplateSyntaxError
 
 from bocadillo import Templates
 
 from .conftest import TemplateWrapper, create_template
 
 
+@pytest.fixture
+def templates_dir(tmpdir_factory):
+    directory = tmpdir_factory.mktemp("templates")
+    directory.join("hello.html").write("<h1>Hello, {{ name }}!</h1>")
+    return directory
+
+
 @pytest.mark.asyncio
 async def test_render(template_file: TemplateWrapper, templates: Templates):
     html = await templates.render(template_file.name, **template_file.context)
@@ -46,6 +57,31 @@ async def test_if_template_does_not_exist_then_not_found_raised(
         await templates.render("doesnotexist.html")
 
 
+def test_render_string_compiles_source_once(templates: Templates):
+    for title in ("Hello", "Bonjour"):
+        html = templates.render_string("<h1>{{ title }}</h1>", title=title)
+        assert html == f"<h1>{title}</h1>"
+    assert templates.string_cache.misses == 1
+    assert templates.string_cache.hits == 1
+
+
+def test_string_cache_is_bounded():
+    templates = Templates(string_cache_size=2)
+    for source in ("a", "b", "a", "c", "b"):
+        templates.render_string(source)
+    assert len(templates.string_cache) == 2
+    # "b" was evicted when "c" was added.
+    assert templates.string_cache.misses == 4
+    assert templates.string_cache.hits == 1
+
+
+def test_string_cache_is_cleared_when_context_changes(templates: Templates):
+    templates.context = {"title": "Hello"}
+    assert templates.render_string("{{ title }}") == "Hello"
+    templates.context = {"title": "Bonjour"}
+    assert templates.render_string("{{ title }}") == "Bonjour"
+
+
 def test_url_for(app: App, client, templates: Templates):
     @app.route("/about/{who}")
     async def about(req, res, who):
@@ -64,3 +100,166 @@ def test_url_for(app: App, client, templates: Templates):
 def test_use_without_app():
     templates = Templates()
     assert templates.render_string("foo") == "foo"
+
+
+def test_bytecode_cache(templates_dir, tmpdir_factory):
+    cache_dir = tmpdir_factory.mktemp("bytecode")
+    templates = Templates(
+        directory=str(templates_dir), bytecode_cache=str(cache_dir)
+    )
+    assert templates.render_sync("hello.html", name="Bocadillo")
+    assert len(cache_dir.listdir()) == 1
+
+    # Another process would load the compiled template from the cache.
+    other = Templates(
+        directory=str(templates_dir), bytecode_cache=str(cache_dir)
+    )
+    assert other.render_sync("hello.html", name="Bocadillo")
+    assert len(cache_dir.listdir()) == 1
+
+
+def test_precompile(templates_dir):
+    templates_dir.join("index.html").write("<p>{{ body }}</p>")
+    templates_dir.join("email.txt").write("Hi {{ name }}")
+    templates = Templates(directory=str(templates_dir))
+
+    assert templates.precompile(extensions=["html"]) == 2
+    assert len(templates._environment.cache) == 2
+    assert templates.precompile() == 3
+
+
+def test_precompile_without_app(templates_dir):
+    templates = Templates(directory=str(templates_dir), precompile=True)
+    assert len(templates._environment.cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_precompile_on_startup(templates_dir):
+    app = App()
+    templates = Templates(app, directory=str(templates_dir), precompile=True)
+    assert len(templates._environment.cache) == 0
+
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    await app({"type": "lifespan"})(receive, send)
+    assert len(templates._environment.cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_render_during_async_render(templates_dir):
+    templates_dir.join("page.html").write("<main>{{ sidebar() | safe }}</main>")
+    templates = Templates(directory=str(templates_dir))
+
+    async def sidebar():
+        await asyncio.sleep(0)
+        # Rendering synchronously while the page is being rendered.
+        return templates.render_sync("hello.html", name="sidebar")
+
+    html = await templates.render("page.html", sidebar=sidebar)
+    assert html == "<main><h1>Hello, sidebar!</h1></main>"
+
+
+@pytest.mark.asyncio
+async def test_render_stream(templates_dir):
+    templates_dir.join("list.html").write(
+        "{% for item in items %}<li>{{ item }}</li>{% endfor %}"
+    )
+    templates = Templates(directory=str(templates_dir))
+
+    chunks = [
+        chunk
+        async for chunk in templates.render_stream("list.html", items="ab")
+    ]
+    assert len(chunks) > 1
+    assert "".join(chunks) == "<li>a</li><li>b</li>"
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_templates_are_cached_separately(
+    templates_dir, tmpdir_factory
+):
+    cache_dir = tmpdir_factory.mktemp("bytecode")
+    templates = Templates(
+        directory=str(templates_dir), bytecode_cache=str(cache_dir)
+    )
+    assert templates.precompile() == 1
+    assert len(cache_dir.listdir()) == 2
+
+    other = Templates(
+        directory=str(templates_dir), bytecode_cache=str(cache_dir)
+    )
+    html = await other.render("hello.html", name="Bocadillo")
+    assert html == "<h1>Hello, Bocadillo!</h1>"
+    assert other.render_sync("hello.html", name="Bocadillo") == html
+
+
+def test_fragment_cache(templates_dir):
+    templates_dir.join("sidebar.html").write(
+        '{% cache "sidebar", key=tier %}{{ items() }}{% endcache %}'
+    )
+    templates = Templates(directory=str(templates_dir))
+    calls = []
+
+    def items():
+        calls.append(None)
+        return len(calls)
+
+    render = partial(templates.render_sync, "sidebar.html", items=items)
+    assert render(tier="gold") == "1"
+    assert render(tier="gold") == "1"
+    assert render(tier="free") == "2"
+    assert templates.fragment_cache.hits == 1
+    assert templates.fragment_cache.misses == 2
+
+
+def test_fragment_cache_ttl(templates_dir):
+    templates_dir.join("clock.html").write(
+        '{% cache "clock", ttl=0.01 %}{{ now() }}{% endcache %}'
+    )
+    templates = Templates(directory=str(templates_dir))
+    counter = iter(range(10))
+    render = partial(templates.render_sync, "clock.html", now=counter.__next__)
+
+    assert render() == render() == "0"
+    time.sleep(0.02)
+    assert render() == "1"
+
+
+def test_fragment_cache_is_bounded(templates_dir):
+    templates_dir.join("item.html").write(
+        '{% cache "item", key=pk %}{{ pk }}{% endcache %}'
+    )
+    templates = Templates(directory=str(templates_dir), fragment_cache_size=2)
+    for pk in range(3):
+        templates.render_sync("item.html", pk=pk)
+    assert len(templates.fragment_cache) == 2
+
+
+def test_fragment_cache_unknown_option(templates: Templates):
+    with pytest.raises(TemplateSyntaxError):
+        templates.render_string('{% cache "foo", tll=1 %}{% endcache %}')
+
+
+@pytest.mark.asyncio
+async def test_fragment_cache_is_shared_by_sync_and_async_renders(
+    templates_dir,
+):
+    templates_dir.join("footer.html").write(
+        '<footer>{% cache "footer" %}{{ links() }}{% endcache %}</footer>'
+    )
+    templates = Templates(directory=str(templates_dir))
+
+    async def links():
+        await asyncio.sleep(0)
+        return "<a>Home</a>"
+
+    html = await templates.render("footer.html", links=links)
+    assert html == "<footer>&lt;a&gt;Home&lt;/a&gt;</footer>"
+    assert templates.render_sync("footer.html") == html
+    assert templates.fragment_cache.hits == 1
@@ -0,0 +1,94 @@
+from time import sleep
+
+from bocadillo import App, ASGIMiddleware, Middleware
+from bocadillo.hooks import before
+from bocadillo.testing import create_client
+from bocadillo.timing import Timings
+
+
+def parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for metric in header.split(", "):
+        name, _, duration = metric.partition(";dur=")
+        metrics[name] = float(duration)
+    return metrics
+
+
+def test_timing_is_disabled_by_default(app: App, client):
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    assert app.timing_stats is None
+    assert "server-timing" not in client.get("/").headers
+
+
+def test_server_timing_header():
+    app = App(enable_timing=True)
+
+    class Custom(Middleware):
+        async def before_dispatch(self, req, res):
+            pass
+
+    app.add_middleware(Custom)
+
+    async def check(req, res, params):
+        pass
+
+    @app.route("/")
+    @before(check)
+    async def index(req, res):
+        res.text = "OK"
+
+    client = create_client(app)
+    r = client.get("/")
+    assert r.text == "OK"
+    metrics = parse_server_timing(r.headers["server-timing"])
+    assert set(metrics) == {"hook.before.check", "view", "mw.Custom", "render"}
+    assert all(duration >= 0 for duration in metrics.values())
+
+
+def test_timing_stats_and_callback():
+    app = App(enable_timing=True)
+    calls = []
+
+    class Pure(ASGIMiddleware):
+        pass
+
+    app.add_asgi_middleware(Pure)
+
+    @app.timing_stats.on_request
+    def on_request(scope: dict, timings: Timings):
+        calls.append((scope["path"], [name for name, _ in timings.entries]))
+
+    @app.route("/")
+    async def index(req, res):
+        pass
+
+    client = create_client(app)
+    for _ in range(3):
+        client.get("/")
+
+    assert len(calls) == 3
+    path, names = calls[0]
+    assert path == "/"
+    assert names[:2] == ["view", "render"]
+    assert "asgi.Pure" in names
+    assert "asgi.TrustedHostMiddleware" in names
+
+    stats = app.timing_stats.stages["view"]
+    assert stats.count == 3
+    assert 0 <= stats.mean <= stats.max
+    assert stats.total >= stats.max
+
+
+def test_durations_are_exclusive():
+    timings = Timings()
+    outer = timings.start()
+    inner = timings.start()
+    sleep(0.02)
+    timings.stop("inner", inner)
+    timings.stop("outer", outer)
+    durations = dict(timings.entries)
+    assert durations["inner"] >= 0.02
+    assert durations["outer"] < 0.01
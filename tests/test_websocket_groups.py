@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from bocadillo import WebSocket
+from bocadillo.websockets import Group, Groups, encode_event
+
+
+class FakeClient:
+    """Client side of a WebSocket connection, at the ASGI level."""
+
+    def __init__(self, fail: bool = False):
+        self.events = []
+        self.incoming = asyncio.Queue()
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        self.fail = fail
+        self.unblocked = asyncio.Event()
+        self.unblocked.set()
+
+    async def receive(self) -> dict:
+        return await self.incoming.get()
+
+    async def send(self, event: dict):
+        await self.unblocked.wait()
+        if self.fail and event["type"] == "websocket.send":
+            raise ConnectionResetError
+        self.events.append(event)
+
+    @property
+    def messages(self) -> list:
+        return [e["text"] for e in self.events if e["type"] == "websocket.send"]
+
+    async def connect(self) -> WebSocket:
+        ws = WebSocket(
+            {"type": "websocket", "path": "/"}, self.receive, self.send
+        )
+        await ws.accept()
+        return ws
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_message_once():
+    group = Group("room", send_type="json")
+    clients = [FakeClient() for _ in range(3)]
+    for client in clients:
+        group.add(await client.connect())
+
+    assert await group.broadcast({"text": "hello"}) == 3
+    await group.flush()
+
+    events = [client.events[-1] for client in clients]
+    assert events[0]["text"] == '{"text": "hello"}'
+    assert all(event is events[0] for event in events)
+    assert group.sent == 3
+
+
+@pytest.mark.asyncio
+async def test_broadcast_exclude():
+    group = Group("room")
+    sender, receiver = FakeClient(), FakeClient()
+    sender_ws = await sender.connect()
+    group.add(sender_ws)
+    group.add(await receiver.connect())
+
+    assert await group.broadcast("hi", exclude=sender_ws) == 1
+    await group.flush()
+    assert receiver.messages == ["hi"]
+    assert sender.messages == []
+
+
+@pytest.mark.asyncio
+async def test_slow_member_does_not_block_others():
+    group = Group("room", max_queue=2)
+    slow, fast = FakeClient(), FakeClient()
+    slow_ws = await slow.connect()
+    slow.unblocked.clear()
+    group.add(slow_ws)
+    group.add(await fast.connect())
+
+    for number in range(4):
+        await group.broadcast(str(number))
+        await asyncio.sleep(0)
+    await group.flush()
+
+    assert fast.messages == ["0", "1", "2", "3"]
+    # One message in flight, two queued: the fourth one overflows.
+    assert slow_ws not in group
+    assert group.slow_consumers == 1
+
+    slow.unblocked.set()
+    await asyncio.sleep(0.01)
+    assert slow.events[-1] == {"type": "websocket.close", "code": 1013}
+
+
+@pytest.mark.asyncio
+async def test_member_is_removed_if_sending_fails():
+    group = Group("room")
+    broken = FakeClient(fail=True)
+    ws = await broken.connect()
+    group.add(ws)
+
+    await group.broadcast("hi")
+    await group.flush()
+    assert ws not in group
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_member_is_removed_on_disconnect():
+    group = Group("room")
+    client = FakeClient()
+    ws = WebSocket(
+        {"type": "websocket", "path": "/"}, client.receive, client.send
+    )
+
+    async with ws:
+        group.add(ws)
+        assert ws in group
+        client.incoming.put_nowait(
+            {"type": "websocket.disconnect", "code": 1001}
+        )
+        await ws.receive()
+
+    assert ws not in group
+
+
+@pytest.mark.asyncio
+async def test_groups_registry():
+    rooms = Groups(max_queue=10)
+    room = rooms["lobby"]
+    assert rooms["lobby"] is room
+    assert room.max_queue == 10
+    assert "lobby" in rooms
+
+    ws = await FakeClient().connect()
+    room.add(ws)
+    room.remove(ws)
+    # Empty groups are dropped.
+    assert "lobby" not in rooms
+    assert len(rooms) == 0
+
+
+def test_encode_event():
+    assert encode_event(b"\x00", "bytes") == {
+        "type": "websocket.send",
+        "bytes": b"\x00",
+    }
+    with pytest.raises(ValueError):
+        encode_event("hi", "xml")